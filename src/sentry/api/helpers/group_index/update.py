@@ -20,6 +20,7 @@ from sentry import analytics, features, options
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.db.models.query import create_or_update
+from sentry.grouping.ingest.grouphash_cache import invalidate_grouphash_cache
 from sentry.issues.grouptype import GroupCategory
 from sentry.issues.ignored import handle_archived_until_escalating, handle_ignored
 from sentry.issues.merge import handle_merge
@@ -98,6 +99,8 @@ def handle_discard(
                     group=None, group_tombstone_id=tombstone.id
                 )
 
+    invalidate_grouphash_cache(groups_to_delete)
+
     for project in projects:
         delete_group_list(
             request, project, groups_to_delete.get(project.id, []), delete_type="discard"
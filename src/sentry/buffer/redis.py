@@ -383,7 +383,9 @@ class RedisBuffer(Buffer):
             pipe.hset(key, "s", "1")
 
         pipe.expire(key, self.key_expire)
-        pipe.zadd(pending_key, {key: time()})
+        # Only the first increment since the last flush sets the score, so that
+        # it is the age of the oldest pending increment.
+        pipe.zadd(pending_key, {key: time()}, nx=True)
         pipe.execute()
 
         metrics.incr(
@@ -405,25 +407,34 @@ class RedisBuffer(Buffer):
 
         try:
             keycount = 0
+            oldest_score: float | None = None
             if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-                keys = self.cluster.zrange(pending_key, 0, -1)
+                pairs = self.cluster.zrange(pending_key, 0, -1, withscores=True)
+                keys = [key for key, _ in pairs]
                 keycount += len(keys)
+                if pairs:
+                    oldest_score = min(score for _, score in pairs)
 
                 for key in keys:
                     pending_buffer.append(key)
                     if pending_buffer.full():
                         process_incr.apply_async(kwargs={"batch_keys": pending_buffer.flush()})
 
-                self.cluster.zrem(pending_key, *keys)
+                if keys:
+                    self.cluster.zrem(pending_key, *keys)
             elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
                 with self.cluster.all() as conn:
-                    results = conn.zrange(pending_key, 0, -1)
+                    results = conn.zrange(pending_key, 0, -1, withscores=True)
 
                 with self.cluster.all() as conn:
-                    for host_id, keysb in results.value.items():
-                        if not keysb:
+                    for host_id, pairs in results.value.items():
+                        if not pairs:
                             continue
+                        keysb = [keyb for keyb, _ in pairs]
                         keycount += len(keysb)
+                        host_oldest = min(score for _, score in pairs)
+                        if oldest_score is None or host_oldest < oldest_score:
+                            oldest_score = host_oldest
                         for keyb in keysb:
                             pending_buffer.append(keyb.decode("utf-8"))
                             if pending_buffer.full():
@@ -438,7 +449,20 @@ class RedisBuffer(Buffer):
             if not pending_buffer.empty():
                 process_incr.apply_async(kwargs={"batch_keys": pending_buffer.flush()})
 
+            partition_tag = "none" if partition is None else str(partition)
             metrics.distribution("buffer.pending-size", keycount)
+            metrics.distribution(
+                "buffer.pending-size.partition", keycount, tags={"partition": partition_tag}
+            )
+            if oldest_score is not None:
+                # How long the oldest key in this partition has been waiting to be
+                # flushed. This is the upper bound on how stale counters are.
+                metrics.distribution(
+                    "buffer.pending-lag",
+                    max(time() - oldest_score, 0.0),
+                    tags={"partition": partition_tag},
+                    unit="second",
+                )
         finally:
             client.delete(lock_key)
 
@@ -449,9 +473,8 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
-        if batch_keys is not None:
-            for key in batch_keys:
-                self._process_single_incr(key)
+        if batch_keys:
+            self._process_batch_incr(batch_keys)
 
     def _process(
         self,
@@ -464,55 +487,150 @@ class RedisBuffer(Buffer):
         return super().process(model, columns, filters, extra, signal_only)
 
     def _process_single_incr(self, key: str) -> None:
-        client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
-        lock_key = self._lock_key(client, key, ex=10)
-        if not lock_key:
-            metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
-            logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+        self._process_batch_incr([key])
+
+    def _lock_many(self, keys: list[str], ex: int) -> list[str]:
+        """
+        Acquires the per-key flush locks for all `keys` in a single pipelined
+        round-trip. Returns the keys for which the lock was acquired.
+        """
+        lock_keys = [self._make_lock_key(key) for key in keys]
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for lock_key in lock_keys:
+                pipe.set(lock_key, "1", nx=True, ex=ex)
+            acquired = pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.fanout() as conn:
+                promises = [
+                    conn.target_key(lock_key).set(lock_key, "1", nx=True, ex=ex)
+                    for lock_key in lock_keys
+                ]
+            acquired = [promise.value for promise in promises]
+        else:
+            raise AssertionError("unreachable")
+
+        return [key for key, ok in zip(keys, acquired) if ok]
+
+    def _unlock_many(self, keys: list[str]) -> None:
+        if not keys:
             return
+        lock_keys = [self._make_lock_key(key) for key in keys]
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for lock_key in lock_keys:
+                pipe.delete(lock_key)
+            pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.fanout() as conn:
+                for lock_key in lock_keys:
+                    conn.target_key(lock_key).delete(lock_key)
+        else:
+            raise AssertionError("unreachable")
 
-        pending_key = self._make_pending_key_from_key(key)
+    def _pop_many(self, keys: list[str]) -> dict[str, dict[Any, Any]]:
+        """
+        Reads and removes the buffered hashes for all `keys` in a single
+        pipelined round-trip (one pipeline per node), dropping them from their
+        pending sets at the same time.
+        """
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for key in keys:
+                pipe.hgetall(key)
+                pipe.zrem(self._make_pending_key_from_key(key), key)
+                pipe.delete(key)
+            results = pipe.execute()
+            # every key issues three commands, we only care about HGETALL
+            return {key: results[i * 3] for i, key in enumerate(keys)}
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            # Pending sets live on the same host as the keys they track (see
+            # `incr`), so every command has to be routed by the buffer key.
+            with self.cluster.fanout() as conn:
+                promises = {}
+                for key in keys:
+                    promises[key] = conn.target_key(key).hgetall(key)
+                    conn.target_key(key).zrem(self._make_pending_key_from_key(key), key)
+                    conn.target_key(key).delete(key)
+            return {key: promise.value for key, promise in promises.items()}
+        else:
+            raise AssertionError("unreachable")
+
+    def _load_incr_payload(
+        self, values: dict[str, Any]
+    ) -> tuple[
+        type[models.Model],
+        dict[str, int],
+        dict[str, str | datetime | date | int | float],
+        dict[str, Any],
+        bool | None,
+    ]:
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
+
+    def _process_batch_incr(self, keys: list[str]) -> None:
+        """
+        Flushes a batch of buffered keys. Locking, reading and clearing the
+        keys is pipelined across the whole batch instead of paying several
+        round-trips per key; the database writes are then applied per key.
+
+        All keys of the batch are cleared before they are written, so a failed
+        write of one key must not prevent the writes of the others.
+        """
+        locked_keys = self._lock_many(keys, ex=10)
+        if len(locked_keys) != len(keys):
+            locked = set(locked_keys)
+            for key in keys:
+                if key not in locked:
+                    metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
+                    logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+
+        if not locked_keys:
+            return
+
+        metrics.distribution("buffer.process-batch-size", len(locked_keys))
 
         try:
-            pipe = self.get_redis_connection(key, transaction=False)
-            pipe.hgetall(key)
-            pipe.zrem(pending_key, key)
-            pipe.delete(key)
-            values = pipe.execute()[0]
-
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
-                return
-
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            with metrics.timer("buffer.process-batch.read"):
+                payloads = self._pop_many(locked_keys)
+
+            for key in locked_keys:
+                # XXX(python3): In python2 this isn't as important since redis will
+                # return string tyes (be it, byte strings), but in py3 we get bytes
+                # back, and really we just want to deal with keys as strings.
+                values = {force_str(k): v for k, v in payloads[key].items()}
+
+                if not values:
+                    metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+                    logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                    continue
+
+                try:
+                    self._process(*self._load_incr_payload(values))
+                except Exception:
+                    metrics.incr("buffer.revoked", tags={"reason": "error"}, skip_internal=False)
+                    logger.exception("buffer.revoked.error", extra={"redis_key": key})
         finally:
-            client.delete(lock_key)
+            self._unlock_many(locked_keys)
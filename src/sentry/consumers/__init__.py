@@ -86,6 +86,11 @@ def ingest_replay_recordings_buffered_options() -> list[click.Option]:
             type=int,
             default=1,
         ),
+        click.Option(
+            ["--max-upload-concurrency", "max_upload_concurrency"],
+            type=int,
+            default=100,
+        ),
     ]
     return options
 
@@ -2,6 +2,7 @@ import logging
 
 from sentry_relay.consts import SPAN_STATUS_CODE_TO_NAME
 
+from sentry import options
 from sentry.api.utils import get_date_range_from_params
 from sentry.models.environment import Environment
 from sentry.models.group import Group
@@ -85,6 +86,26 @@ class DiscoverProcessor:
             dataset = discover
 
         def data_fn(offset, limit):
+            if dataset is discover and options.get("data-export.discover.stream-results"):
+                # Rows are parsed as they are received, so the raw response is
+                # never held in memory alongside the processed rows. The rows
+                # of a batch are still collected, `handle_fields` needs all of
+                # them to look up their issues at once.
+                rows = discover.iter_query_rows(
+                    selected_columns=fields,
+                    equations=equations,
+                    query=query,
+                    params=params,
+                    offset=offset,
+                    orderby=sort,
+                    limit=limit,
+                    referrer="data_export.tasks.discover",
+                    auto_fields=True,
+                    auto_aggregations=True,
+                    use_aggregate_conditions=True,
+                )
+                return {"data": list(rows)}
+
             return dataset.query(
                 selected_columns=fields,
                 equations=equations,
@@ -124,6 +124,8 @@ class GroupDeletionTask(ModelDeletionTask):
         Group deletion operates as a quasi-bulk operation so that we don't flood
         snuba replacements with deletions per group.
         """
+        from sentry.grouping.ingest.grouphash_cache import invalidate_grouphash_cache
+
         self.mark_deletion_in_progress(instance_list)
 
         group_ids = [group.id for group in instance_list]
@@ -140,6 +142,7 @@ class GroupDeletionTask(ModelDeletionTask):
             )
 
         self.delete_children(child_relations)
+        invalidate_grouphash_cache({group.project_id for group in instance_list})
 
         # Remove group objects with children removed.
         return self.delete_instance_bulk(instance_list)
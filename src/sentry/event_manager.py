@@ -54,6 +54,7 @@ from sentry.grouping.ingest.config import (
     project_uses_optimized_grouping,
     update_grouping_config_if_needed,
 )
+from sentry.grouping.ingest.grouphash_cache import get_or_create_grouphashes
 from sentry.grouping.ingest.hashing import (
     find_existing_grouphash,
     find_existing_grouphash_new,
@@ -939,16 +940,38 @@ def _get_group_processing_kwargs(job: Job) -> dict[str, Any]:
 
 @sentry_sdk.tracing.trace
 def _get_or_create_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    # Jobs in a batch mostly share a handful of environments, so resolve every
+    # distinct (project, name) pair only once.
+    environments: dict[tuple[int, str | None], Environment] = {}
     for job in jobs:
-        job["environment"] = Environment.get_or_create(
-            project=projects[job["project_id"]], name=job["environment"]
-        )
+        key = (job["project_id"], job["environment"])
+        if key not in environments:
+            environments[key] = Environment.get_or_create(
+                project=projects[job["project_id"]], name=job["environment"]
+            )
+        job["environment"] = environments[key]
 
 
 @sentry_sdk.tracing.trace
 def _get_or_create_group_environment_many(jobs: Sequence[Job]) -> None:
+    keys: list[tuple[int, int]] = []
+    defaults: dict[tuple[int, int], dict[str, Any]] = {}
     for job in jobs:
-        _get_or_create_group_environment(job["environment"], job["release"], job["groups"])
+        for group_info in job["groups"]:
+            key = (group_info.group.id, job["environment"].id)
+            keys.append(key)
+            defaults.setdefault(key, {"first_release": job["release"] or None})
+
+    results = GroupEnvironment.get_or_create_many(keys, defaults)
+
+    # Only the first job to see a (group, environment) pair gets to claim it
+    # as new, the same as calling `get_or_create` once per job would.
+    seen: set[tuple[int, int]] = set()
+    for job in jobs:
+        for group_info in job["groups"]:
+            key = (group_info.group.id, job["environment"].id)
+            group_info.is_new_group_environment = results[key][1] and key not in seen
+            seen.add(key)
 
 
 def _get_or_create_group_environment(
@@ -1030,10 +1053,19 @@ def _increment_release_associated_counts(
 
 
 def _get_or_create_group_release_many(jobs: Sequence[Job]) -> None:
+    group_infos: list[GroupInfo] = []
+    items: list[tuple[Group, Release, Environment, datetime]] = []
     for job in jobs:
-        _get_or_create_group_release(
-            job["environment"], job["release"], job["event"], job["groups"]
-        )
+        if not job["release"]:
+            continue
+        for group_info in job["groups"]:
+            group_infos.append(group_info)
+            items.append(
+                (group_info.group, job["release"], job["environment"], job["event"].datetime)
+            )
+
+    for group_info, group_release in zip(group_infos, GroupRelease.get_or_create_many(items)):
+        group_info.group_release = group_release
 
 
 def _get_or_create_group_release(
@@ -1386,9 +1418,7 @@ def _save_aggregate(
         and not primary_hashes.hierarchical_hashes
     )
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    flat_grouphashes = get_or_create_grouphashes(project, hashes.hashes)
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1699,10 +1729,7 @@ def get_hashes_and_grouphashes(
     grouping_config, hashes = hash_calculation_function(project, job, metric_tags)
 
     if extract_hashes(hashes):
-        grouphashes = [
-            GroupHash.objects.get_or_create(project=project, hash=hash)[0]
-            for hash in extract_hashes(hashes)
-        ]
+        grouphashes = get_or_create_grouphashes(project, extract_hashes(hashes))
 
         existing_grouphash = find_existing_grouphash_new(grouphashes)
 
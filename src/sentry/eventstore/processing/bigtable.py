@@ -1,6 +1,7 @@
 from sentry.utils.codecs import BytesCodec, JSONCodec
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
+from sentry.utils.zstd_dictionaries import EventPayloadCodec
 
 from .base import EventProcessingStore
 
@@ -10,13 +11,15 @@ class BigtableEventProcessingStore(EventProcessingStore):
     Creates an instance of the processing store which uses Bigtable as its
     backend.
 
-    Keyword argument are forwarded to the ``BigtableKVStorage`` constructor.
+    Keyword argument are forwarded to the ``BigtableKVStorage`` constructor,
+    except for ``compression_dictionaries`` which compresses payloads with the
+    trained zstd dictionary of their platform (leave Bigtable's own
+    ``compression`` off in that case).
     """
 
-    def __init__(self, **options):
-        super().__init__(
-            KVStorageCodecWrapper(
-                BigtableKVStorage(**options),
-                JSONCodec() | BytesCodec(),  # maintains functional parity with cache backend
-            )
-        )
+    def __init__(self, compression_dictionaries=False, **options):
+        if compression_dictionaries:
+            codec = EventPayloadCodec()
+        else:
+            codec = JSONCodec() | BytesCodec()  # maintains functional parity with cache backend
+        super().__init__(KVStorageCodecWrapper(BigtableKVStorage(**options), codec))
@@ -2,6 +2,7 @@ from sentry.utils.codecs import JSONCodec
 from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
 from sentry.utils.kvstore.redis import RedisKVStorage
 from sentry.utils.redis import redis_clusters
+from sentry.utils.zstd_dictionaries import EventPayloadCodec
 
 from .base import EventProcessingStore
 
@@ -10,11 +11,20 @@ class RedisClusterEventProcessingStore(EventProcessingStore):
     """
     Creates an instance of the processing store which uses a Redis Cluster
     client as its backend.
+
+    With ``compression_dictionaries``, payloads are stored compressed with the
+    trained zstd dictionary of their platform.
     """
 
     def __init__(self, **options):
-        super().__init__(
-            KVStorageCodecWrapper(
-                RedisKVStorage(redis_clusters.get(options.pop("cluster", "default"))), JSONCodec()
+        cluster = options.pop("cluster", "default")
+        if options.pop("compression_dictionaries", False):
+            super().__init__(
+                KVStorageCodecWrapper(
+                    RedisKVStorage(redis_clusters.get_binary(cluster)), EventPayloadCodec()
+                )
+            )
+        else:
+            super().__init__(
+                KVStorageCodecWrapper(RedisKVStorage(redis_clusters.get(cluster)), JSONCodec())
             )
-        )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import re
 from collections.abc import Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import TYPE_CHECKING, TypedDict
 
 import sentry_sdk
@@ -43,6 +44,12 @@ if TYPE_CHECKING:
 
 HASH_RE = re.compile(r"^[0-9a-f]{32}$")
 
+# Number of distinct grouping configs (config id + enhancements) and
+# fingerprinting rule sets kept parsed per process. Most projects use the
+# defaults, so this only has to cover the projects with custom rules that a
+# worker sees at the same time.
+LOADED_CONFIG_CACHE_SIZE = 1024
+
 # Synthetic exceptions should be marked by the SDK, but
 # are also detected here as a fallback
 _synthetic_exception_type_re = re.compile(
@@ -176,6 +183,7 @@ def get_grouping_config_dict_for_event_data(data, project) -> GroupingConfig:
     return data.get("grouping_config") or get_grouping_config_dict_for_project(project)
 
 
+@lru_cache(maxsize=None)
 def get_default_enhancements(config_id=None) -> str:
     base: str | None = DEFAULT_GROUPING_ENHANCEMENTS_BASE
     if config_id is not None:
@@ -219,9 +227,21 @@ def load_grouping_config(config_dict=None) -> StrategyConfiguration:
     config_id = config_dict.pop("id")
     if config_id not in CONFIGURATIONS:
         raise GroupingConfigNotFound(config_id)
+    if config_dict.keys() <= {"enhancements"}:
+        return _load_grouping_config(config_id, config_dict.get("enhancements"))
     return CONFIGURATIONS[config_id](**config_dict)
 
 
+@lru_cache(maxsize=LOADED_CONFIG_CACHE_SIZE)
+def _load_grouping_config(config_id: str, enhancements: str | None) -> StrategyConfiguration:
+    """
+    Parsing the enhancements of a config is the expensive part of loading it,
+    and every event of a project carries the same config. Loaded configs are
+    never modified, so they can be shared between events.
+    """
+    return CONFIGURATIONS[config_id](enhancements=enhancements)
+
+
 def load_default_grouping_config() -> StrategyConfiguration:
     return load_grouping_config(config_dict=None)
 
@@ -234,13 +254,23 @@ def get_fingerprinting_config_for_project(
     Merges the project's custom fingerprinting rules (if any) with the default built-in rules.
     """
 
-    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
+    from sentry.grouping.fingerprinting import FingerprintingRules
 
     bases = get_projects_default_fingerprinting_bases(project, config_id=config_id)
     rules = project.get_option("sentry:fingerprinting_rules")
     if not rules:
         return FingerprintingRules([], bases=bases)
 
+    return _load_fingerprinting_rules(rules, tuple(bases) if bases is not None else None)
+
+
+@lru_cache(maxsize=LOADED_CONFIG_CACHE_SIZE)
+def _load_fingerprinting_rules(rules: str, bases: tuple[str, ...] | None) -> FingerprintingRules:
+    """
+    Parsed rules are kept per process, keyed by the rules string itself. The
+    shared cache below only saves the parsing, not the deserialization.
+    """
+    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
     from sentry.utils.cache import cache
     from sentry.utils.hashlib import md5_text
 
@@ -0,0 +1,228 @@
+"""
+Cache of `(project_id, hash) -> GroupHash` lookups for event ingestion.
+
+Almost every event maps to a long-lived group, so looking up the same
+`GroupHash` rows in Postgres for every event is wasted work. This keeps the
+"settled" rows (assigned to a group, not locked, split or tombstoned) in Redis,
+with a small process-local tier in front of it. Rows that are not settled are
+always read from the database, as are rows that are about to get a group.
+
+Every cached value carries the version of its project at the time it was
+written. Operations that move or drop grouphashes (merge, unmerge, discard,
+deletion, reprocessing) call `invalidate_grouphash_cache`, which sets a new
+version and thereby invalidates all cached rows of the project at once. The
+process-local tier stores the version along with its rows too, and the version
+of the project is read from Redis on every lookup, so that an invalidation in
+one process takes effect in all of them immediately.
+
+Versions are timestamps rather than counters, so that a version is never
+reused once the version key has expired. The version key outlives every row
+written while it was set.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterable, Sequence
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.db import router
+
+from sentry import options
+from sentry.features.rollout import in_random_rollout
+from sentry.models.grouphash import GroupHash
+from sentry.models.project import Project
+from sentry.utils import json, metrics
+from sentry.utils.redis import redis_clusters
+
+logger = logging.getLogger(__name__)
+
+REDIS_TTL = 60 * 60
+VERSION_TTL = 2 * REDIS_TTL
+LOCAL_CACHE_SIZE = 10_000
+LOCAL_CACHE_TTL = 10
+
+# (grouphash id, group id)
+CachedGroupHash = tuple[int, int]
+
+# (grouphash id, group id, project version)
+_local_cache: TTLCache[tuple[int, str], tuple[int, int, int]] = TTLCache(
+    maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_TTL
+)
+_local_cache_lock = threading.Lock()
+
+
+def _get_redis_client():
+    return redis_clusters.get(settings.SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER)
+
+
+# The project id is a hash tag so that a project's version and rows live on the
+# same cluster node and can be read in one pipeline.
+def _version_key(project_id: int) -> str:
+    return f"gh:{{{project_id}}}:v"
+
+
+def _hash_key(project_id: int, hash: str) -> str:
+    return f"gh:{{{project_id}}}:h:{hash}"
+
+
+def _is_settled(grouphash: GroupHash) -> bool:
+    return (
+        grouphash.group_id is not None
+        and grouphash.state == GroupHash.State.UNLOCKED
+        and grouphash.group_tombstone_id is None
+    )
+
+
+def _to_grouphash(project: Project, hash: str, cached: CachedGroupHash) -> GroupHash:
+    grouphash_id, group_id = cached
+    grouphash = GroupHash(
+        id=grouphash_id,
+        project_id=project.id,
+        hash=hash,
+        group_id=group_id,
+        state=GroupHash.State.UNLOCKED,
+        group_tombstone_id=None,
+    )
+    # The row exists, make sure Django never tries to insert it again.
+    grouphash._state.adding = False
+    grouphash._state.db = router.db_for_read(GroupHash)
+    return grouphash
+
+
+def get_or_create_grouphashes(project: Project, hashes: Sequence[str]) -> list[GroupHash]:
+    """
+    Equivalent to calling `GroupHash.objects.get_or_create` for every hash,
+    but served from the cache where possible.
+    """
+    if not options.get("grouping.grouphash-cache.enabled"):
+        return [GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes]
+
+    found: dict[str, GroupHash] = {}
+
+    with _local_cache_lock:
+        local = {
+            hash: cached
+            for hash in hashes
+            if (cached := _local_cache.get((project.id, hash))) is not None
+        }
+
+    # The version is always read, so that local rows of invalidated projects
+    # are never served.
+    remaining = [hash for hash in hashes if hash not in local]
+    client = _get_redis_client()
+    with client.pipeline(transaction=False) as pipe:
+        pipe.get(_version_key(project.id))
+        for hash in remaining:
+            pipe.get(_hash_key(project.id, hash))
+        version_value, *values = pipe.execute()
+    version = int(version_value or 0)
+
+    for hash, (grouphash_id, group_id, local_version) in local.items():
+        if local_version == version:
+            found[hash] = _to_grouphash(project, hash, (grouphash_id, group_id))
+        else:
+            with _local_cache_lock:
+                _local_cache.pop((project.id, hash), None)
+    local_hits = len(found)
+
+    for hash, value in zip(remaining, values):
+        if value is None:
+            continue
+        grouphash_id, group_id, value_version = json.loads(value)
+        if value_version != version:
+            continue
+        found[hash] = _to_grouphash(project, hash, (grouphash_id, group_id))
+        with _local_cache_lock:
+            _local_cache[(project.id, hash)] = (grouphash_id, group_id, version)
+
+    remote_hits = len(found) - local_hits
+    metrics.incr("grouping.grouphash_cache.hit", amount=local_hits, tags={"tier": "local"})
+    metrics.incr("grouping.grouphash_cache.hit", amount=remote_hits, tags={"tier": "redis"})
+
+    if found and in_random_rollout("grouping.grouphash-cache.consistency-check-rate"):
+        _check_consistency(project, found)
+
+    missing = [hash for hash in hashes if hash not in found]
+    metrics.incr("grouping.grouphash_cache.miss", amount=len(missing))
+    if missing:
+        to_cache = {}
+        for hash in missing:
+            grouphash = GroupHash.objects.get_or_create(project=project, hash=hash)[0]
+            found[hash] = grouphash
+            if _is_settled(grouphash):
+                to_cache[hash] = grouphash
+        if to_cache:
+            _write_through(project, to_cache.values(), version)
+
+    return [found[hash] for hash in hashes]
+
+
+def _write_through(project: Project, grouphashes: Iterable[GroupHash], version: int) -> None:
+    client = _get_redis_client()
+    with client.pipeline(transaction=False) as pipe:
+        for grouphash in grouphashes:
+            # Writing the version read *before* the database was queried means
+            # that a concurrent invalidation wins over this write.
+            pipe.set(
+                _hash_key(project.id, grouphash.hash),
+                json.dumps([grouphash.id, grouphash.group_id, version]),
+                ex=REDIS_TTL,
+            )
+        pipe.execute()
+
+
+def _check_consistency(project: Project, found: dict[str, GroupHash]) -> None:
+    """
+    Compares cached rows with the database, and replaces them (and drops them
+    from the cache) if they disagree.
+    """
+    metrics.incr("grouping.grouphash_cache.consistency_check")
+    for grouphash in GroupHash.objects.filter(project=project, hash__in=list(found)):
+        cached = found[grouphash.hash]
+        if (cached.id, cached.group_id) == (grouphash.id, grouphash.group_id) and _is_settled(
+            grouphash
+        ):
+            continue
+
+        metrics.incr("grouping.grouphash_cache.inconsistent")
+        logger.warning(
+            "grouping.grouphash_cache.inconsistent",
+            extra={
+                "project_id": project.id,
+                "hash": grouphash.hash,
+                "cached_group_id": cached.group_id,
+                "group_id": grouphash.group_id,
+            },
+        )
+        found[grouphash.hash] = grouphash
+        with _local_cache_lock:
+            _local_cache.pop((project.id, grouphash.hash), None)
+        _get_redis_client().delete(_hash_key(project.id, grouphash.hash))
+
+
+def invalidate_grouphash_cache(project_ids: Iterable[int]) -> None:
+    """
+    Invalidates every cached grouphash of the given projects. Has to be called
+    whenever grouphashes are moved to another group, locked, tombstoned or
+    deleted.
+    """
+    project_ids = set(project_ids)
+    if not project_ids:
+        return
+
+    # Also runs while the cache is disabled, so that rows written before it
+    # was disabled are not served once it is enabled again.
+    version = time.time_ns()
+    client = _get_redis_client()
+    with client.pipeline(transaction=False) as pipe:
+        for project_id in project_ids:
+            pipe.set(_version_key(project_id), version, ex=VERSION_TTL)
+        pipe.execute()
+
+    with _local_cache_lock:
+        for key in [key for key in _local_cache if key[0] in project_ids]:
+            _local_cache.pop(key, None)
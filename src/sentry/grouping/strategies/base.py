@@ -270,6 +270,8 @@ class StrategyConfiguration:
     base: type["StrategyConfiguration"] | None = None
     config_class = None
     strategies: dict[str, Strategy[Any]] = {}
+    # `strategies` sorted by highest score to lowest, see `iter_strategies`
+    sorted_strategies: list[Strategy[Any]] = []
     delegates: dict[str, Strategy[Any]] = {}
     changelog: str | None = None
     hidden = False
@@ -290,7 +292,7 @@ class StrategyConfiguration:
 
     def iter_strategies(self) -> Iterator[Strategy[Any]]:
         """Iterates over all strategies by highest score to lowest."""
-        return iter(sorted(self.strategies.values(), key=lambda x: x.score and -x.score or 0))
+        return iter(self.sorted_strategies)
 
     @classmethod
     def as_dict(cls) -> dict[str, Any]:
@@ -373,6 +375,10 @@ def create_strategy_configuration(
         NewStrategyConfiguration.delegates[strategy.interface] = strategy
         new_delegates.add(strategy.interface)
 
+    NewStrategyConfiguration.sorted_strategies = sorted(
+        NewStrategyConfiguration.strategies.values(), key=lambda x: x.score and -x.score or 0
+    )
+
     if initial_context:
         NewStrategyConfiguration.initial_context.update(initial_context)
 
@@ -0,0 +1,114 @@
+"""Match transaction names against replacement rules.
+
+Replacement rules are globs over the segments of a transaction name, e.g.
+`/users/*/posts/*/**`, where `*` matches a single segment and `**` matches all
+remaining segments. Relay applies the first rule that matches a transaction
+name, after appending a trailing slash to it.
+
+Instead of matching every rule on its own, `RuleMatcher` compiles all rules of
+a project into a single trie of segments that is walked once per transaction
+name, so matching takes time linear in the number of segments. Compiled
+matchers are cached by their rules, so they are only rebuilt once the rules
+of a project change.
+"""
+
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+
+from .base import ReplacementRule
+
+__all__ = ["RuleMatcher", "get_rule_matcher"]
+
+#: Separator of the segments in rules and transaction names
+SEP = "/"
+
+#: Number of compiled matchers to keep
+MATCHER_CACHE_SIZE = 1000
+
+
+class _State:
+    """A node of the trie, reached after matching a prefix of the segments."""
+
+    __slots__ = ("literals", "star", "patterns", "double_star", "loops", "rule_index")
+
+    def __init__(self, loops: bool = False) -> None:
+        self.literals: dict[str, _State] = {}
+        self.star: _State | None = None
+        self.patterns: dict[str, tuple[re.Pattern[str], _State]] = {}
+        self.double_star: _State | None = None
+        #: Whether the state matches any number of additional segments
+        self.loops = loops
+        #: Index of the first rule that ends in this state
+        self.rule_index: int | None = None
+
+    def add(self, segment: str) -> "_State":
+        if segment == "**":
+            if self.double_star is None:
+                self.double_star = _State(loops=True)
+            return self.double_star
+        if segment == "*":
+            if self.star is None:
+                self.star = _State()
+            return self.star
+        if "*" in segment:
+            if segment not in self.patterns:
+                regex = "[^/]*".join(re.escape(part) for part in segment.split("*"))
+                self.patterns[segment] = (re.compile(regex), _State())
+            return self.patterns[segment][1]
+        return self.literals.setdefault(segment, _State())
+
+    def advance(self, segment: str, states: set["_State"]) -> None:
+        """Adds the states reached by matching `segment` from this state."""
+        if self.loops:
+            states.add(self)
+        if (literal := self.literals.get(segment)) is not None:
+            states.add(literal)
+        if self.star is not None:
+            states.add(self.star)
+        if self.double_star is not None:
+            states.add(self.double_star)
+        for pattern, state in self.patterns.values():
+            if pattern.fullmatch(segment):
+                states.add(state)
+
+
+class RuleMatcher:
+    """Finds the rule that applies to a transaction name, out of an ordered list of rules."""
+
+    def __init__(self, rules: Sequence[ReplacementRule]) -> None:
+        self._rules = list(rules)
+        self._root = _State()
+        for index, rule in enumerate(self._rules):
+            state = self._root
+            for segment in rule.split(SEP):
+                state = state.add(segment)
+            if state.rule_index is None:
+                state.rule_index = index
+
+    def match(self, transaction_name: str) -> ReplacementRule | None:
+        """Returns the first rule that matches the transaction name, if any."""
+        if not transaction_name.endswith(SEP):
+            transaction_name += SEP
+
+        states = {self._root}
+        for segment in transaction_name.split(SEP):
+            next_states: set[_State] = set()
+            for state in states:
+                state.advance(segment, next_states)
+            if not next_states:
+                return None
+            states = next_states
+
+        indexes = [state.rule_index for state in states if state.rule_index is not None]
+        return self._rules[min(indexes)] if indexes else None
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def _compile(rules: tuple[ReplacementRule, ...]) -> RuleMatcher:
+    return RuleMatcher(rules)
+
+
+def get_rule_matcher(rules: Sequence[ReplacementRule]) -> RuleMatcher:
+    """Returns a matcher for the rules, which are expected in the order Relay applies them."""
+    return _compile(tuple(rules))
@@ -1,4 +1,4 @@
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import datetime, timezone
 from typing import Protocol
 
@@ -6,6 +6,7 @@ import sentry_sdk
 
 from sentry.ingest.transaction_clusterer import ClustererNamespace
 from sentry.ingest.transaction_clusterer.datasource.redis import get_redis_client
+from sentry.ingest.transaction_clusterer.matcher import get_rule_matcher
 from sentry.ingest.transaction_clusterer.rule_validator import RuleValidator
 from sentry.models.project import Project
 from sentry.utils import metrics
@@ -73,9 +74,8 @@ class RedisRuleStore:
         """
         client = get_redis_client()
         key = self._get_rules_key(project)
-        # There is no atomic "overwrite if exists" for hashes, so fetch keys first:
-        existing_rules = client.hkeys(key)
-        if rule in existing_rules:
+        # There is no atomic "overwrite if exists" for hashes, so check first:
+        if client.hexists(key, rule):
             client.hset(key, rule, last_used)
 
 
@@ -203,6 +203,22 @@ def get_sorted_rules(
     return ProjectOptionRuleStore(namespace).read_sorted(project)
 
 
+def get_used_rules(
+    namespace: ClustererNamespace, project: Project, names: Iterable[str]
+) -> list[ReplacementRule]:
+    """Returns the stored rules that Relay would apply to any of the given names."""
+    sorted_rules = get_sorted_rules(namespace, project)
+    if not sorted_rules:
+        return []
+
+    matcher = get_rule_matcher([rule for rule, _ in sorted_rules])
+    used_rules: dict[ReplacementRule, None] = {}
+    for name in names:
+        if (rule := matcher.match(name)) is not None:
+            used_rules[rule] = None
+    return list(used_rules)
+
+
 def update_rules(
     namespace: ClustererNamespace, project: Project, new_rules: Sequence[ReplacementRule]
 ) -> int:
@@ -80,6 +80,13 @@ def cluster_projects(projects: Sequence[Project]) -> None:
                     clusterer.add_input(tx_names)
                     new_rules = clusterer.get_rules()
 
+                # Existing rules that apply to sampled names are still in use,
+                # so their lifetime is extended as if they were discovered again.
+                used_rules = rules.get_used_rules(
+                    ClustererNamespace.TRANSACTIONS, project, tx_names
+                )
+                new_rules += [rule for rule in used_rules if rule not in new_rules]
+
                 track_clusterer_run(ClustererNamespace.TRANSACTIONS, project)
 
                 # The Redis store may have more up-to-date last_seen values,
@@ -43,15 +43,21 @@ Resulting in the following replacement rules:
 
 The replacement rules are interpreted by Relay to match and replace `*`, and to match but ignore `**`.
 
+Nodes are merged as soon as they reach the threshold while input is added,
+rather than after the whole tree has been built. Because a merged node stays
+merged no matter what is added to it later, this results in the same tree,
+but no node ever holds more children than the threshold. The memory used is
+therefore bounded by the number of paths that remain after merging, not by
+the number of distinct input strings.
+
 """
 
 import logging
-from collections import UserDict, defaultdict
-from collections.abc import Iterable
+from collections import deque
+from collections.abc import Iterable, Iterator
+from sys import intern
 from typing import TypeAlias, Union
 
-import sentry_sdk
-
 from .base import Clusterer, ReplacementRule
 from .rule_validator import RuleValidator
 
@@ -83,11 +89,11 @@ class TreeClusterer(Clusterer):
         self._rules: list[ReplacementRule] | None = None
 
     def add_input(self, strings: Iterable[str]) -> None:
+        merge_threshold = self._merge_threshold
         for string in strings:
-            parts = string.split(SEP, maxsplit=MAX_DEPTH)
             node = self._tree
-            for part in parts:
-                node = node.setdefault(part, Node())
+            for part in string.split(SEP, maxsplit=MAX_DEPTH):
+                node = node.add_child(intern(part), merge_threshold)
 
     def get_rules(self) -> list[ReplacementRule]:
         """Computes the rules for the current tree."""
@@ -99,10 +105,7 @@ class TreeClusterer(Clusterer):
         return self._rules
 
     def _extract_rules(self) -> None:
-        """Merge high-cardinality nodes in the graph and extract rules"""
-        with sentry_sdk.start_span(op="cluster_merge"):
-            self._tree.merge(self._merge_threshold)
-
+        """Extract rules from the high-cardinality nodes merged in the graph"""
         # Generate exactly 1 rule for every merge
         rule_paths = [path for path in self._tree.paths() if path[-1] is MERGED]
         self._rules = [self._build_rule(path) for path in rule_paths]
@@ -131,35 +134,77 @@ class TreeClusterer(Clusterer):
 Edge: TypeAlias = Union[str, Merged]
 
 
-class Node(UserDict):
-    """Keys in this dict are names of the children"""
+class Node(dict):
+    """Keys in this dict are names of the children.
+
+    A merged node has a single child, keyed by `MERGED`.
+    """
+
+    __slots__ = ()
+
+    def add_child(self, name: str, merge_threshold: int) -> "Node":
+        """Returns the child with the given name, adding it if needed.
+
+        If the node is merged, or gets merged by adding the child, the merged
+        child is returned instead.
+        """
+        merged = self.get(MERGED)
+        if merged is not None:
+            return merged
+
+        child = self.get(name)
+        if child is None:
+            child = self[name] = Node()
+            if len(self) >= merge_threshold:
+                pending: deque[tuple[Node, Node]] = deque()
+                child = self.merge_children(pending)
+                _union(pending, merge_threshold)
+        return child
+
+    def merge_children(self, pending: deque[tuple["Node", "Node"]]) -> "Node":
+        """Replaces all children by a single merged child.
+
+        The subtrees of the children still need to be combined in the merged
+        child, which is done by `_union` for the pairs added to `pending`.
+        """
+        merged = Node()
+        pending.extend((merged, child) for child in self.values())
+        self.clear()
+        self[MERGED] = merged
+        return merged
 
-    def paths(self, ancestors: list[Edge] | None = None) -> Iterable[list[Edge]]:
+    def paths(self) -> Iterator[list[Edge]]:
         """Collect all paths and subpaths through the graph"""
-        if ancestors is None:
-            ancestors = []
-        for name, child in self.items():
-            path = ancestors + [name]
+        stack = [([name], child) for name, child in reversed(self.items())]
+        while stack:
+            path, node = stack.pop()
             yield path
-            yield from child.paths(ancestors=path)
-
-    def merge(self, merge_threshold: int) -> None:
-        """Recursively merge children of high-cardinality nodes"""
-        if len(self) >= merge_threshold:
-            merged_children = self._merge_nodes(self.values())
-            self.clear()
-            self[MERGED] = merged_children
-
-        for child in self.values():
-            child.merge(merge_threshold)
-
-    @classmethod
-    def _merge_nodes(cls, nodes: Iterable["Node"]) -> "Node":
-        children_by_name = defaultdict(list)
-        for node in nodes:
-            for name, child in node.items():
-                children_by_name[name].append(child)
-
-        return Node(
-            {name: cls._merge_nodes(children) for name, children in children_by_name.items()}
-        )
+            stack.extend((path + [name], child) for name, child in reversed(node.items()))
+
+
+def _union(pending: deque[tuple[Node, Node]], merge_threshold: int) -> None:
+    """Adds the subtree of every source node to its target node.
+
+    Target nodes that reach the threshold are merged on the way, and a target
+    is always merged if its source is, since the source must have reached the
+    threshold with a subset of the children. Source nodes are consumed: their
+    children are moved instead of copied.
+    """
+    while pending:
+        target, source = pending.popleft()
+        if MERGED in source and MERGED not in target:
+            target.merge_children(pending)
+
+        for name, child in source.items():
+            merged = target.get(MERGED)
+            if merged is not None:
+                pending.append((merged, child))
+                continue
+
+            existing = target.get(name)
+            if existing is not None:
+                pending.append((existing, child))
+            else:
+                target[name] = child
+                if len(target) >= merge_threshold:
+                    target.merge_children(pending)
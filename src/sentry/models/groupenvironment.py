@@ -1,4 +1,11 @@
-from django.db.models import DO_NOTHING, DateTimeField, Index
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from functools import reduce
+from operator import or_
+from typing import Any
+
+from django.db.models import DO_NOTHING, DateTimeField, Index, Q
 from django.db.models.signals import post_delete
 from django.utils import timezone
 
@@ -51,6 +58,59 @@ class GroupEnvironment(Model):
 
         return instance, created
 
+    @classmethod
+    def get_or_create_many(
+        cls,
+        keys: Sequence[tuple[int, int]],
+        defaults: Mapping[tuple[int, int], Mapping[str, Any]] | None = None,
+    ) -> dict[tuple[int, int], tuple[GroupEnvironment, bool]]:
+        """
+        Batched version of `get_or_create` for `(group_id, environment_id)`
+        keys. Cached rows are fetched with a single `get_many`, the remaining
+        ones with a single query, and only rows that do not exist yet fall back
+        to `get_or_create`.
+        """
+        defaults = defaults or {}
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+
+        cache_keys = {key: cls._get_cache_key(*key) for key in unique_keys}
+        cached = cache.get_many(list(cache_keys.values()))
+
+        result: dict[tuple[int, int], tuple[GroupEnvironment, bool]] = {}
+        missing = []
+        for key in unique_keys:
+            instance = cached.get(cache_keys[key])
+            if instance is not None:
+                result[key] = (instance, False)
+            else:
+                missing.append(key)
+
+        if not missing:
+            return result
+
+        to_cache = {}
+        query = reduce(
+            or_, (Q(group_id=group_id, environment_id=env_id) for group_id, env_id in missing)
+        )
+        for instance in cls.objects.filter(query):
+            key = (instance.group_id, instance.environment_id)
+            result[key] = (instance, False)
+            to_cache[cache_keys[key]] = instance
+
+        for key in missing:
+            if key in result:
+                continue
+            instance, created = cls.objects.get_or_create(
+                group_id=key[0], environment_id=key[1], defaults=defaults.get(key)
+            )
+            result[key] = (instance, created)
+            to_cache[cache_keys[key]] = instance
+
+        cache.set_many(to_cache, 3600)
+        return result
+
 
 post_delete.connect(
     lambda instance, **kwargs: cache.delete(
@@ -1,6 +1,14 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime as _datetime
 from datetime import timedelta
+from functools import reduce
+from operator import or_
+from typing import TYPE_CHECKING
 
 from django.db import IntegrityError, models, router, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from sentry.backup.scopes import RelocationScope
@@ -15,6 +23,11 @@ from sentry.tasks.process_buffer import buffer_incr
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import md5_text
 
+if TYPE_CHECKING:
+    from sentry.models.environment import Environment
+    from sentry.models.group import Group
+    from sentry.models.release import Release
+
 
 @region_silo_only_model
 class GroupRelease(Model):
@@ -51,30 +64,107 @@ class GroupRelease(Model):
 
         instance = cache.get(cache_key)
         if instance is None:
-            try:
-                with transaction.atomic(router.db_for_write(cls)):
-                    instance, created = (
-                        cls.objects.create(
-                            release_id=release.id,
-                            group_id=group.id,
-                            environment=environment.name,
-                            project_id=group.project_id,
-                            first_seen=datetime,
-                            last_seen=datetime,
-                        ),
-                        True,
-                    )
-            except IntegrityError:
-                instance, created = (
-                    cls.objects.get(
-                        release_id=release.id, group_id=group.id, environment=environment.name
-                    ),
-                    False,
-                )
+            instance, created = cls._create_or_get(group, release, environment, datetime)
         else:
             created = False
 
-        if not created and instance.last_seen < datetime - timedelta(seconds=60):
+        if not created:
+            cls._bump_last_seen(instance, datetime)
+
+        cache.set(cache_key, instance, 3600)
+        return instance
+
+    @classmethod
+    def get_or_create_many(
+        cls, items: Sequence[tuple[Group, Release, Environment, _datetime]]
+    ) -> list[GroupRelease]:
+        """
+        Batched version of `get_or_create`. Returns one instance per item, in
+        the same order. Every distinct `(group, release, environment)` is
+        resolved once: cached rows with a single `get_many`, the remaining rows
+        with a single query, and only rows that do not exist yet are inserted.
+        """
+        # (group_id, release_id, environment name) -> first item, used for inserts
+        first: dict[tuple[int, int, str], tuple[Group, Release, Environment, _datetime]] = {}
+        # (group_id, release_id, environment name) -> latest datetime, used for last_seen
+        latest: dict[tuple[int, int, str], _datetime] = {}
+        for item in items:
+            group, release, environment, datetime = item
+            key = (group.id, release.id, environment.name)
+            first.setdefault(key, item)
+            if key not in latest or latest[key] < datetime:
+                latest[key] = datetime
+
+        if not latest:
+            return []
+
+        cache_keys = {key: cls.get_cache_key(*key) for key in latest}
+        cached = cache.get_many(list(cache_keys.values()))
+
+        instances: dict[tuple[int, int, str], GroupRelease] = {}
+        created_keys = set()
+        missing = []
+        for key in latest:
+            instance = cached.get(cache_keys[key])
+            if instance is not None:
+                instances[key] = instance
+            else:
+                missing.append(key)
+
+        if missing:
+            query = reduce(
+                or_,
+                (
+                    Q(group_id=group_id, release_id=release_id, environment=environment)
+                    for group_id, release_id, environment in missing
+                ),
+            )
+            for instance in cls.objects.filter(query):
+                instances[(instance.group_id, instance.release_id, instance.environment)] = instance
+
+            for key in missing:
+                if key not in instances:
+                    instance, created = cls._create_or_get(*first[key])
+                    instances[key] = instance
+                    if created:
+                        created_keys.add(key)
+
+        for key, instance in instances.items():
+            if key not in created_keys or latest[key] != first[key][3]:
+                cls._bump_last_seen(instance, latest[key])
+
+        cache.set_many({cache_keys[key]: instance for key, instance in instances.items()}, 3600)
+        return [
+            instances[(group.id, release.id, environment.name)]
+            for group, release, environment, _ in items
+        ]
+
+    @classmethod
+    def _create_or_get(cls, group, release, environment, datetime):
+        try:
+            with transaction.atomic(router.db_for_write(cls)):
+                return (
+                    cls.objects.create(
+                        release_id=release.id,
+                        group_id=group.id,
+                        environment=environment.name,
+                        project_id=group.project_id,
+                        first_seen=datetime,
+                        last_seen=datetime,
+                    ),
+                    True,
+                )
+        except IntegrityError:
+            return (
+                cls.objects.get(
+                    release_id=release.id, group_id=group.id, environment=environment.name
+                ),
+                False,
+            )
+
+    @classmethod
+    def _bump_last_seen(cls, instance, datetime):
+        if instance.last_seen < datetime - timedelta(seconds=60):
             buffer_incr(
                 model=cls,
                 columns={},
@@ -82,6 +172,3 @@ class GroupRelease(Model):
                 extra={"last_seen": datetime},
             )
             instance.last_seen = datetime
-
-        cache.set(cache_key, instance, 3600)
-        return instance
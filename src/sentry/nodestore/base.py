@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import struct
 from datetime import datetime, timedelta
 from threading import local
 from typing import Any
@@ -9,7 +10,9 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore.local_cache import local_node_cache
 from sentry.utils import json, metrics
+from sentry.utils import zstd_dictionaries
 from sentry.utils.services import Service
 
 # Cache an instance of the encoder we want to use
@@ -27,6 +30,13 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Prefix of payloads written in the subkey-addressable format (see
+# `NodeStorage._encode_sections`). Neither JSON nor pickle (which the Django
+# backend used to write) can start with 0xff, so old payloads are still
+# recognized.
+SECTIONS_MAGIC = b"\xffns1"
+_sections_header_length = struct.Struct(">I")
+
 
 class NodeStorage(local, Service):
     """
@@ -99,6 +109,9 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if value.startswith(SECTIONS_MAGIC):
+            return self._decode_sections(value, subkey)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -119,6 +132,23 @@ class NodeStorage(local, Service):
         except StopIteration:
             return None
 
+    def _decode_sections(self, value: bytes, subkey: str | None) -> Any | None:
+        """
+        Decode a single subkey from a payload written by `_encode_sections`,
+        decompressing and parsing only the section that belongs to it.
+        """
+        header_start = len(SECTIONS_MAGIC) + _sections_header_length.size
+        (header_length,) = _sections_header_length.unpack_from(value, len(SECTIONS_MAGIC))
+        sections_start = header_start + header_length
+
+        for key, offset, length in json_loads(value[header_start:sections_start]):
+            if key == subkey:
+                start = sections_start + offset
+                section = memoryview(value)[start : start + length]
+                return json_loads(zstd_dictionaries.decompress(section))
+
+        return None
+
     def get_bytes(self, id: str) -> bytes | None:
         """
         >>> nodestore._get_bytes('key1')
@@ -136,6 +166,16 @@ class NodeStorage(local, Service):
         """
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
+            span.set_tag("subkey", str(subkey))
+
+            bytes_from_local_cache = self._get_local_cache_item(id)
+            if bytes_from_local_cache is not None:
+                rv = self._decode(bytes_from_local_cache, subkey=subkey)
+                metrics.incr("nodestore.get", tags={"cache": "local"})
+                span.set_tag("origin", "from_local_cache")
+                span.set_tag("found", bool(rv))
+                return rv
+
             if subkey is None:
                 item_from_cache = self._get_cache_item(id)
                 if item_from_cache:
@@ -144,11 +184,11 @@ class NodeStorage(local, Service):
                     span.set_tag("found", bool(item_from_cache))
                     return item_from_cache
 
-            span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
             rv = self._decode(bytes_data, subkey=subkey)
+            # set cache items only after we know decoding did not fail
+            self._set_local_cache_item(id, bytes_data)
             if subkey is None:
-                # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
 
             span.set_tag("result", "from_service")
@@ -181,23 +221,35 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
 
+            local_items = {}
+            for id in id_list:
+                bytes_data = self._get_local_cache_item(id)
+                if bytes_data is not None:
+                    local_items[id] = self._decode(bytes_data, subkey=subkey)
+            if len(local_items) == len(id_list):
+                span.set_tag("result", "from_local_cache")
+                return local_items
+
+            uncached_ids = [id for id in id_list if id not in local_items]
+
+            cache_items = {}
             if subkey is None:
-                cache_items = self._get_cache_items(id_list)
-                if len(cache_items) == len(id_list):
+                cache_items = self._get_cache_items(uncached_ids)
+                if len(cache_items) == len(uncached_ids):
                     span.set_tag("result", "from_cache")
+                    cache_items.update(local_items)
                     return cache_items
 
-                uncached_ids = [id for id in id_list if id not in cache_items]
-            else:
-                uncached_ids = id_list
+                uncached_ids = [id for id in uncached_ids if id not in cache_items]
 
-            items = {
-                id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
-            }
+            items = {}
+            for id, value in self._get_bytes_multi(uncached_ids).items():
+                items[id] = self._decode(value, subkey=subkey)
+                self._set_local_cache_item(id, value)
             if subkey is None:
                 self._set_cache_items(items)
-                items.update(cache_items)
+            items.update(cache_items)
+            items.update(local_items)
 
             span.set_tag("result", "from_service")
             span.set_tag("found", len(items))
@@ -213,6 +265,9 @@ class NodeStorage(local, Service):
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
         """
+        if options.get("nodestore.encode-sections"):
+            return self._encode_sections(data)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             if key is not None:
@@ -221,11 +276,44 @@ class NodeStorage(local, Service):
 
         return b"\n".join(lines)
 
+    def _encode_sections(self, data: dict[str | None, dict[str, str]]) -> bytes:
+        """
+        Encode data dict so that every subkey can be read without touching the
+        others: a header lists `[subkey, offset, length]` for each section,
+        and every section is compressed with zstd on its own.
+
+        >>> _encode_sections({"unprocessed": {}, None: {"stacktrace": {}}})
+        b'\xffns1' + <header length> + b'[[null,0,N],["unprocessed",N,M]]' + <N bytes> + <M bytes>
+        """
+        default = data.pop(None)
+        # Sections are compressed with the trained dictionary of the event's
+        # platform if there is one, see `sentry.utils.zstd_dictionaries`.
+        platform = default.get("platform") if isinstance(default, dict) else None
+        sections = [zstd_dictionaries.compress(json_dumps(default).encode("utf8"), platform)]
+        header: list[tuple[str | None, int, int]] = [(None, 0, len(sections[0]))]
+        offset = len(sections[0])
+        for key, value in data.items():
+            if key is not None:
+                # Keep the same restriction as `_encode`, subkeys are static
+                # ASCII identifiers.
+                key.encode("ascii")
+                section = zstd_dictionaries.compress(json_dumps(value).encode("utf8"), platform)
+                header.append((key, offset, len(section)))
+                sections.append(section)
+                offset += len(section)
+
+        header_bytes = json_dumps(header).encode("utf8")
+        return b"".join(
+            [SECTIONS_MAGIC, _sections_header_length.pack(len(header_bytes)), header_bytes]
+            + sections
+        )
+
     def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         """
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
         """
         metrics.distribution("nodestore.set_bytes", len(data))
+        local_node_cache.delete_many([item_id])
         return self._set_bytes(item_id, data, ttl)
 
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
@@ -289,13 +377,27 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        local_node_cache.delete_many([item_id])
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        local_node_cache.delete_many(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
+    def _get_local_cache_item(self, item_id: str) -> bytes | None:
+        if options.get("nodestore.local-cache.max-bytes") > 0:
+            return local_node_cache.get(item_id)
+        return None
+
+    def _set_local_cache_item(self, item_id: str, data: bytes | None) -> None:
+        max_bytes = options.get("nodestore.local-cache.max-bytes")
+        if data and max_bytes > 0:
+            local_node_cache.set(
+                item_id, data, max_bytes=max_bytes, ttl=options.get("nodestore.local-cache.ttl")
+            )
+
     @cached_property
     def cache(self) -> BaseCache | None:
         try:
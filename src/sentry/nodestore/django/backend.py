@@ -9,8 +9,10 @@ from typing import Any
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
-from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.base import SECTIONS_MAGIC, NodeStorage
+from sentry.nodestore.local_cache import local_node_cache
 from sentry.utils.strings import compress, decompress
+from sentry.utils.zstd_dictionaries import DictionaryNotFound
 
 from .models import Node
 
@@ -27,13 +29,16 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith(b"{") or value.startswith(SECTIONS_MAGIC):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
                 return pickle.loads(value)
 
             return None
+        except DictionaryNotFound:
+            # Payloads that cannot be read right now are not empty.
+            raise
         except Exception as e:
             logger.exception(str(e))
             return {}
@@ -62,6 +67,7 @@ class DjangoNodeStorage(NodeStorage):
         days = math.floor(total_seconds / 86400)
 
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
+        local_node_cache.clear()
         if self.cache:
             self.cache.clear()
 
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from time import monotonic
+
+from sentry.utils import metrics
+
+
+class LocalNodeCache:
+    """
+    A process-local, size-bounded LRU of raw (encoded) node payloads.
+
+    Entries are accounted by the length of their payload and expire after a
+    TTL. Only the encoded bytes are kept, so every hit is decoded again: callers
+    are free to mutate what they get back, and a `subkey` read only parses the
+    section it asks for.
+
+    The cache is shared by all threads of a process (`NodeStorage` itself is
+    thread-local), so every operation takes a lock.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        expired = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at <= monotonic():
+                    self._pop(key)
+                    expired = True
+                else:
+                    self._entries.move_to_end(key)
+                    metrics.incr("nodestore.local_cache.get", tags={"result": "hit"})
+                    return value
+
+        if expired:
+            metrics.incr("nodestore.local_cache.evict", tags={"reason": "ttl"})
+        metrics.incr("nodestore.local_cache.get", tags={"result": "miss"})
+        return None
+
+    def set(self, key: str, value: bytes, max_bytes: int, ttl: float) -> None:
+        if len(value) > max_bytes:
+            # Never let one oversized payload flush the whole cache.
+            self.delete_many([key])
+            return
+
+        evicted = 0
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (monotonic() + ttl, value)
+            self._size += len(value)
+            while self._size > max_bytes:
+                self._pop(next(iter(self._entries)))
+                evicted += 1
+            size = self._size
+
+        if evicted:
+            metrics.incr("nodestore.local_cache.evict", amount=evicted, tags={"reason": "size"})
+        metrics.gauge("nodestore.local_cache.bytes", size)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+local_node_cache = LocalNodeCache()
@@ -456,6 +456,13 @@ register(
     default=[],
     flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Only build the events of recording segments that are indexed during ingestion.
+register(
+    "replay.ingest.parse-indexed-events",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # User Feedback Options
 register(
@@ -632,6 +639,60 @@ register(
 
 register("snuba.snql.enable-orjson", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Query cache (`use_cache`) settings. Policies map a referrer (or "default") to
+# a `ttl` during which results are fresh, and a `stale_ttl` after it during which
+# stale results are served while they are refreshed in the background.
+register(
+    "snuba.query-cache.referrer-policies",
+    type=Dict,
+    default={},
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Share the execution of identical cacheable queries running concurrently in a process.
+# Callers that share a query also share its latency and errors.
+register(
+    "snuba.query-cache.coalesce-queries",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Seconds to wait for another process executing the same cacheable query, 0 disables it.
+# Request threads block while waiting, at most for `MAX_LEASE_WAIT_SECONDS`.
+register(
+    "snuba.query-cache.lease-wait-seconds",
+    type=Float,
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Rate at which discover timeseries queries serve settled time buckets from
+# the cache, see `sentry.snuba.timeseries_cache`.
+register(
+    "discover.timeseries-chunk-cache.rollout",
+    type=Float,
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Seconds after which time buckets are considered complete and can be cached.
+# Events that arrive later, or are deleted later, only show up once the cached
+# chunk expires, which takes at most as long as the chunk has been settled.
+register(
+    "discover.timeseries-chunk-cache.settle-seconds",
+    type=Int,
+    default=60 * 60,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Whether discover exports parse the rows of Snuba responses as they are received
+# instead of decoding whole responses at once. This only avoids holding the raw
+# response next to the decoded rows, each batch of processed rows is still kept
+# in memory until it has been written.
+register(
+    "data-export.discover.stream-results",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Kafka Publisher
 register("kafka-publisher.raw-event-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("kafka-publisher.max-event-size", default=100000, flags=FLAG_AUTOMATOR_MODIFIABLE)
@@ -1060,6 +1121,35 @@ register("relay.metric-bucket-distribution-encodings", default={}, flags=FLAG_AU
 # Controls the rollout rate in percent (`0.0` to `1.0`) for metric stats.
 register("relay.metric-stats.rollout-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Whether sections of project configs are cached across computations, so that
+# invalidations affecting only some sections reuse the others.
+# See `sentry.relay.config.sections`.
+register("relay.project-config-sections.cache", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Time to cache sections of project configs for, in seconds.
+register(
+    "relay.project-config-sections.cache-ttl",
+    type=Int,
+    default=60 * 60,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of project or key invalidations scheduled for an organization within the
+# coalescing window after which they are coalesced into a single invalidation of the
+# organization. 0 disables coalescing.
+register(
+    "relay.invalidation.coalesce-threshold",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "relay.invalidation.coalesce-window",
+    type=Int,
+    default=60,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of recomputed project configs written to the cache at once by invalidations.
+register("relay.invalidation.batch-size", type=Int, default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1264,6 +1354,24 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# An option to insert new strings of the Postgres indexer with a single
+# `INSERT ... ON CONFLICT DO NOTHING RETURNING` statement, instead of inserting
+# them and selecting them again.
+register(
+    "sentry-metrics.indexer.insert-returning",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Maximum number of strings kept in the process-local cache of the caching indexer,
+# in front of the indexer cache. 0 disables the process-local cache.
+register(
+    "sentry-metrics.indexer.local-cache-size",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Option to control sampling percentage of schema validation on the generic metrics pipeline
 # based on namespace.
 register(
@@ -1384,6 +1492,26 @@ register(
     default=True,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Fraction of each writes limit that an indexer process leases from redis at
+# once, see sentry.ratelimits.sliding_windows.RedisSlidingWindowRateLimiter.
+# Every process may reject up to this fraction of a limit too early per
+# granule. 0 disables leasing. Read once per process, when its writes limiter
+# is created.
+register(
+    "sentry-metrics.writes-limiter.lease-fraction",
+    type=Float,
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of unit hashes that a cardinality limiter remembers per process as
+# admitted, see sentry.ratelimits.cardinality.RedisCardinalityLimiter. 0
+# disables the cache. Read once per process, when the limiter is created.
+register(
+    "sentry-metrics.cardinality-limiter.local-cache-size",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 # per-organization limits on the number of timeseries that can be observed in
 # each window.
 #
@@ -1827,6 +1955,35 @@ register("span_descs.bump-lifetime-sample-rate", default=0.25, flags=FLAG_AUTOMA
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Write nodestore payloads in the subkey-addressable format, where each subkey
+# is compressed on its own and can be decoded without the others. Both formats
+# are always readable.
+register("nodestore.encode-sections", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Maps platforms to the id of the trained zstd dictionary new payloads of that
+# platform are compressed with. See `sentry zstd-dictionaries`.
+register("zstd-dictionaries.active", type=Dict, default={}, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Size of the process-local cache of raw nodestore payloads that sits in front
+# of the `nodedata` cache. `0` disables it.
+register(
+    "nodestore.local-cache.max-bytes", type=Int, default=0, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+# How long a payload may be served from the process-local cache, in seconds.
+register(
+    "nodestore.local-cache.ttl", type=Float, default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
+# === Grouphash cache related runtime options ===
+
+# Serve (project, hash) -> grouphash lookups during ingestion from a cache, see
+# `sentry.grouping.ingest.grouphash_cache`.
+register("grouping.grouphash-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Fraction of cached lookups that are compared against the database.
+register(
+    "grouping.grouphash-cache.consistency-check-rate",
+    type=Float,
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # === Backpressure related runtime options ===
 
@@ -2406,6 +2563,11 @@ register(
     default=0.0,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+register(
+    "standalone-spans.process-spans-consumer.batch-writes",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "standalone-spans.buffer-window.seconds",
     type=Int,
@@ -5,14 +5,16 @@ from sentry.utils.services import LazyServiceWrapper
 __all__ = (
     "for_organization_member_invite",
     "above_rate_limit_check",
+    "above_rate_limit_check_many",
     "get_rate_limit_config",
     "get_rate_limit_key",
     "get_rate_limit_value",
     "finish_request",
+    "RateLimitCheck",
     "RateLimiter",
 )
 
-from .base import RateLimiter
+from .base import RateLimitCheck, RateLimiter
 
 backend = LazyServiceWrapper(
     RateLimiter, settings.SENTRY_RATELIMITER, settings.SENTRY_RATELIMITER_OPTIONS
@@ -21,6 +23,7 @@ backend.expose(locals())
 
 from .utils import (
     above_rate_limit_check,
+    above_rate_limit_check_many,
     finish_request,
     for_organization_member_invite,
     get_rate_limit_config,
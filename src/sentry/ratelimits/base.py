@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, NamedTuple
 
 from sentry.utils.services import Service
 
@@ -8,8 +9,21 @@ if TYPE_CHECKING:
     from sentry.models.project import Project
 
 
+class RateLimitCheck(NamedTuple):
+    key: str
+    limit: int
+    project: Project | None = None
+    window: int | None = None
+
+
 class RateLimiter(Service):
-    __all__ = ("is_limited", "validate", "current_value", "is_limited_with_value")
+    __all__ = (
+        "is_limited",
+        "validate",
+        "current_value",
+        "is_limited_with_value",
+        "is_limited_many",
+    )
 
     window = 60
 
@@ -29,5 +43,17 @@ class RateLimiter(Service):
     ) -> tuple[bool, int, int]:
         return False, 0, 0
 
+    def is_limited_many(self, checks: Sequence[RateLimitCheck]) -> list[tuple[bool, int, int]]:
+        """
+        Does several rate limit checks at once, returning the result of
+        `is_limited_with_value` for every check in the same order.
+        """
+        return [
+            self.is_limited_with_value(
+                check.key, check.limit, project=check.project, window=check.window
+            )
+            for check in checks
+        ]
+
     def validate(self) -> None:
         raise NotImplementedError
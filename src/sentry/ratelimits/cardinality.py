@@ -1,5 +1,8 @@
-from collections.abc import Mapping, Sequence
+import threading
+import time
+from collections.abc import Iterator, Mapping, Sequence
 
+from cachetools import LRUCache
 from sentry_redis_tools.cardinality_limiter import CardinalityLimiter as CardinalityLimiterBase
 from sentry_redis_tools.cardinality_limiter import GrantedQuota, Quota
 from sentry_redis_tools.cardinality_limiter import (
@@ -8,6 +11,7 @@ from sentry_redis_tools.cardinality_limiter import (
 from sentry_redis_tools.cardinality_limiter import RequestedQuota
 from sentry_redis_tools.clients import BlasterClient, RedisCluster
 
+from sentry import options
 from sentry.utils import metrics, redis
 from sentry.utils.redis_metrics import RedisToolsMetricsBackend
 from sentry.utils.services import Service
@@ -29,6 +33,7 @@ class RedisCardinalityLimiter(CardinalityLimiter):
         num_shards: int = 3,
         num_physical_shards: int = 3,
         metric_tags: Mapping[str, str] | None = None,
+        local_cache_size: int | None = None,
     ) -> None:
         """
         :param cluster: Name of the redis cluster to use, to be configured with
@@ -41,6 +46,11 @@ class RedisCardinalityLimiter(CardinalityLimiter):
             Redis. The ratio `cluster_num_physical_shards / cluster_num_shards`
             is a sampling rate, the lower it is, the less precise accounting
             will be.
+        :param local_cache_size: The number of unit hashes that are
+            remembered per process as being admitted. Checks for those are
+            answered without asking redis, for as long as redis still counts
+            them towards the quota. `0` disables the cache. Defaults to the
+            `sentry-metrics.cardinality-limiter.local-cache-size` option.
         """
         is_redis_cluster, client, _ = redis.get_dynamic_cluster_from_options(
             "", {"cluster": cluster}
@@ -57,17 +67,121 @@ class RedisCardinalityLimiter(CardinalityLimiter):
             num_physical_shards=num_physical_shards,
             metrics_backend=RedisToolsMetricsBackend(metrics.backend, tags=metric_tags),
         )
+        self.metric_tags = metric_tags
+
+        if local_cache_size is None:
+            local_cache_size = options.get("sentry-metrics.cardinality-limiter.local-cache-size")
+
+        # (prefix, hash) -> timestamp until which redis counts the hash
+        self._admitted_hashes: LRUCache[tuple[str, Hash], Timestamp] | None = (
+            LRUCache(maxsize=local_cache_size) if local_cache_size else None
+        )
+        self._admitted_hashes_lock = threading.Lock()
 
         super().__init__()
 
     def check_within_quotas(
         self, requests: Sequence[RequestedQuota], timestamp: Timestamp | None = None
     ) -> tuple[Timestamp, Sequence[GrantedQuota]]:
-        return self.impl.check_within_quotas(requests, timestamp)
+        if self._admitted_hashes is None:
+            return self.impl.check_within_quotas(requests, timestamp)
+
+        timestamp = int(time.time()) if timestamp is None else int(timestamp)
+
+        admitted_hashes = []
+        remote_requests = []
+        for request in requests:
+            admitted, unknown = self._split_admitted(request, timestamp)
+            admitted_hashes.append(admitted)
+            if unknown:
+                remote_requests.append(request._replace(unit_hashes=unknown))
+
+        metrics.incr(
+            "ratelimits.cardinality.local_hit",
+            amount=sum(len(admitted) for admitted in admitted_hashes),
+            tags=self.metric_tags,
+        )
+
+        remote_grants: Iterator[GrantedQuota] = iter(())
+        if remote_requests:
+            _, grants = self.impl.check_within_quotas(remote_requests, timestamp)
+            remote_grants = iter(grants)
+
+        result = []
+        for request, admitted in zip(requests, admitted_hashes):
+            if len(admitted) == len(request.unit_hashes):
+                result.append(
+                    GrantedQuota(request=request, granted_unit_hashes=admitted, reached_quota=None)
+                )
+                continue
+
+            remote_grant = next(remote_grants)
+            granted = {*admitted, *remote_grant.granted_unit_hashes}
+            result.append(
+                GrantedQuota(
+                    request=request,
+                    granted_unit_hashes=[hash for hash in request.unit_hashes if hash in granted],
+                    reached_quota=remote_grant.reached_quota,
+                )
+            )
+
+        return timestamp, result
 
     def use_quotas(
         self,
         grants: Sequence[GrantedQuota],
         timestamp: Timestamp,
     ) -> None:
-        return self.impl.use_quotas(grants, timestamp)
+        if self._admitted_hashes is None:
+            return self.impl.use_quotas(grants, timestamp)
+
+        # Hashes that redis still counts do not have to be written again.
+        remote_grants = []
+        for grant in grants:
+            _, unknown = self._split_admitted(
+                grant.request._replace(unit_hashes=grant.granted_unit_hashes), timestamp
+            )
+            if unknown:
+                remote_grants.append(
+                    grant._replace(
+                        request=grant.request._replace(unit_hashes=unknown),
+                        granted_unit_hashes=unknown,
+                    )
+                )
+
+        if not remote_grants:
+            return
+
+        self.impl.use_quotas(remote_grants, timestamp)
+
+        with self._admitted_hashes_lock:
+            for grant in remote_grants:
+                quota = grant.request.quota
+                # A hash is written into the sets of all granules of the window
+                # starting at the current one, see
+                # `RedisCardinalityLimiterImpl._get_write_sets_keys`.
+                counted_until = (
+                    timestamp // quota.granularity_seconds * quota.granularity_seconds
+                    + quota.window_seconds
+                )
+                for hash in grant.granted_unit_hashes:
+                    self._admitted_hashes[(grant.request.prefix, hash)] = counted_until
+
+    def _split_admitted(
+        self, request: RequestedQuota, timestamp: Timestamp
+    ) -> tuple[list[Hash], list[Hash]]:
+        """
+        Splits the hashes of a request into the ones that are known to still
+        be counted by redis, and all others.
+        """
+        assert self._admitted_hashes is not None
+        admitted = []
+        unknown = []
+        with self._admitted_hashes_lock:
+            for hash in request.unit_hashes:
+                counted_until = self._admitted_hashes.get((request.prefix, hash))
+                if counted_until is not None and timestamp < counted_until:
+                    admitted.append(hash)
+                else:
+                    unknown.append(hash)
+        return admitted, unknown
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from time import time
 from typing import TYPE_CHECKING, Any
 
@@ -8,7 +9,7 @@ from django.conf import settings
 from redis.exceptions import RedisError
 
 from sentry.exceptions import InvalidConfiguration
-from sentry.ratelimits.base import RateLimiter
+from sentry.ratelimits.base import RateLimitCheck, RateLimiter
 from sentry.utils import redis
 from sentry.utils.hashlib import md5_text
 
@@ -118,3 +119,37 @@ class RedisRateLimiter(RateLimiter):
             return False, 0, reset_time
 
         return result > limit, result, reset_time
+
+    def is_limited_many(self, checks: Sequence[RateLimitCheck]) -> list[tuple[bool, int, int]]:
+        """
+        Does the same as `is_limited_with_value` for every check, but with a
+        single round-trip to redis.
+        """
+        if not checks:
+            return []
+
+        request_time = time()
+        windows = [check.window or self.window for check in checks]
+        reset_times = [
+            _bucket_start_time(_time_bucket(request_time, window) + 1, window)
+            for window in windows
+        ]
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for check, window in zip(checks, windows):
+                redis_key = self._construct_redis_key(
+                    check.key, project=check.project, window=window, request_time=request_time
+                )
+                pipe.incr(redis_key)
+                pipe.expire(redis_key, window - int(request_time % window))
+            pipeline_result = pipe.execute()
+        except RedisError:
+            # We don't want rate limited endpoints to fail when ratelimits
+            # can't be updated. We do want to know when that happens.
+            logger.exception("Failed to retrieve current value from redis")
+            return [(False, 0, reset_time) for reset_time in reset_times]
+
+        return [
+            (result > check.limit, result, reset_time)
+            for check, result, reset_time in zip(checks, pipeline_result[::2], reset_times)
+        ]
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import math
+import threading
+from collections import defaultdict
 from collections.abc import Sequence
+from dataclasses import dataclass
+from time import time
 from typing import Any
 
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
@@ -11,11 +16,14 @@ from sentry_redis_tools.sliding_windows_rate_limiter import (
 from sentry_redis_tools.sliding_windows_rate_limiter import RequestedQuota, Timestamp
 
 from sentry.exceptions import InvalidConfiguration
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.services import Service
 
 __all__ = ["Quota", "GrantedQuota", "RequestedQuota", "Timestamp"]
 
+# Once more leases than this are held, leases of past granules are returned.
+MAX_LEASES = 10_000
+
 
 class SlidingWindowRateLimiter(Service):
     def __init__(self, **options: Any) -> None:
@@ -119,11 +127,42 @@ class SlidingWindowRateLimiter(Service):
         return grants
 
 
+@dataclass
+class Lease:
+    """
+    A part of a quota's limit that has been consumed in redis ahead of time,
+    and which can be handed out without asking redis again.
+    """
+
+    # Leases are only valid for the granule that they have been consumed in,
+    # whatever remains of them afterwards is returned to redis.
+    granule: int
+    remaining: int
+
+
 class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
+    """
+    Redis backed sliding windows rate limiter.
+
+    If the `lease_fraction` option is set, every process leases that fraction
+    of each quota's limit from redis at once and serves checks from memory
+    until the lease is exhausted. Leased quota is consumed in redis right away,
+    so limits are never exceeded. What remains of a lease at the end of its
+    granule is returned to redis the next time the process checks the quota.
+    Leased quota that has not been handed out yet cannot be used by other
+    processes, so at any time up to one lease, i.e. about
+    `lease_fraction * limit`, per process and quota may be rejected too early.
+    A process that stops checking a quota holds on to its lease until the
+    lease's granule leaves the window.
+    """
+
     def __init__(self, **options: Any) -> None:
         self.cluster_key = options.get("cluster", "default")
+        self.lease_fraction: float = options.get("lease_fraction", 0.0)
         self._client: RedisCluster | StrictRedis | None = None
         self._impl: RedisSlidingWindowRateLimiterImpl | None = None
+        self._leases: dict[tuple[str, Quota], Lease] = {}
+        self._lease_lock = threading.Lock()
         super().__init__(**options)
 
     @property
@@ -149,7 +188,12 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
     def check_within_quotas(
         self, requests: Sequence[RequestedQuota], timestamp: Timestamp | None = None
     ) -> tuple[Timestamp, Sequence[GrantedQuota]]:
-        return self.impl.check_within_quotas(requests, timestamp)
+        if not self.lease_fraction:
+            return self.impl.check_within_quotas(requests, timestamp)
+
+        timestamp = int(time()) if timestamp is None else int(timestamp)
+        with self._lease_lock:
+            return timestamp, self._check_leases(requests, timestamp)
 
     def use_quotas(
         self,
@@ -157,4 +201,109 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         grants: Sequence[GrantedQuota],
         timestamp: Timestamp,
     ) -> None:
-        return self.impl.use_quotas(requests, grants, timestamp)
+        if not self.lease_fraction:
+            return self.impl.use_quotas(requests, grants, timestamp)
+
+        with self._lease_lock:
+            for request, grant in zip(requests, grants):
+                for quota in request.quotas:
+                    lease = self._leases.get(self._get_lease_key(request, quota))
+                    if lease is not None and lease.granule == self._get_granule(quota, timestamp):
+                        lease.remaining = max(0, lease.remaining - grant.granted)
+
+    @staticmethod
+    def _get_lease_key(request: RequestedQuota, quota: Quota) -> tuple[str, Quota]:
+        return quota.prefix_override or request.prefix, quota
+
+    @staticmethod
+    def _get_granule(quota: Quota, timestamp: Timestamp) -> int:
+        return timestamp // quota.granularity_seconds
+
+    def _get_lease_size(self, quota: Quota) -> int:
+        return max(1, math.ceil(quota.limit * self.lease_fraction))
+
+    def _return_leases(self, leases: Sequence[tuple[tuple[str, Quota], Lease]]) -> None:
+        """Gives the unused part of expired leases back to the granules they were consumed in."""
+        returns: dict[int, list[tuple[RequestedQuota, GrantedQuota]]] = defaultdict(list)
+        for (prefix, quota), lease in leases:
+            if lease.remaining:
+                returns[lease.granule * quota.granularity_seconds].append(
+                    (
+                        RequestedQuota(prefix=prefix, requested=0, quotas=[quota]),
+                        GrantedQuota(prefix=prefix, granted=-lease.remaining, reached_quotas=[]),
+                    )
+                )
+
+        for timestamp, lease_returns in returns.items():
+            metrics.incr("ratelimits.sliding_windows.lease_return", amount=len(lease_returns))
+            requests, grants = zip(*lease_returns)
+            self.impl.use_quotas(requests, grants, timestamp)
+
+    def _check_leases(
+        self, requests: Sequence[RequestedQuota], timestamp: Timestamp
+    ) -> list[GrantedQuota]:
+        # How much of each lease is requested in total by this call.
+        demand: dict[tuple[str, Quota], int] = defaultdict(int)
+        for request in requests:
+            for quota in request.quotas:
+                demand[self._get_lease_key(request, quota)] += request.requested
+
+        # Leases of past granules are returned once they are needed again, or
+        # all at once if too many of them are held.
+        candidates = self._leases if len(self._leases) > MAX_LEASES else demand
+        expired = [
+            (prefix, quota)
+            for prefix, quota in candidates
+            if (lease := self._leases.get((prefix, quota))) is not None
+            and lease.granule != self._get_granule(quota, timestamp)
+        ]
+        self._return_leases([(key, self._leases.pop(key)) for key in expired])
+
+        renewals = []
+        for (prefix, quota), requested in demand.items():
+            granule = self._get_granule(quota, timestamp)
+            lease = self._leases.get((prefix, quota))
+            if lease is None:
+                lease = self._leases[(prefix, quota)] = Lease(granule=granule, remaining=0)
+
+            # Only go to redis once the lease is (about to be) exhausted, and
+            # then lease enough for this call and the ones after it.
+            if lease.remaining < requested:
+                renewals.append(
+                    RequestedQuota(
+                        prefix=prefix,
+                        requested=requested - lease.remaining + self._get_lease_size(quota),
+                        quotas=[quota],
+                    )
+                )
+
+        metrics.incr("ratelimits.sliding_windows.lease", amount=len(demand) - len(renewals))
+        if renewals:
+            metrics.incr("ratelimits.sliding_windows.lease_renewal", amount=len(renewals))
+            _, renewal_grants = self.impl.check_within_quotas(renewals, timestamp)
+            self.impl.use_quotas(renewals, renewal_grants, timestamp)
+            for renewal, grant in zip(renewals, renewal_grants):
+                self._leases[(renewal.prefix, renewal.quotas[0])].remaining += grant.granted
+
+        # Hand out the leases the same way the underlying rate limiter hands
+        # out quota, so that results are identical as long as nothing is leased
+        # by other processes.
+        available = {key: self._leases[key].remaining for key in demand}
+        grants = []
+        for request in requests:
+            granted = request.requested
+            reached_quotas = []
+            for quota in request.quotas:
+                remaining = available[self._get_lease_key(request, quota)]
+                if remaining < granted:
+                    granted = remaining
+                    reached_quotas.append(quota)
+
+            for quota in request.quotas:
+                available[self._get_lease_key(request, quota)] -= granted
+
+            grants.append(
+                GrantedQuota(prefix=request.prefix, granted=granted, reached_quotas=reached_quotas)
+            )
+
+        return grants
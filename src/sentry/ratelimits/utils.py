@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Mapping, Sequence
 from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
@@ -10,6 +10,7 @@ from rest_framework.response import Response
 
 from sentry import features
 from sentry.constants import SentryAppInstallationStatus
+from sentry.ratelimits.base import RateLimitCheck
 from sentry.ratelimits.concurrent import ConcurrentRateLimiter
 from sentry.ratelimits.config import DEFAULT_RATE_LIMIT_CONFIG, RateLimitConfig
 from sentry.services.hybrid_cloud.auth import AuthenticatedToken
@@ -184,40 +185,59 @@ def get_rate_limit_value(
 def above_rate_limit_check(
     key: str, rate_limit: RateLimit, request_uid: str, group: str
 ) -> RateLimitMeta:
+    return above_rate_limit_check_many([(key, rate_limit)], request_uid, group)[0]
+
+
+def above_rate_limit_check_many(
+    checks: Sequence[tuple[str, RateLimit]], request_uid: str, group: str
+) -> list[RateLimitMeta]:
+    """
+    Checks several rate limits of a request at once. The fixed window limits
+    of all checks are resolved with a single call to the rate limiter.
+    """
     # TODO: This is not as performant as it could be. The roundtrip betwwen the server and redis
     # is doubled because the fixd window limit and concurrent limit are two separate things with different
     # paths. Ideally there is just one lua script that does both and just says what kind of limit was hit
     # (if any)
-    rate_limit_type = RateLimitType.NOT_LIMITED
-    window_limited, current, reset_time = ratelimiter.is_limited_with_value(
-        key, limit=rate_limit.limit, window=rate_limit.window
+    window_results = ratelimiter.is_limited_many(
+        [
+            RateLimitCheck(key, limit=rate_limit.limit, window=rate_limit.window)
+            for key, rate_limit in checks
+        ]
     )
-    remaining = rate_limit.limit - current if not window_limited else 0
-    concurrent_requests = None
-    if window_limited:
-        rate_limit_type = RateLimitType.FIXED_WINDOW
-    else:
-        # if we have hit the fixed window rate limit, there is no reason
-        # to do the work of the concurrent limit as well
-        if rate_limit.concurrent_limit is not None:
-            concurrent_limit_info = concurrent_limiter().start_request(
-                key, rate_limit.concurrent_limit, request_uid
+
+    metas = []
+    for (key, rate_limit), (window_limited, current, reset_time) in zip(checks, window_results):
+        rate_limit_type = RateLimitType.NOT_LIMITED
+        remaining = rate_limit.limit - current if not window_limited else 0
+        concurrent_requests = None
+        if window_limited:
+            rate_limit_type = RateLimitType.FIXED_WINDOW
+        else:
+            # if we have hit the fixed window rate limit, there is no reason
+            # to do the work of the concurrent limit as well
+            if rate_limit.concurrent_limit is not None:
+                concurrent_limit_info = concurrent_limiter().start_request(
+                    key, rate_limit.concurrent_limit, request_uid
+                )
+                if concurrent_limit_info.limit_exceeded:
+                    rate_limit_type = RateLimitType.CONCURRENT
+                concurrent_requests = concurrent_limit_info.current_executions
+
+        metas.append(
+            RateLimitMeta(
+                rate_limit_type=rate_limit_type,
+                current=current,
+                limit=rate_limit.limit,
+                window=rate_limit.window,
+                group=group,
+                reset_time=reset_time,
+                remaining=remaining,
+                concurrent_limit=rate_limit.concurrent_limit,
+                concurrent_requests=concurrent_requests,
             )
-            if concurrent_limit_info.limit_exceeded:
-                rate_limit_type = RateLimitType.CONCURRENT
-            concurrent_requests = concurrent_limit_info.current_executions
-
-    return RateLimitMeta(
-        rate_limit_type=rate_limit_type,
-        current=current,
-        limit=rate_limit.limit,
-        window=rate_limit.window,
-        group=group,
-        reset_time=reset_time,
-        remaining=remaining,
-        concurrent_limit=rate_limit.concurrent_limit,
-        concurrent_requests=concurrent_requests,
-    )
+        )
+    return metas
 
 
 def finish_request(key: str, request_uid: str) -> None:
@@ -241,29 +261,29 @@ def for_organization_member_invite(
     if not features.has("organizations:invite-members-rate-limits", organization, actor=user):
         return False
 
-    return any(
-        (
-            (
-                ratelimiter.is_limited(
-                    "members:invite-by-user:{}".format(
-                        md5_text(
-                            user.id if user and user.is_authenticated else str(auth)
-                        ).hexdigest()
-                    ),
-                    **config["members:invite-by-user"],
-                )
-                if (user or auth)
-                else None
-            ),
-            ratelimiter.is_limited(
-                f"members:invite-by-org:{md5_text(organization.id).hexdigest()}",
-                **config["members:invite-by-org"],
-            ),
-            ratelimiter.is_limited(
-                "members:org-invite-to-email:{}-{}".format(
-                    organization.id, md5_text(email.lower()).hexdigest()
+    checks = []
+    if user or auth:
+        checks.append(
+            RateLimitCheck(
+                "members:invite-by-user:{}".format(
+                    md5_text(user.id if user and user.is_authenticated else str(auth)).hexdigest()
                 ),
-                **config["members:org-invite-to-email"],
+                **config["members:invite-by-user"],
+            )
+        )
+    checks.append(
+        RateLimitCheck(
+            f"members:invite-by-org:{md5_text(organization.id).hexdigest()}",
+            **config["members:invite-by-org"],
+        )
+    )
+    checks.append(
+        RateLimitCheck(
+            "members:org-invite-to-email:{}-{}".format(
+                organization.id, md5_text(email.lower()).hexdigest()
             ),
+            **config["members:org-invite-to-email"],
         )
     )
+
+    return any(is_limited for is_limited, _, _ in ratelimiter.is_limited_many(checks))
@@ -38,11 +38,16 @@ from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey
-from sentry.relay.config.experimental import TimeChecker, add_experimental_config
+from sentry.relay.config.experimental import (
+    ExperimentalConfigBuilder,
+    TimeChecker,
+    add_experimental_config,
+)
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
 )
+from sentry.relay.config.sections import ProjectConfigSections
 from sentry.relay.utils import to_camel_case_name
 from sentry.sentry_metrics.use_case_id_registry import USE_CASE_ID_CARDINALITY_LIMIT_QUOTA_OPTIONS
 from sentry.sentry_metrics.visibility import get_metrics_blocking_state_for_relay_config
@@ -315,7 +320,10 @@ def get_metrics_config(timeout: TimeChecker, project: Project) -> Mapping[str, A
 
 
 def get_project_config(
-    project: Project, full_config: bool = True, project_keys: Sequence[ProjectKey] | None = None
+    project: Project,
+    full_config: bool = True,
+    project_keys: Sequence[ProjectKey] | None = None,
+    sections: ProjectConfigSections | None = None,
 ) -> "ProjectConfig":
     """Constructs the ProjectConfig information.
     :param project: The project to load configuration for. Ensure that
@@ -328,15 +336,24 @@ def get_project_config(
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param sections: Sections of the config to share between the configs of
+        multiple keys of the project. By default, all sections are computed.
     :return: a ProjectConfig object for the given project
     """
+    if sections is None:
+        sections = ProjectConfigSections(project)
+
     with sentry_sdk.push_scope() as scope:
         scope.set_tag("project", project.id)
         with (
             sentry_sdk.start_transaction(name="get_project_config"),
             metrics.timer("relay.config.get_project_config.duration"),
         ):
-            return _get_project_config(project, full_config=full_config, project_keys=project_keys)
+            config = _get_project_config(
+                project, sections, full_config=full_config, project_keys=project_keys
+            )
+            sections.save()
+            return config
 
 
 def get_dynamic_sampling_config(timeout: TimeChecker, project: Project) -> Mapping[str, Any] | None:
@@ -727,7 +744,10 @@ def _get_mobile_performance_profiles(organization: Organization) -> list[dict[st
 
 
 def _get_project_config(
-    project: Project, full_config: bool = True, project_keys: Sequence[ProjectKey] | None = None
+    project: Project,
+    sections: ProjectConfigSections,
+    full_config: bool = True,
+    project_keys: Sequence[ProjectKey] | None = None,
 ) -> "ProjectConfig":
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
@@ -759,22 +779,24 @@ def _get_project_config(
 
     config = cfg["config"]
 
-    with sentry_sdk.start_span(op="get_exposed_features"):
-        if exposed_features := get_exposed_features(project):
-            config["features"] = exposed_features
+    sections.apply(config, "features", lambda: _get_features_section(project))
 
     # NOTE: Omitting dynamicSampling because of a failure increases the number
     # of events forwarded by Relay, because dynamic sampling will stop filtering
     # anything.
-    add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
+    sections.apply(
+        config,
+        "sampling",
+        lambda: _get_experimental_section("sampling", get_dynamic_sampling_config, project),
+    )
 
     # Rules to replace high cardinality transaction names
-    add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
-
-    # Mark the project as ready if it has seen >= 10 clusterer runs.
-    # This prevents projects from prematurely marking all URL transactions as sanitized.
-    if get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"] >= MIN_CLUSTERER_RUNS:
-        config["txNameReady"] = True
+    sections.apply(
+        config,
+        "transaction_name_rules",
+        lambda: _get_experimental_section("txNameRules", get_transaction_names_config, project),
+    )
+    sections.apply(config, "transaction_name_ready", lambda: _get_tx_name_ready_section(project))
 
     if not full_config:
         # This is all we need for external Relay processors
@@ -782,25 +804,40 @@ def _get_project_config(
 
     config["breakdownsV2"] = project.get_option("sentry:breakdowns")
 
-    add_experimental_config(config, "metrics", get_metrics_config, project)
+    sections.apply(
+        config,
+        "metrics",
+        lambda: _get_experimental_section("metrics", get_metrics_config, project),
+    )
 
     if _should_extract_transaction_metrics(project):
-        add_experimental_config(
+        breakdowns = config.get("breakdownsV2")
+        sections.apply(
             config,
-            "transactionMetrics",
-            get_transaction_metrics_settings,
-            project,
-            config.get("breakdownsV2"),
+            "transaction_metrics",
+            lambda: _get_experimental_section(
+                "transactionMetrics", get_transaction_metrics_settings, project, breakdowns
+            ),
         )
 
         # This config key is technically not specific to _transaction_ metrics,
         # is however currently both only applied to transaction metrics in
         # Relay, and only used to tag transaction metrics in Sentry.
-        add_experimental_config(
-            config, "metricConditionalTagging", get_metric_conditional_tagging_rules, project
+        sections.apply(
+            config,
+            "metric_conditional_tagging",
+            lambda: _get_experimental_section(
+                "metricConditionalTagging", get_metric_conditional_tagging_rules, project
+            ),
         )
 
-        add_experimental_config(config, "metricExtraction", get_metric_extraction_config, project)
+        sections.apply(
+            config,
+            "metric_extraction",
+            lambda: _get_experimental_section(
+                "metricExtraction", get_metric_extraction_config, project
+            ),
+        )
 
     if features.has("organizations:metrics-extraction", project.organization):
         config["sessionMetrics"] = {
@@ -811,29 +848,72 @@ def _get_project_config(
             ),
         }
 
+    sections.apply(config, "performance_score", lambda: _get_performance_score_section(project))
+    sections.apply(config, "filters", lambda: _get_filters_section(project))
+    sections.apply(config, "grouping", lambda: _get_grouping_section(project))
+    sections.apply(config, "event_retention", lambda: _get_event_retention_section(project))
+
+    with Hub.current.start_span(op="get_all_quotas"):
+        if quotas_config := get_quotas(project, keys=project_keys):
+            config["quotas"] = quotas_config
+
+    return ProjectConfig(project, **cfg)
+
+
+def _get_experimental_section(
+    key: str, function: ExperimentalConfigBuilder, *args: Any
+) -> Mapping[str, Any]:
+    section: dict[str, Any] = {}
+    add_experimental_config(section, key, function, *args)
+    return section
+
+
+def _get_features_section(project: Project) -> Mapping[str, Any]:
+    with sentry_sdk.start_span(op="get_exposed_features"):
+        if exposed_features := get_exposed_features(project):
+            return {"features": exposed_features}
+    return {}
+
+
+def _get_tx_name_ready_section(project: Project) -> Mapping[str, Any]:
+    # Mark the project as ready if it has seen >= 10 clusterer runs.
+    # This prevents projects from prematurely marking all URL transactions as sanitized.
+    if get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"] >= MIN_CLUSTERER_RUNS:
+        return {"txNameReady": True}
+    return {}
+
+
+def _get_performance_score_section(project: Project) -> Mapping[str, Any]:
     performance_score_profiles = [
         *_get_browser_performance_profiles(project.organization),
         *_get_mobile_performance_profiles(project.organization),
     ]
     if performance_score_profiles:
-        config["performanceScore"] = {"profiles": performance_score_profiles}
+        return {"performanceScore": {"profiles": performance_score_profiles}}
+    return {}
+
 
+def _get_filters_section(project: Project) -> Mapping[str, Any]:
     with Hub.current.start_span(op="get_filter_settings"):
         if filter_settings := get_filter_settings(project):
-            config["filterSettings"] = filter_settings
+            return {"filterSettings": filter_settings}
+    return {}
+
+
+def _get_grouping_section(project: Project) -> Mapping[str, Any]:
     with Hub.current.start_span(op="get_grouping_config_dict_for_project"):
         grouping_config = get_grouping_config_dict_for_project(project)
         if grouping_config is not None:
-            config["groupingConfig"] = grouping_config
+            return {"groupingConfig": grouping_config}
+    return {}
+
+
+def _get_event_retention_section(project: Project) -> Mapping[str, Any]:
     with Hub.current.start_span(op="get_event_retention"):
         event_retention = quotas.backend.get_event_retention(project.organization)
         if event_retention is not None:
-            config["eventRetention"] = event_retention
-    with Hub.current.start_span(op="get_all_quotas"):
-        if quotas_config := get_quotas(project, keys=project_keys):
-            config["quotas"] = quotas_config
-
-    return ProjectConfig(project, **cfg)
+            return {"eventRetention": event_retention}
+    return {}
 
 
 class _ConfigBase:
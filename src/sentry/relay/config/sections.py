@@ -0,0 +1,164 @@
+"""
+Sections of project configs, computed once and reused where possible.
+
+The config of a project is split into sections that are computed
+independently (see `_get_project_config`). Sections are computed once per
+`ProjectConfigSections`, so that the configs of all keys of a project share
+them, and most of them are also cached across computations.
+
+Keys built with `add_experimental_config` are sections of their own. A build
+that fails or times out leaves its section empty, and empty sections are never
+cached, so that a failure is retried by the next computation instead of being
+served from the cache.
+
+Cached sections are reused only when a config is recomputed for an
+invalidation that cannot have changed them: the dynamic sampling boosts,
+for instance, invalidate entire organizations every few minutes but only
+change the sampling rules, which are never cached. Any other computation
+recomputes and caches all sections.
+
+Cached sections are stored under generations of their organization and
+project, which are replaced as soon as an invalidation that may affect them
+is scheduled (see `invalidate_cached_sections`). Stale sections hence
+become unreachable even if the invalidation itself is debounced into a task
+that would otherwise reuse them.
+"""
+
+import uuid
+from collections.abc import Callable, Mapping, MutableMapping
+from typing import Any
+
+from django.core.cache import cache
+
+from sentry import options
+from sentry.models.project import Project
+from sentry.utils import metrics
+
+__all__ = [
+    "ProjectConfigSections",
+    "invalidate_cached_sections",
+    "reuses_cached_sections",
+]
+
+#: Sections that are never cached across computations, because they change
+#: over time without an invalidation.
+UNCACHED_SECTIONS = frozenset({"sampling"})
+
+#: Invalidation triggers that only affect uncached sections or the parts of
+#: the config that are specific to a key, so cached sections can be reused.
+REUSE_SECTIONS_TRIGGERS = frozenset(
+    {
+        "dynamic_sampling:boost_release",
+        "dynamic_sampling:custom_rule_upsert",
+        "dynamic_sampling_boost_low_volume_projects",
+        "dynamic_sampling_boost_low_volume_transactions",
+        "projectkey.post_delete",
+        "projectkey.post_save",
+    }
+)
+
+#: Time to keep generations for, in seconds. Must outlive the cached sections.
+GENERATION_TTL = 24 * 60 * 60
+
+Section = Mapping[str, Any]
+
+
+def _get_generation_key(scope: str, scope_id: int) -> str:
+    return f"relayconfig-gen:{scope}:{scope_id}"
+
+
+def reuses_cached_sections(trigger: str | None) -> bool:
+    """Whether a config recomputed for the given invalidation trigger may reuse cached sections."""
+    return trigger in REUSE_SECTIONS_TRIGGERS
+
+
+def invalidate_cached_sections(
+    trigger: str, organization_id: int | None = None, project_id: int | None = None
+) -> None:
+    """Makes the cached sections of an organization or project unreachable,
+    unless the invalidation trigger cannot have changed them."""
+    if reuses_cached_sections(trigger):
+        return
+
+    if organization_id is not None:
+        cache.set(_get_generation_key("o", organization_id), uuid.uuid4().hex, GENERATION_TTL)
+    elif project_id is not None:
+        cache.set(_get_generation_key("p", project_id), uuid.uuid4().hex, GENERATION_TTL)
+
+
+class ProjectConfigSections:
+    """Computes the sections of a project's config, reusing them where possible.
+
+    :param reuse_cached: Whether sections cached by previous computations may
+        be used. Otherwise, all sections are recomputed, and cached.
+    """
+
+    def __init__(self, project: Project, reuse_cached: bool = False) -> None:
+        self._project = project
+        self._enabled = options.get("relay.project-config-sections.cache")
+        self._reuse_cached = reuse_cached
+        self._computed: dict[str, Section] = {}
+        self._cache_key: str | None = None
+        self._cached: dict[str, Section] | None = None
+        self._dirty = False
+
+    def _get_cache_key(self) -> str:
+        if self._cache_key is None:
+            keys = [
+                _get_generation_key("o", self._project.organization_id),
+                _get_generation_key("p", self._project.id),
+            ]
+            generations = cache.get_many(keys)
+            for key in keys:
+                if key not in generations:
+                    cache.add(key, uuid.uuid4().hex, GENERATION_TTL)
+                    generations[key] = cache.get(key)
+            generation = ":".join(str(generations[key]) for key in keys)
+            self._cache_key = f"relayconfig-sections:{self._project.id}:{generation}"
+        return self._cache_key
+
+    def _get_cached(self, name: str) -> Section | None:
+        if not self._enabled or not self._reuse_cached or name in UNCACHED_SECTIONS:
+            return None
+        if self._cached is None:
+            self._cached = cache.get(self._get_cache_key()) or {}
+        return self._cached.get(name)
+
+    def apply(
+        self, config: MutableMapping[str, Any], name: str, compute: Callable[[], Section]
+    ) -> None:
+        """Adds the section with the given name to `config`, computing it if needed."""
+        section = self._computed.get(name)
+        if section is None:
+            section = self._get_cached(name)
+            if section is not None:
+                metrics.incr("relay.config.sections.cache", tags={"section": name, "hit": True})
+            else:
+                with metrics.timer("relay.config.sections.duration", tags={"section": name}):
+                    section = compute()
+                # Empty sections are not cached, so that failed experimental
+                # builds do not stick.
+                self._dirty |= bool(section) and name not in UNCACHED_SECTIONS
+                if self._reuse_cached:
+                    metrics.incr(
+                        "relay.config.sections.cache", tags={"section": name, "hit": False}
+                    )
+            self._computed[name] = section
+        config.update(section)
+
+    def save(self) -> None:
+        """Caches the sections computed since the last save."""
+        if not self._enabled or not self._dirty:
+            return
+
+        sections = {
+            name: section
+            for name, section in self._computed.items()
+            if section and name not in UNCACHED_SECTIONS
+        }
+        cache.set(
+            self._get_cache_key(),
+            {**(self._cached or {}), **sections},
+            options.get("relay.project-config-sections.cache-ttl"),
+        )
+        self._dirty = False
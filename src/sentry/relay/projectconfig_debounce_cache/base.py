@@ -17,7 +17,7 @@ class ProjectConfigDebounceCache(Service):
     multiple instances of this debounce cache with different keys.
     """
 
-    __all__ = ("is_debounced", "debounce", "mark_task_done")
+    __all__ = ("is_debounced", "debounce", "mark_task_done", "count_scheduled")
 
     def __init__(self, **options):
         pass
@@ -45,3 +45,12 @@ class ProjectConfigDebounceCache(Service):
         Returns 1 if the task was removed, 0 if it wasn't.
         """
         return 1
+
+    def count_scheduled(self, *, organization_id, window):
+        """Counts a task scheduled for a project or key of the given organization.
+
+        Returns the number of such tasks scheduled within the last ``window`` seconds,
+        including this one.  This is used to coalesce many tasks into a single task for the
+        organization.
+        """
+        return 0
@@ -76,3 +76,14 @@ class RedisProjectConfigDebounceCache(ProjectConfigDebounceCache):
         ret = client.delete(key)
         metrics.incr("relay.projectconfig_debounce_cache.task_done")
         return ret
+
+    def count_scheduled(self, *, organization_id, window):
+        key = f"{self._key_prefix}:c:{organization_id}"
+        client = self._get_redis_client(key)
+        # The counter is created along with its expiry, so that it cannot
+        # outlive the window even if incrementing it fails.
+        with client.pipeline(transaction=False) as pipe:
+            pipe.set(key, 0, ex=window, nx=True)
+            pipe.incr(key)
+            _, count = pipe.execute()
+        return count
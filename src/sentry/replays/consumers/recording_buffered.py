@@ -19,6 +19,11 @@ This option limits the amount of time a message will wait in the buffer before b
 this value exceeds the Kafka commit interval then the Kafka offsets will not be committed until the
 buffer has been flushed and fully committed.
 
+**max_upload_concurrency:**
+
+This option limits the number of recordings uploaded at the same time. Uploads of all buffers share
+a single pool of threads which lives as long as the consumer.
+
 # Errors
 
 All deterministic errors must be handled otherwise the consumer will deadlock and progress will
@@ -41,7 +46,8 @@ from __future__ import annotations
 import logging
 import time
 from collections.abc import Mapping
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
 from typing import Any, TypedDict
 
 import sentry_sdk
@@ -113,10 +119,14 @@ class RecordingBufferedStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         max_buffer_message_count: int,
         max_buffer_size_in_bytes: int,
         max_buffer_time_in_seconds: int,
+        max_upload_concurrency: int = 100,
     ) -> None:
         self.max_buffer_message_count = max_buffer_message_count
         self.max_buffer_size_in_bytes = max_buffer_size_in_bytes
         self.max_buffer_time_in_seconds = max_buffer_time_in_seconds
+        self.upload_pool = ThreadPoolExecutor(
+            max_workers=max_upload_concurrency, thread_name_prefix="replay-recording-upload"
+        )
 
     def create_with_partitions(
         self,
@@ -130,11 +140,14 @@ class RecordingBufferedStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
                 self.max_buffer_time_in_seconds,
             ),
             next_step=RunTask(
-                function=process_commit,
+                function=partial(process_commit, upload_pool=self.upload_pool),
                 next_step=CommitOffsets(commit),
             ),
         )
 
+    def shutdown(self) -> None:
+        self.upload_pool.shutdown()
+
 
 class UploadEvent(TypedDict):
     key: str
@@ -320,23 +333,38 @@ def process_message(buffer: RecordingBuffer, message: bytes) -> None:
 
 
 def process_commit(
-    message: Message[tuple[list[UploadEvent], list[InitialSegmentEvent], list[ReplayActionsEvent]]]
+    message: Message[tuple[list[UploadEvent], list[InitialSegmentEvent], list[ReplayActionsEvent]]],
+    upload_pool: ThreadPoolExecutor | None = None,
 ) -> None:
     # High I/O section.
-    with sentry_sdk.start_span(op="replays.consumer.recording.commit_buffer"):
+    with (
+        sentry_sdk.start_span(op="replays.consumer.recording.commit_buffer"),
+        metrics.timer("replays.consumer.recording.commit_buffer"),
+    ):
         upload_events, initial_segment_events, replay_action_events = message.payload
-        commit_uploads(upload_events)
+        commit_uploads(upload_events, upload_pool)
         commit_initial_segments(initial_segment_events)
         commit_replay_actions(replay_action_events)
 
 
-def commit_uploads(upload_events: list[UploadEvent]) -> None:
-    with sentry_sdk.start_span(op="replays.consumer.recording.upload_segments"):
+def commit_uploads(
+    upload_events: list[UploadEvent], upload_pool: ThreadPoolExecutor | None = None
+) -> None:
+    metrics.distribution("replays.consumer.recording.buffer_uploads", len(upload_events))
+
+    with (
+        sentry_sdk.start_span(op="replays.consumer.recording.upload_segments"),
+        metrics.timer("replays.consumer.recording.upload_segments"),
+    ):
         # This will run to completion taking potentially an infinite amount of time. However,
         # that outcome is unlikely. In the event of an indefinite backlog the process can be
         # restarted.
-        with ThreadPoolExecutor(max_workers=len(upload_events)) as pool:
-            futures = [pool.submit(_do_upload, upload) for upload in upload_events]
+        if upload_pool is None:
+            with ThreadPoolExecutor(max_workers=len(upload_events)) as pool:
+                futures = [pool.submit(_do_upload, upload) for upload in upload_events]
+        else:
+            futures = [upload_pool.submit(_do_upload, upload) for upload in upload_events]
+            wait(futures)
 
     has_errors = False
 
@@ -378,3 +406,6 @@ def _do_upload(upload_event: UploadEvent) -> None:
         #
         # Refer to `src.sentry.filestore.gcs.GCS_RETRIES`.
         storage_kv.set(upload_event["key"], upload_event["value"])
+    metrics.distribution(
+        "replays.consumer.recording.upload_size", len(upload_event["value"]), unit="byte"
+    )
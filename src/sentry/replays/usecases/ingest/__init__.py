@@ -10,6 +10,7 @@ from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import Replay
 from sentry_sdk import Hub, set_tag
 from sentry_sdk.tracing import Span
 
+from sentry import options
 from sentry.constants import DataCategory
 from sentry.models.project import Project
 from sentry.replays.lib.storage import (
@@ -19,6 +20,7 @@ from sentry.replays.lib.storage import (
     storage_kv,
 )
 from sentry.replays.usecases.ingest.dom_index import log_canvas_size, parse_and_emit_replay_actions
+from sentry.replays.usecases.ingest.segment import parse_indexed_events
 from sentry.signals import first_replay_received
 from sentry.utils import json, metrics
 from sentry.utils.outcomes import Outcome, track_outcome
@@ -218,7 +220,11 @@ def recording_post_processor(
     try:
         with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
             decompressed_segment = decompress(segment_bytes)
-            parsed_segment_data = json.loads(decompressed_segment)
+            # Only the indexed events are used below, so the others need not be built.
+            if options.get("replay.ingest.parse-indexed-events"):
+                parsed_segment_data = parse_indexed_events(decompressed_segment)
+            else:
+                parsed_segment_data = json.loads(decompressed_segment)
             parsed_replay_event = json.loads(replay_event_bytes) if replay_event_bytes else None
             _report_size_metrics(len(segment_bytes), len(decompressed_segment))
 
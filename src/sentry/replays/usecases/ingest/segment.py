@@ -0,0 +1,91 @@
+"""Parse the events of recording segments that are indexed.
+
+A recording segment is a JSON array of rrweb events. Ingestion only looks at
+custom events (type 5), which carry breadcrumbs and SDK options, and at canvas
+mutations (incremental snapshots of type 3 with source 9). The other events,
+in particular full snapshots of the DOM and DOM mutations, make up most of a
+segment but are never used.
+
+Instead of building every event, the events are scanned one by one and only
+the indexed events are built. The type (and source) of an event is read from
+the start of its raw JSON, where rrweb serializes them. Events that are not
+serialized this way are built and filtered as usual.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from typing import Any
+
+from sentry.utils import json
+
+__all__ = ["iter_indexed_events", "parse_indexed_events"]
+
+CUSTOM_EVENT = 5
+INCREMENTAL_SNAPSHOT_EVENT = 3
+CANVAS_MUTATION_SOURCE = 9
+
+_WHITESPACE = re.compile(r"\s*")
+_EVENT_TYPE = re.compile(r'\{\s*"type"\s*:\s*(\d+)\s*,')
+_INCREMENTAL_SNAPSHOT_SOURCE = re.compile(r'\s*"data"\s*:\s*\{\s*"source"\s*:\s*(\d+)\s*[,}]')
+
+
+def _is_indexed(event: Any) -> bool:
+    if not isinstance(event, dict):
+        return False
+    event_type = event.get("type")
+    if event_type == CUSTOM_EVENT:
+        return True
+    if event_type == INCREMENTAL_SNAPSHOT_EVENT:
+        data = event.get("data")
+        return isinstance(data, dict) and data.get("source") == CANVAS_MUTATION_SOURCE
+    return False
+
+
+def _is_skipped(segment: str, idx: int) -> bool:
+    """Returns whether the raw event at `idx` is known to not be indexed."""
+    match = _EVENT_TYPE.match(segment, idx)
+    if match is None:
+        return False
+
+    event_type = int(match.group(1))
+    if event_type == CUSTOM_EVENT:
+        return False
+    if event_type != INCREMENTAL_SNAPSHOT_EVENT:
+        return True
+
+    match = _INCREMENTAL_SNAPSHOT_SOURCE.match(segment, match.end())
+    return match is not None and int(match.group(1)) != CANVAS_MUTATION_SOURCE
+
+
+def iter_indexed_events(segment: str) -> Iterator[dict[str, Any]]:
+    """Yields the indexed events of a segment, in order."""
+    idx = _WHITESPACE.match(segment).end()
+    if segment[idx : idx + 1] != "[":
+        raise ValueError("Recording segment is not a JSON array")
+
+    idx = _WHITESPACE.match(segment, idx + 1).end()
+    if segment[idx : idx + 1] == "]":
+        return
+
+    while True:
+        if _is_skipped(segment, idx):
+            idx = json.skip(segment, idx)
+        else:
+            event, idx = json.raw_decode(segment, idx)
+            if _is_indexed(event):
+                yield event
+
+        idx = _WHITESPACE.match(segment, idx).end()
+        separator = segment[idx : idx + 1]
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Unexpected character in recording segment at {idx}")
+        idx = _WHITESPACE.match(segment, idx + 1).end()
+
+
+def parse_indexed_events(segment: bytes) -> list[dict[str, Any]]:
+    """Returns the indexed events of a decompressed segment, in order."""
+    return list(iter_indexed_events(segment.decode()))
@@ -74,6 +74,7 @@ for cmd in map(
         "sentry.runner.commands.spans.write_hashes",
         "sentry.runner.commands.openai.openai",
         "sentry.runner.commands.llm.llm",
+        "sentry.runner.commands.zstd_dictionaries.zstd_dictionaries",
     ),
 ):
     cli.add_command(cmd)
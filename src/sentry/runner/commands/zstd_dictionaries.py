@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+import click
+
+from sentry.runner.decorators import configuration
+
+
+@click.group("zstd-dictionaries")
+def zstd_dictionaries() -> None:
+    """
+    Manage trained zstd dictionaries for event payloads.
+
+    Payloads are compressed with the dictionary that is active for their
+    platform. Dictionaries are never modified or deleted by these commands:
+    rotating means training a new one and activating it, the old one has to
+    stay around for as long as payloads written with it are retained.
+    """
+
+
+@zstd_dictionaries.command()
+@click.argument("platform")
+@click.option(
+    "--project",
+    "project_ids",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Project to sample events from. Can be passed multiple times.",
+)
+@click.option("--days", type=int, default=1, show_default=True, help="Sample events this recent.")
+@click.option(
+    "--limit", type=int, default=1000, show_default=True, help="Number of events to sample."
+)
+@click.option(
+    "--size",
+    type=int,
+    default=None,
+    help="Size of the trained dictionary in bytes. Defaults to zstd's recommendation.",
+)
+@click.option("--activate", is_flag=True, help="Activate the dictionary for PLATFORM right away.")
+@configuration
+def train(
+    platform: str,
+    project_ids: tuple[int, ...],
+    days: int,
+    limit: int,
+    size: int | None,
+    activate: bool,
+) -> None:
+    """
+    Train a new dictionary from sampled events of PLATFORM.
+    """
+    from django.utils import timezone
+
+    from sentry import eventstore, options
+    from sentry.utils import json
+    from sentry.utils.zstd_dictionaries import (
+        DEFAULT_DICTIONARY_SIZE,
+        save_dictionary,
+        train_dictionary,
+    )
+
+    end = timezone.now()
+    events = eventstore.backend.get_events(
+        filter=eventstore.Filter(
+            conditions=[["platform", "=", platform]],
+            project_ids=list(project_ids),
+            start=end - timedelta(days=days),
+            end=end,
+        ),
+        limit=limit,
+        referrer="runner.zstd_dictionaries.train",
+    )
+    eventstore.backend.bind_nodes(events)
+    samples = [json.dumps(dict(event.data)).encode("utf8") for event in events if event.data]
+    if not samples:
+        raise click.ClickException(f"no {platform} events found to train on")
+
+    click.echo(f"Training on {len(samples)} events ({sum(map(len, samples))} bytes)...")
+    dictionary = train_dictionary(samples, size or DEFAULT_DICTIONARY_SIZE)
+    path = save_dictionary(dictionary)
+    click.echo(f"Wrote dictionary {dictionary.dict_id()} to {path}")
+
+    if activate:
+        active = dict(options.get("zstd-dictionaries.active"))
+        active[platform] = dictionary.dict_id()
+        options.set("zstd-dictionaries.active", active)
+        click.echo(f"Activated dictionary {dictionary.dict_id()} for {platform}")
+
+
+@zstd_dictionaries.command()
+@click.argument("platform")
+@click.argument("dict_id", type=int)
+@configuration
+def activate(platform: str, dict_id: int) -> None:
+    """
+    Compress new payloads of PLATFORM with dictionary DICT_ID.
+
+    The dictionary has to be in the filestore, where every process that reads
+    payloads loads it from.
+    """
+    from sentry import options
+    from sentry.utils.zstd_dictionaries import DictionaryNotFound, load_dictionary
+
+    try:
+        load_dictionary(dict_id)
+    except DictionaryNotFound as e:
+        raise click.ClickException(str(e))
+
+    active = dict(options.get("zstd-dictionaries.active"))
+    active[platform] = dict_id
+    options.set("zstd-dictionaries.active", active)
+    click.echo(f"Activated dictionary {dict_id} for {platform}")
+
+
+@zstd_dictionaries.command()
+@click.argument("platform")
+@configuration
+def deactivate(platform: str) -> None:
+    """
+    Stop compressing new payloads of PLATFORM with a dictionary.
+    """
+    from sentry import options
+
+    active = dict(options.get("zstd-dictionaries.active"))
+    active.pop(platform, None)
+    options.set("zstd-dictionaries.active", active)
+    click.echo(f"Deactivated dictionaries for {platform}")
+
+
+@zstd_dictionaries.command("list")
+@configuration
+def list_() -> None:
+    """
+    List the active dictionary of every platform.
+    """
+    from sentry import options
+
+    for platform, dict_id in sorted(options.get("zstd-dictionaries.active").items()):
+        click.echo(f"{platform}\t{dict_id}")
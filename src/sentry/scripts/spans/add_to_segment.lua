@@ -0,0 +1,30 @@
+--[[
+
+Appends a batch of spans to a segment and sets the segment's TTL when the
+batch created it, so that a segment can never be left behind without an
+expiry.
+
+KEYS[1]: the segment key
+ARGV[1]: the TTL of the segment in seconds
+ARGV[2...]: the spans to append
+
+Returns 1 if the segment was created by this call, 0 otherwise.
+
+]]--
+
+local key = KEYS[1]
+local ttl = ARGV[1]
+local count = #ARGV - 1
+
+local length = 0
+-- Avoid exceeding the Lua stack size when appending many spans at once.
+for start = 2, #ARGV, 1000 do
+    length = redis.call("RPUSH", key, unpack(ARGV, start, math.min(start + 999, #ARGV)))
+end
+
+if length == count then
+    redis.call("EXPIRE", key, ttl)
+    return 1
+end
+
+return 0
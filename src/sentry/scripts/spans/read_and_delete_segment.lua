@@ -0,0 +1,14 @@
+--[[
+
+Reads all spans of a segment and deletes it in a single step, so that spans
+appended in between cannot be lost.
+
+KEYS[1]: the segment key
+
+Returns the spans of the segment.
+
+]]--
+
+local spans = redis.call("LRANGE", KEYS[1], 0, -1)
+redis.call("DEL", KEYS[1])
+return spans
@@ -0,0 +1,55 @@
+--[[
+
+Batched writes
+==============
+
+Applies a batch of simple counter increments, distinct counter additions and
+expirations that all live on the same host, so that they can be written with a
+single round trip (and a single script invocation) instead of one command per
+key.
+
+All keys that are written to are passed as ``KEYS``. ``ARGV`` is a flat
+sequence of operations which refer to those keys by their (1-based) index:
+
+- HINCRBY <key index> <field> <amount>
+- PFADD <key index> <element count> <element>...
+- EXPIREAT <key index> <timestamp>
+
+Returns the number of operations that were applied.
+
+]]--
+
+-- Avoid exceeding the Lua stack size when adding many elements at once.
+local PFADD_CHUNK_SIZE = 1000
+
+local cursor = 1
+local operations = 0
+
+while cursor <= #ARGV do
+    local operation = ARGV[cursor]
+    local key = KEYS[tonumber(ARGV[cursor + 1])]
+
+    if operation == 'HINCRBY' then
+        redis.call('HINCRBY', key, ARGV[cursor + 2], ARGV[cursor + 3])
+        cursor = cursor + 4
+    elseif operation == 'PFADD' then
+        local first = cursor + 3
+        local last = first + tonumber(ARGV[cursor + 2]) - 1
+        if last < first then
+            redis.call('PFADD', key)
+        end
+        for start = first, last, PFADD_CHUNK_SIZE do
+            redis.call('PFADD', key, unpack(ARGV, start, math.min(start + PFADD_CHUNK_SIZE - 1, last)))
+        end
+        cursor = last + 1
+    elseif operation == 'EXPIREAT' then
+        redis.call('EXPIREAT', key, ARGV[cursor + 2])
+        cursor = cursor + 3
+    else
+        return redis.error_reply('unknown operation: ' .. tostring(operation))
+    end
+
+    operations = operations + 1
+end
+
+return operations
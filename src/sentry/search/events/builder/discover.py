@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import math
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from datetime import datetime, timedelta
 from re import Match
 from typing import Any, Union, cast
@@ -79,6 +79,7 @@ from sentry.utils.snuba import (
     is_numeric_measurement,
     is_percentage_measurement,
     is_span_op_breakdown,
+    iter_snql_query_rows,
     raw_snql_query,
     resolve_column,
 )
@@ -1426,23 +1427,68 @@ class BaseQueryBuilder:
             InvalidSearchQuery("Query missing referrer.")
         return raw_snql_query(self.get_snql_query(), referrer, use_cache)
 
+    def iter_results(self, referrer: str) -> Iterator[dict[str, Any]]:
+        """Runs the query and yields its processed rows as they are received from Snuba.
+
+        Unlike `run_query` and `process_results`, the result is never loaded into memory
+        at once, which makes this suitable for queries with large results such as exports.
+        No field meta is returned.
+        """
+        translated_columns = self._translate_columns()
+        for row in iter_snql_query_rows(self.get_snql_query(), referrer):
+            yield self._process_row(row, translated_columns)
+
+    def _translate_columns(self) -> dict[str, str]:
+        """Returns the mapping of result columns to the keys they should be returned as"""
+        translated_columns: dict[str, str] = {}
+        if self.builder_config.transform_alias_to_input_format:
+            translated_columns = {
+                column: function_details.field
+                for column, function_details in self.function_alias_map.items()
+            }
+
+            self.function_alias_map = {
+                translated_columns.get(column, column): function_details
+                for column, function_details in self.function_alias_map.items()
+            }
+            if self.raw_equations:
+                for index, equation in enumerate(self.raw_equations):
+                    translated_columns[f"equation[{index}]"] = f"equation|{equation}"
+        return translated_columns
+
+    def _process_row(
+        self, row: Mapping[str, Any], translated_columns: Mapping[str, str]
+    ) -> dict[str, Any]:
+        transformed = {}
+        for key, value in row.items():
+            if isinstance(value, float):
+                # 0 for nan, and none for inf were chosen arbitrarily, nan and inf are invalid json
+                # so needed to pick something valid to use instead
+                if math.isnan(value):
+                    value = 0
+                elif math.isinf(value):
+                    value = None
+                value = self.handle_invalid_float(value)
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    if isinstance(item, float):
+                        value[index] = self.handle_invalid_float(item)
+            if key in self.value_resolver_map:
+                new_value = self.value_resolver_map[key](value)
+            else:
+                new_value = value
+
+            resolved_key = translated_columns.get(key, key)
+            if not self.builder_config.skip_tag_resolution:
+                resolved_key = self.prefixed_to_tag_map.get(resolved_key, resolved_key)
+            transformed[resolved_key] = new_value
+
+        return transformed
+
     def process_results(self, results: Any) -> EventsResponse:
         with sentry_sdk.start_span(op="QueryBuilder", description="process_results") as span:
             span.set_data("result_count", len(results.get("data", [])))
-            translated_columns = {}
-            if self.builder_config.transform_alias_to_input_format:
-                translated_columns = {
-                    column: function_details.field
-                    for column, function_details in self.function_alias_map.items()
-                }
-
-                self.function_alias_map = {
-                    translated_columns.get(column, column): function_details
-                    for column, function_details in self.function_alias_map.items()
-                }
-                if self.raw_equations:
-                    for index, equation in enumerate(self.raw_equations):
-                        translated_columns[f"equation[{index}]"] = f"equation|{equation}"
+            translated_columns = self._translate_columns()
 
             # process the field meta
             field_meta: dict[str, str] = {}
@@ -1462,35 +1508,8 @@ class BaseQueryBuilder:
                             field_meta[field_key] = "string"
 
             # process the field results
-            def get_row(row: dict[str, Any]) -> dict[str, Any]:
-                transformed = {}
-                for key, value in row.items():
-                    if isinstance(value, float):
-                        # 0 for nan, and none for inf were chosen arbitrarily, nan and inf are invalid json
-                        # so needed to pick something valid to use instead
-                        if math.isnan(value):
-                            value = 0
-                        elif math.isinf(value):
-                            value = None
-                        value = self.handle_invalid_float(value)
-                    if isinstance(value, list):
-                        for index, item in enumerate(value):
-                            if isinstance(item, float):
-                                value[index] = self.handle_invalid_float(item)
-                    if key in self.value_resolver_map:
-                        new_value = self.value_resolver_map[key](value)
-                    else:
-                        new_value = value
-
-                    resolved_key = translated_columns.get(key, key)
-                    if not self.builder_config.skip_tag_resolution:
-                        resolved_key = self.prefixed_to_tag_map.get(resolved_key, resolved_key)
-                    transformed[resolved_key] = new_value
-
-                return transformed
-
             return {
-                "data": [get_row(row) for row in results["data"]],
+                "data": [self._process_row(row, translated_columns) for row in results["data"]],
                 "meta": {
                     "fields": field_meta,
                     "tips": {},
@@ -131,14 +131,13 @@ class IndexerBatch:
         (extract_strings and reconstruct_messages)
         """
         skipped_msgs_cnt: MutableMapping[str, int] = defaultdict(int)
+        disabled_namespaces = options.get("sentry-metrics.indexer.disabled-namespaces")
 
         for msg in self.outer_message.payload:
             assert isinstance(msg.value, BrokerValue)
             broker_meta = BrokerMeta(msg.value.partition, msg.value.offset)
 
-            if (namespace := self._extract_namespace(msg.payload.headers)) in options.get(
-                "sentry-metrics.indexer.disabled-namespaces"
-            ):
+            if (namespace := self._extract_namespace(msg.payload.headers)) in disabled_namespaces:
                 assert namespace
                 skipped_msgs_cnt[namespace] += 1
                 self.filtered_msg_meta.add(broker_meta)
@@ -313,6 +312,11 @@ class IndexerBatch:
         new_messages: MutableSequence[Message[RoutingPayload | KafkaPayload | InvalidMessage]] = []
         cogs_usage: MutableMapping[UseCaseID, int] = defaultdict(int)
 
+        # These only depend on the batch or the metric name, so they are determined once
+        # instead of for every message.
+        use_orjson = in_random_rollout("sentry-metrics.indexer.reconstruct.enable-orjson")
+        aggregation_options_by_name: dict[str, Any] = {}
+
         for message in self.outer_message.payload:
             used_tags: set[str] = set()
             output_message_meta: dict[str, dict[str, str]] = defaultdict(dict)
@@ -345,11 +349,14 @@ class IndexerBatch:
 
             with metrics.timer("metrics_consumer.reconstruct_messages.get_indexed_tags"):
                 try:
+                    org_mapping = mapping[use_case_id][org_id]
+                    org_meta = bulk_record_meta[use_case_id][org_id]
                     for k, v in tags.items():
-                        used_tags.update({k, v})
-                        new_k = mapping[use_case_id][org_id][k]
+                        used_tags.add(k)
+                        used_tags.add(v)
+                        new_k = org_mapping[k]
                         if new_k is None:
-                            metadata = bulk_record_meta[use_case_id][org_id].get(k)
+                            metadata = org_meta.get(k)
                             if (
                                 metadata
                                 and metadata.fetch_type_ext
@@ -362,9 +369,9 @@ class IndexerBatch:
 
                         value_to_write: int | str = v
                         if self.__should_index_tag_values:
-                            new_v = mapping[use_case_id][org_id][v]
+                            new_v = org_mapping[v]
                             if new_v is None:
-                                metadata = bulk_record_meta[use_case_id][org_id].get(v)
+                                metadata = org_meta.get(v)
                                 if (
                                     metadata
                                     and metadata.fetch_type_ext
@@ -399,7 +406,7 @@ class IndexerBatch:
                             "string_type": "tags",
                             "num_global_quotas": exceeded_global_quotas,
                             "num_org_quotas": exceeded_org_quotas,
-                            "org_batch_size": len(mapping[use_case_id][org_id]),
+                            "org_batch_size": len(org_mapping),
                             "use_case_id": use_case_id.value,
                         },
                     )
@@ -407,8 +414,8 @@ class IndexerBatch:
 
             fetch_types_encountered = set()
             for tag in used_tags:
-                if tag in bulk_record_meta[use_case_id][org_id]:
-                    metadata = bulk_record_meta[use_case_id][org_id][tag]
+                metadata = org_meta.get(tag)
+                if metadata is not None:
                     fetch_types_encountered.add(metadata.fetch_type)
                     output_message_meta[metadata.fetch_type.value][str(metadata.id)] = tag
 
@@ -416,9 +423,9 @@ class IndexerBatch:
                 "".join(sorted(t.value for t in fetch_types_encountered)), "utf-8"
             )
 
-            numeric_metric_id = mapping[use_case_id][org_id][metric_name]
+            numeric_metric_id = org_mapping[metric_name]
             if numeric_metric_id is None:
-                metadata = bulk_record_meta[use_case_id][org_id].get(metric_name)
+                metadata = org_meta.get(metric_name)
                 metrics.incr(
                     "sentry_metrics.indexer.process_messages.dropped_message",
                     tags={
@@ -438,7 +445,7 @@ class IndexerBatch:
                                 and metadata.fetch_type_ext
                                 and metadata.fetch_type_ext.is_global
                             ),
-                            "org_batch_size": len(mapping[use_case_id][org_id]),
+                            "org_batch_size": len(org_mapping),
                             "use_case_id": use_case_id.value,
                         },
                     )
@@ -489,7 +496,11 @@ class IndexerBatch:
                         "value": old_payload_value["value"],
                         "sentry_received_timestamp": sentry_received_timestamp,
                     }
-                    if aggregation_options := get_aggregation_options(old_payload_value["name"]):
+                    if metric_name not in aggregation_options_by_name:
+                        aggregation_options_by_name[metric_name] = get_aggregation_options(
+                            metric_name
+                        )
+                    if aggregation_options := aggregation_options_by_name[metric_name]:
                         # TODO: This should eventually handle multiple aggregation options
                         option = list(aggregation_options.items())[0][0]
                         assert option is not None
@@ -500,7 +511,7 @@ class IndexerBatch:
                 with metrics.timer(
                     "metrics_consumer.reconstruct_messages.build_new_payload.json_step"
                 ):
-                    if in_random_rollout("sentry-metrics.indexer.reconstruct.enable-orjson"):
+                    if use_orjson:
                         serialized_msg = orjson.dumps(new_payload_value)
                     else:
                         serialized_msg = rapidjson.dumps(new_payload_value).encode()
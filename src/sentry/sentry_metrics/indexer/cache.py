@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta
 
@@ -33,6 +36,7 @@ _INDEXER_CACHE_RESOLVE_CACHE_REPLENISHMENT_METRIC = (
 _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-write"
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
 
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
@@ -205,10 +209,100 @@ class StringIndexerCache:
             )
 
 
+class LocalStringIndexerCache:
+    """
+    A bounded, process-local LRU cache of strings to ids, which is consulted
+    before the remote `StringIndexerCache`.
+
+    Keys are formatted like "use_case_id:org_id:string". Entries expire after
+    the randomized TTL of the remote cache, and the least recently used entries
+    are evicted once the cache holds more than
+    `sentry-metrics.indexer.local-cache-size` entries. The cache is disabled if
+    the size is 0.
+
+    A single instance is meant to be shared by all indexer batches of a
+    process, so access to it is synchronized.
+    """
+
+    def __init__(self, cache: StringIndexerCache) -> None:
+        self.cache = cache
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        return options.get("sentry-metrics.indexer.local-cache-size")
+
+    def get_many(self, keys: Iterable[str]) -> MutableMapping[str, int]:
+        """
+        Returns the ids of the keys that are cached, omitting all others.
+        """
+        results: MutableMapping[str, int] = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                results[key] = value
+        return results
+
+    def set_many(self, key_values: Mapping[str, int]) -> None:
+        max_size = self.max_size
+        expires_at = time.monotonic() + self.cache.randomized_ttl
+        with self._lock:
+            for key, value in key_values.items():
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class CachingIndexer(StringIndexer):
-    def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
+    def __init__(
+        self,
+        cache: StringIndexerCache,
+        indexer: StringIndexer,
+        local_cache: LocalStringIndexerCache | None = None,
+    ) -> None:
         self.cache = cache
         self.indexer = indexer
+        self.local_cache = local_cache
+
+    def _get_many_cached(self, keys: Sequence[str]) -> MutableMapping[str, int | None]:
+        """
+        Looks up the keys in the local cache, if enabled, and all keys missing
+        from it in the remote cache.
+        """
+        if self.local_cache is None or not self.local_cache.max_size:
+            return self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, keys)
+
+        local_results = self.local_cache.get_many(keys)
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC, tags={"cache_hit": "true"}, amount=len(local_results)
+        )
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "false"},
+            amount=len(keys) - len(local_results),
+        )
+
+        results: MutableMapping[str, int | None] = dict(local_results)
+        remote_keys = [key for key in keys if key not in local_results]
+        if remote_keys:
+            remote_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, remote_keys)
+            self.local_cache.set_many({k: v for k, v in remote_results.items() if v is not None})
+            results.update(remote_results)
+        return results
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
@@ -216,7 +310,7 @@ class CachingIndexer(StringIndexer):
         cache_keys = UseCaseKeyCollection(strings)
         metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
         cache_key_strs = cache_keys.as_strings()
-        cache_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+        cache_results = self._get_many_cached(cache_key_strs)
 
         hits = [k for k, v in cache_results.items() if v is not None]
 
@@ -256,9 +350,10 @@ class CachingIndexer(StringIndexer):
             }
         )
 
-        self.cache.set_many(
-            BULK_RECORD_CACHE_NAMESPACE, db_record_key_results.get_mapped_strings_to_ints()
-        )
+        db_record_strings_to_ints = db_record_key_results.get_mapped_strings_to_ints()
+        self.cache.set_many(BULK_RECORD_CACHE_NAMESPACE, db_record_strings_to_ints)
+        if self.local_cache is not None and self.local_cache.max_size:
+            self.local_cache.set_many(db_record_strings_to_ints)
 
         return cache_key_results.merge(db_record_key_results)
 
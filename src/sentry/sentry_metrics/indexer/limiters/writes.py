@@ -229,7 +229,9 @@ class WritesLimiterFactory:
         namespace = config.writes_limiter_namespace
         if namespace not in self.rate_limiters:
             writes_rate_limiter: WritesLimiter = WritesLimiter(
-                namespace, **config.writes_limiter_cluster_options
+                namespace,
+                lease_fraction=options.get("sentry-metrics.writes-limiter.lease-fraction"),
+                **config.writes_limiter_cluster_options,
             )
             self.rate_limiters[namespace] = writes_rate_limiter
 
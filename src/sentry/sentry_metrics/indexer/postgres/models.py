@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Sequence
 from typing import Any, ClassVar, Self
 
 from django.conf import settings
@@ -15,6 +16,9 @@ logger = logging.getLogger(__name__)
 
 from collections.abc import Mapping
 
+#: Maximum number of rows inserted by a single statement in `bulk_insert_returning`.
+INSERT_BATCH_SIZE = 1000
+
 
 @region_silo_only_model
 class MetricsKeyIndexer(Model):
@@ -59,6 +63,50 @@ class BaseIndexer(Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def bulk_insert_returning(cls, records: Sequence[Self]) -> list[Self]:
+        """
+        Inserts the records, skipping those that conflict with existing rows,
+        and returns the inserted rows including their ids.
+
+        Unlike `bulk_create(ignore_conflicts=True)`, this learns the ids of new
+        rows without selecting them again. Rows are inserted in a stable order
+        so that concurrent inserts lock them in the same order.
+        """
+        if not records:
+            return []
+
+        using = router.db_for_write(cls)
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+
+        fields = [field for field in cls._meta.concrete_fields if not field.primary_key]
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        returning = ", ".join(quote_name(field.column) for field in cls._meta.concrete_fields)
+        row = "({})".format(", ".join(["%s"] * len(fields)))
+
+        records = sorted(records, key=lambda record: (record.organization_id, record.string))
+        rows = []
+        with connection.cursor() as cursor:
+            # Stay well below the maximum number of parameters of a query.
+            for start in range(0, len(records), INSERT_BATCH_SIZE):
+                batch = records[start : start + INSERT_BATCH_SIZE]
+                params = [
+                    field.get_db_prep_save(field.pre_save(record, True), connection)
+                    for record in batch
+                    for field in fields
+                ]
+                cursor.execute(
+                    f"INSERT INTO {quote_name(cls._meta.db_table)} ({columns}) "
+                    f"VALUES {', '.join([row] * len(batch))} "
+                    f"ON CONFLICT DO NOTHING RETURNING {returning}",
+                    params,
+                )
+                rows.extend(cursor.fetchall())
+
+        field_names = [field.attname for field in cls._meta.concrete_fields]
+        return [cls.from_db(using, field_names, row) for row in rows]
+
 
 @region_silo_only_model
 class StringIndexer(BaseIndexer):
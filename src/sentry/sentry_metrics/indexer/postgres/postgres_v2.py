@@ -1,8 +1,8 @@
-from collections.abc import Collection, Mapping, Sequence
+from collections.abc import Callable, Collection, Iterable, Mapping, Sequence
 from functools import reduce
 from operator import or_
 from time import sleep
-from typing import Any
+from typing import Any, TypeVar
 
 import sentry_sdk
 from django.conf import settings
@@ -10,6 +10,7 @@ from django.db.models import Q
 from psycopg2 import OperationalError
 from psycopg2.errorcodes import DEADLOCK_DETECTED
 
+from sentry import options
 from sentry.sentry_metrics.configuration import IndexerStorage, UseCaseKey, get_ingest_config
 from sentry.sentry_metrics.indexer.base import (
     FetchType,
@@ -21,7 +22,11 @@ from sentry.sentry_metrics.indexer.base import (
     metric_path_key_compatible_resolve,
     metric_path_key_compatible_rev_resolve,
 )
-from sentry.sentry_metrics.indexer.cache import CachingIndexer, StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import (
+    CachingIndexer,
+    LocalStringIndexerCache,
+    StringIndexerCache,
+)
 from sentry.sentry_metrics.indexer.limiters.writes import writes_limiter_factory
 from sentry.sentry_metrics.indexer.postgres.models import TABLE_MAPPING, BaseIndexer, IndexerTable
 from sentry.sentry_metrics.indexer.strings import StaticStringIndexer
@@ -36,10 +41,16 @@ _INDEXER_DB_METRIC = "sentry_metrics.indexer.postgres"
 
 _PARTITION_KEY = "pg"
 
+T = TypeVar("T")
+
 indexer_cache = StringIndexerCache(
     **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
 )
 
+# Shared by all indexers of the process, so that batches of parallel consumers
+# share their hot strings.
+local_indexer_cache = LocalStringIndexerCache(indexer_cache)
+
 
 class PGStringIndexerV2(StringIndexer):
     """
@@ -77,13 +88,11 @@ class PGStringIndexerV2(StringIndexer):
             reduce(or_, conditions)
         )
 
-    def _bulk_create_with_retry(
-        self, table: IndexerTable, new_records: Sequence[BaseIndexer]
-    ) -> None:
+    def _retry_on_deadlock(self, insert: Callable[[], T]) -> T:
         """
         With multiple instances of the Postgres indexer running, we found that
         rather than direct insert conflicts we were actually observing deadlocks
-        on insert. Here we surround bulk_create with a catch for the deadlock error
+        on insert. Here we surround inserts with a catch for the deadlock error
         specifically so that we don't interrupt processing or raise an error for a
         fairly normal event.
         """
@@ -91,29 +100,46 @@ class PGStringIndexerV2(StringIndexer):
         sleep_ms = 5
         last_seen_exception: BaseException | None = None
 
+        while retry_count + 1 < settings.SENTRY_POSTGRES_INDEXER_RETRY_COUNT:
+            try:
+                return insert()
+            except OperationalError as e:
+                sentry_sdk.capture_message(
+                    f"retryable deadlock exception encountered; pgcode={e.pgcode}, pgerror={e.pgerror}"
+                )
+                if e.pgcode == DEADLOCK_DETECTED:
+                    metrics.incr("sentry_metrics.indexer.pg_bulk_create.deadlocked")
+                    retry_count += 1
+                    sleep(sleep_ms / 1000 * (2**retry_count))
+                    last_seen_exception = e
+                else:
+                    raise
+        # If we haven't returned after successful insert, we should re-raise the last
+        # seen exception
+        assert isinstance(last_seen_exception, BaseException)
+        raise last_seen_exception
+
+    def _bulk_create_with_retry(
+        self, table: IndexerTable, new_records: Sequence[BaseIndexer]
+    ) -> None:
         with metrics.timer("sentry_metrics.indexer.pg_bulk_create"):
             # We use `ignore_conflicts=True` here to avoid race conditions where metric indexer
             # records might have be created between when we queried in `bulk_record` and the
             # attempt to create the rows down below.
-            while retry_count + 1 < settings.SENTRY_POSTGRES_INDEXER_RETRY_COUNT:
-                try:
-                    table.objects.bulk_create(new_records, ignore_conflicts=True)
-                    return
-                except OperationalError as e:
-                    sentry_sdk.capture_message(
-                        f"retryable deadlock exception encountered; pgcode={e.pgcode}, pgerror={e.pgerror}"
-                    )
-                    if e.pgcode == DEADLOCK_DETECTED:
-                        metrics.incr("sentry_metrics.indexer.pg_bulk_create.deadlocked")
-                        retry_count += 1
-                        sleep(sleep_ms / 1000 * (2**retry_count))
-                        last_seen_exception = e
-                    else:
-                        raise
-            # If we haven't returned after successful bulk create, we should re-raise the last
-            # seen exception
-            assert isinstance(last_seen_exception, BaseException)
-            raise last_seen_exception
+            self._retry_on_deadlock(
+                lambda: table.objects.bulk_create(new_records, ignore_conflicts=True)
+            )
+
+    def _bulk_insert_returning_with_retry(
+        self, table: IndexerTable, new_records: Sequence[BaseIndexer]
+    ) -> Sequence[BaseIndexer]:
+        """
+        Like `_bulk_create_with_retry`, but returns the records that were
+        inserted, with their ids. Records that were created concurrently are
+        skipped and not returned.
+        """
+        with metrics.timer("sentry_metrics.indexer.pg_bulk_insert_returning"):
+            return self._retry_on_deadlock(lambda: table.bulk_insert_returning(new_records))
 
     def _bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
@@ -212,11 +238,16 @@ class PGStringIndexerV2(StringIndexer):
                     for _, organization_id, string in accepted_keys.as_tuples()
                 ]
 
-            self._bulk_create_with_retry(table, new_records)
+            # Inserting and returning the new rows saves selecting them again, except
+            # for rows that were created concurrently.
+            inserted_records: Sequence[BaseIndexer] = []
+            if options.get("sentry-metrics.indexer.insert-returning"):
+                inserted_records = self._bulk_insert_returning_with_retry(table, new_records)
+            else:
+                self._bulk_create_with_retry(table, new_records)
 
-        db_write_key_results = UseCaseKeyResults()
-        db_write_key_results.add_use_case_key_results(
-            [
+        def to_key_results(db_objs: Iterable[BaseIndexer]) -> Sequence[UseCaseKeyResult]:
+            return [
                 UseCaseKeyResult(
                     use_case_id=(
                         UseCaseID.SESSIONS
@@ -227,10 +258,19 @@ class PGStringIndexerV2(StringIndexer):
                     string=db_obj.string,
                     id=db_obj.id,
                 )
-                for db_obj in self._get_db_records(accepted_keys)
-            ],
-            fetch_type=FetchType.FIRST_SEEN,
+                for db_obj in db_objs
+            ]
+
+        db_write_key_results = UseCaseKeyResults()
+        db_write_key_results.add_use_case_key_results(
+            to_key_results(inserted_records), fetch_type=FetchType.FIRST_SEEN
         )
+        unreturned_keys = db_write_key_results.get_unmapped_use_case_keys(accepted_keys)
+        if unreturned_keys.size:
+            db_write_key_results.add_use_case_key_results(
+                to_key_results(self._get_db_records(unreturned_keys)),
+                fetch_type=FetchType.FIRST_SEEN,
+            )
 
         return db_read_key_results.merge(db_write_key_results).merge(rate_limited_key_results)
 
@@ -324,4 +364,6 @@ class PGStringIndexerV2(StringIndexer):
 
 class PostgresIndexer(StaticStringIndexer):
     def __init__(self) -> None:
-        super().__init__(CachingIndexer(indexer_cache, PGStringIndexerV2()))
+        super().__init__(
+            CachingIndexer(indexer_cache, PGStringIndexerV2(), local_cache=local_indexer_cache)
+        )
@@ -2,7 +2,7 @@ import logging
 import math
 import random
 from collections import namedtuple
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from copy import deepcopy
 from datetime import datetime, timedelta
 from typing import Any, NotRequired, TypedDict
@@ -13,6 +13,7 @@ from snuba_sdk import Condition, Function, Op
 
 from sentry.discover.arithmetic import categorize_columns
 from sentry.exceptions import InvalidSearchQuery
+from sentry.features.rollout import in_random_rollout
 from sentry.models.group import Group
 from sentry.search.events.builder import (
     HistogramQueryBuilder,
@@ -28,6 +29,7 @@ from sentry.search.events.fields import (
 )
 from sentry.search.events.types import HistogramParams, ParamsType, QueryBuilderConfig
 from sentry.snuba.dataset import Dataset
+from sentry.snuba.timeseries_cache import chunked_timeseries_query
 from sentry.tagstore.base import TOP_VALUES_DEFAULT_LIMIT
 from sentry.utils.math import nice_int
 from sentry.utils.snuba import (
@@ -48,6 +50,7 @@ __all__ = (
     "PaginationResult",
     "InvalidSearchQuery",
     "query",
+    "iter_query_rows",
     "timeseries_query",
     "top_events_timeseries",
     "get_facets",
@@ -266,6 +269,50 @@ def query(
     return result
 
 
+def iter_query_rows(
+    selected_columns,
+    query,
+    params,
+    referrer,
+    snuba_params=None,
+    equations=None,
+    orderby=None,
+    offset=None,
+    limit=50,
+    auto_fields=False,
+    auto_aggregations=False,
+    use_aggregate_conditions=False,
+) -> Iterator[dict[str, Any]]:
+    """
+    Streaming variant of `query` for queries with large results, such as
+    exports. The rows are yielded as they are received from Snuba, with
+    the same processing as the rows returned by `query`, but without the
+    field meta and tips.
+
+    See `query` for the arguments.
+    """
+    if not selected_columns:
+        raise InvalidSearchQuery("No columns selected")
+
+    builder = QueryBuilder(
+        Dataset.Discover,
+        params,
+        snuba_params=snuba_params,
+        query=query,
+        selected_columns=selected_columns,
+        equations=equations,
+        orderby=orderby,
+        limit=limit,
+        offset=offset,
+        config=QueryBuilderConfig(
+            auto_fields=auto_fields,
+            auto_aggregations=auto_aggregations,
+            use_aggregate_conditions=use_aggregate_conditions,
+        ),
+    )
+    return builder.iter_results(referrer)
+
+
 def timeseries_query(
     selected_columns: Sequence[str],
     query: str,
@@ -335,7 +382,39 @@ def timeseries_query(
             )
             query_list.append(comparison_builder)
 
-        query_results = bulk_snql_query([query.get_snql_query() for query in query_list], referrer)
+        cached_result = None
+        if (
+            not comparison_delta
+            and base_builder.start is not None
+            and base_builder.end is not None
+            and in_random_rollout("discover.timeseries-chunk-cache.rollout")
+        ):
+
+            def build_query(start: datetime, end: datetime) -> TimeseriesQueryBuilder:
+                return TimeseriesQueryBuilder(
+                    Dataset.Discover,
+                    {**params, "start": start, "end": end},
+                    rollup,
+                    query=query,
+                    selected_columns=columns,
+                    equations=equations,
+                    config=QueryBuilderConfig(
+                        functions_acl=functions_acl,
+                        has_metrics=has_metrics,
+                    ),
+                )
+
+            # The start of the base query is already clamped to the retention.
+            cached_result = chunked_timeseries_query(
+                build_query, base_builder.start, base_builder.end, rollup, referrer
+            )
+
+        if cached_result is not None:
+            query_results = [cached_result]
+        else:
+            query_results = bulk_snql_query(
+                [query.get_snql_query() for query in query_list], referrer
+            )
 
     with sentry_sdk.start_span(op="discover.discover", description="timeseries.transform_results"):
         results = []
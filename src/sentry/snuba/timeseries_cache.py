@@ -0,0 +1,209 @@
+"""
+Caches the results of timeseries queries in chunks of time buckets.
+
+Dashboards re-poll the same timeseries every minute, and every poll used to
+scan the whole window again even though only the newest buckets can have
+changed. Here the window is split into:
+
+- a head, from the start of the window up to the first chunk boundary,
+- chunks of `BUCKETS_PER_CHUNK` buckets that are aligned to the epoch and
+  old enough to be considered immutable, which are cached,
+- a tail, from the last chunk boundary up to the end of the window.
+
+The head and the tail are always queried, as are chunks missing from the
+cache (merged into one query per contiguous run), and the rows of all parts
+are stitched back together in order. Because chunks are aligned to absolute
+time, a sliding window keeps hitting the same cache entries.
+
+Buckets are never truly immutable: events can arrive late (offline mobile
+SDKs, ingestion backlogs) and can be deleted or discarded. Chunks are only
+cached once they are older than the
+`discover.timeseries-chunk-cache.settle-seconds` option, and then for no
+longer than their age (see `get_chunk_ttl`), so a chunk that ended an hour
+ago is refreshed within the next hour. Recent chunks are hence refreshed
+often, and only chunks that ended a day or more ago are cached for a day.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta, timezone
+from hashlib import sha1
+from typing import Any
+
+from django.core.cache import cache
+
+from sentry import options
+from sentry.search.events.builder import TimeseriesQueryBuilder
+from sentry.utils import json, metrics
+from sentry.utils.snuba import QueryOutsideRetentionError, bulk_snql_query
+
+#: Number of buckets that are cached together.
+BUCKETS_PER_CHUNK = 60
+
+#: Maximum time to keep chunks in the cache for, in seconds.
+CHUNK_TTL = 24 * 60 * 60
+
+DAY = 24 * 60 * 60
+
+BuildQuery = Callable[[datetime, datetime], TimeseriesQueryBuilder]
+
+
+def _to_datetime(timestamp: int) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _get_row_timestamp(row: dict[str, Any]) -> int:
+    value = row["time"]
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value).timestamp())
+    return int(value)
+
+
+def get_chunk_cache_key(builder: TimeseriesQueryBuilder) -> str:
+    # tsc - Timeseries Chunk
+    hashable = str(builder.get_snql_query())
+    return f"tsc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+
+
+def get_chunk_ttl(chunk_end: int) -> int:
+    """
+    Returns how long to cache a chunk for: changes to old buckets are rarer
+    than changes to recent ones, so chunks are cached for as long as they have
+    been settled, up to `CHUNK_TTL`.
+    """
+    age = int(datetime.now(timezone.utc).timestamp()) - chunk_end
+    return max(1, min(age, CHUNK_TTL))
+
+
+def get_chunks(start: datetime, end: datetime, rollup: int) -> list[tuple[int, int]]:
+    """
+    Returns the time ranges of the chunks within the window that will no
+    longer change.
+    """
+    # Buckets are only aligned to the epoch if they evenly divide a day.
+    if DAY % rollup != 0:
+        return []
+
+    chunk_size = rollup * BUCKETS_PER_CHUNK
+    settled = datetime.now(timezone.utc) - timedelta(
+        seconds=options.get("discover.timeseries-chunk-cache.settle-seconds")
+    )
+
+    first = -(-int(start.timestamp()) // chunk_size) * chunk_size
+    last = int(min(end, settled).timestamp()) // chunk_size * chunk_size
+    return [
+        (chunk_start, chunk_start + chunk_size) for chunk_start in range(first, last, chunk_size)
+    ]
+
+
+def _get_runs(indexes: Sequence[int]) -> list[tuple[int, int]]:
+    """
+    Groups sorted indexes into runs of contiguous indexes, as inclusive ranges.
+    """
+    runs: list[tuple[int, int]] = []
+    for index in indexes:
+        if runs and runs[-1][1] == index - 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+    return runs
+
+
+def chunked_timeseries_query(
+    build_query: BuildQuery,
+    start: datetime,
+    end: datetime,
+    rollup: int,
+    referrer: str | None = None,
+) -> dict[str, Any] | None:
+    """
+    Runs the timeseries query built by `build_query` for the window between
+    `start` and `end`, serving the buckets that can no longer change from
+    the cache.
+
+    Returns the raw result (data and meta) of the query, or `None` if no
+    part of the window can be cached and the query should be run as usual.
+    """
+    chunks = get_chunks(start, end, rollup)
+    if not chunks:
+        return None
+
+    try:
+        chunk_builders = [
+            build_query(_to_datetime(chunk_start), _to_datetime(chunk_end))
+            for chunk_start, chunk_end in chunks
+        ]
+    except QueryOutsideRetentionError:
+        # Parts of the window are outside of retention, which a single query
+        # over the whole window handles by clamping its start.
+        return None
+
+    cache_keys = [get_chunk_cache_key(builder) for builder in chunk_builders]
+    cached = cache.get_many(cache_keys)
+    chunk_results: list[dict[str, Any] | None] = [
+        json.loads(cached[cache_key]) if cache_key in cached else None
+        for cache_key in cache_keys
+    ]
+
+    missing = [index for index, result in enumerate(chunk_results) if result is None]
+    metrics.incr("discover.timeseries_chunk_cache.hit", amount=len(chunks) - len(missing))
+    metrics.incr("discover.timeseries_chunk_cache.miss", amount=len(missing))
+
+    head_end, tail_start = chunks[0][0], chunks[-1][1]
+    builders: list[TimeseriesQueryBuilder] = []
+    if start < _to_datetime(head_end):
+        builders.append(build_query(start, _to_datetime(head_end)))
+
+    runs = _get_runs(missing)
+    for first, last in runs:
+        if first == last:
+            builders.append(chunk_builders[first])
+        else:
+            builders.append(
+                build_query(_to_datetime(chunks[first][0]), _to_datetime(chunks[last][1]))
+            )
+
+    has_tail = _to_datetime(tail_start) < end
+    if has_tail:
+        builders.append(build_query(_to_datetime(tail_start), end))
+
+    results = (
+        bulk_snql_query([builder.get_snql_query() for builder in builders], referrer)
+        if builders
+        else []
+    )
+    # All parts run the same query, so they share their meta.
+    meta = results[0]["meta"] if results else None
+
+    head_rows: list[dict[str, Any]] = []
+    tail_rows: list[dict[str, Any]] = []
+    if start < _to_datetime(head_end):
+        head_rows = results.pop(0)["data"]
+    if has_tail:
+        tail_rows = results.pop()["data"]
+
+    chunk_size = chunks[0][1] - chunks[0][0]
+    for (first, last), result in zip(runs, results):
+        run_rows: list[list[dict[str, Any]]] = [[] for _ in range(first, last + 1)]
+        for row in result["data"]:
+            run_rows[(_get_row_timestamp(row) - chunks[first][0]) // chunk_size].append(row)
+
+        for offset, rows in enumerate(run_rows):
+            chunk_result = {"data": rows, "meta": result["meta"]}
+            chunk_results[first + offset] = chunk_result
+            cache.set(
+                cache_keys[first + offset],
+                json.dumps(chunk_result),
+                get_chunk_ttl(chunks[first + offset][1]),
+            )
+
+    data = head_rows
+    for chunk_result in chunk_results:
+        assert chunk_result is not None
+        data.extend(chunk_result["data"])
+        if meta is None:
+            meta = chunk_result["meta"]
+    data.extend(tail_rows)
+
+    return {"data": data, "meta": meta}
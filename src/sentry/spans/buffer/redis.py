@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from typing import NamedTuple
+
 import sentry_sdk
 from django.conf import settings
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry import options
-from sentry.utils import json, redis
+from sentry.utils import json, metrics, redis
 
 SEGMENT_TTL = 5 * 60  # 5 min TTL in seconds
 
+# Scripts are sent with EVAL rather than EVALSHA since they are queued in
+# (cluster) pipelines, which can't recover from a missing script.
+add_to_segment = redis.load_redis_script("spans/add_to_segment.lua")
+read_and_delete_segment = redis.load_redis_script("spans/read_and_delete_segment.lua")
+
 
 def get_redis_client() -> RedisCluster[bytes] | StrictRedis[bytes]:
     return redis.redis_clusters.get_binary(settings.SENTRY_SPAN_BUFFER_CLUSTER)
@@ -26,6 +34,14 @@ def get_unprocessed_segments_key(partition_index: int) -> str:
     return f"performance-issues:unprocessed-segments:partition:{partition_index}"
 
 
+class BufferedSpan(NamedTuple):
+    project_id: str | int
+    segment_id: str
+    timestamp: int
+    partition: int
+    payload: bytes
+
+
 class RedisSpansBuffer:
     def __init__(self):
         self.client: RedisCluster | StrictRedis = get_redis_client()
@@ -63,19 +79,81 @@ class RedisSpansBuffer:
 
         return timestamp > int(last_processed_timestamp)
 
+    def write_spans_and_check_processing(self, spans: Sequence[BufferedSpan]) -> list[bool]:
+        """
+        Batched version of `write_span_and_check_processing`, returns whether
+        segments should be processed after writing each of the spans.
+
+        Spans are grouped by segment and every segment is appended to (and
+        has its TTL set) by a single script invocation. All segments and
+        partitions are written in one pipeline, with a second one only needed
+        to register newly created segments in their buckets.
+        """
+        if not spans:
+            return []
+
+        segments: dict[str, list[BufferedSpan]] = {}
+        for span in spans:
+            segment_key = get_segment_key(span.project_id, span.segment_id)
+            segments.setdefault(segment_key, []).append(span)
+
+        last_timestamps: dict[int, int] = {}
+        for span in spans:
+            last_timestamps[span.partition] = span.timestamp
+
+        with metrics.timer("spans.buffer.write_spans"):
+            with self.client.pipeline() as p:
+                for segment_key, segment_spans in segments.items():
+                    p.eval(
+                        add_to_segment.script,
+                        1,
+                        segment_key,
+                        SEGMENT_TTL,
+                        *(span.payload for span in segment_spans),
+                    )
+                for partition, timestamp in last_timestamps.items():
+                    p.getset(get_last_processed_timestamp_key(partition), timestamp)
+                results = p.execute()
+
+            created = results[: len(segments)]
+            previous_timestamps = dict(zip(last_timestamps, results[len(segments) :]))
+
+            buckets: dict[int, list[bytes]] = {}
+            for (segment_key, segment_spans), new_key in zip(segments.items(), created):
+                if new_key == 1:
+                    first_span = segment_spans[0]
+                    buckets.setdefault(first_span.partition, []).append(
+                        json.dumps([first_span.timestamp, segment_key])
+                    )
+
+            if buckets:
+                with self.client.pipeline() as p:
+                    for partition, entries in buckets.items():
+                        p.rpush(get_unprocessed_segments_key(partition), *entries)
+                    p.execute()
+
+        metrics.distribution("spans.buffer.write_spans.batch_size", len(spans))
+        metrics.distribution("spans.buffer.write_spans.segments", len(segments))
+        metrics.incr("spans.buffer.write_spans.new_segments", sum(map(len, buckets.values())))
+
+        # Replay the timestamps in order, as if every span had been written on
+        # its own with GETSET.
+        should_process = []
+        for span in spans:
+            last_processed_timestamp: bytes | int | None = previous_timestamps[span.partition]
+            should_process.append(
+                last_processed_timestamp is not None
+                and span.timestamp > int(last_processed_timestamp)
+            )
+            previous_timestamps[span.partition] = span.timestamp
+
+        return should_process
+
     def read_and_expire_many_segments(self, keys: list[str]) -> list[list[str | bytes]]:
-        values = []
         with self.client.pipeline() as p:
             for key in keys:
-                p.lrange(key, 0, -1)
-
-            p.delete(*keys)
-            response = p.execute()
-
-        for value in response[:-1]:
-            values.append(value)
-
-        return values
+                p.eval(read_and_delete_segment.script, 1, key)
+            return p.execute()
 
     def get_unprocessed_segments_and_prune_bucket(self, now: int, partition: int) -> list[str]:
         key = get_unprocessed_segments_key(partition)
@@ -1,6 +1,6 @@
 import logging
 import uuid
-from collections.abc import Mapping, Sequence, Set
+from collections.abc import Sequence
 from copy import deepcopy
 from typing import Any
 
@@ -58,62 +58,88 @@ def _send_occurrence_to_platform(jobs: Sequence[Job], projects: ProjectsMapping)
             )
 
 
-def build_tree(spans):
-    span_tree = {}
-    root_span_id = None
-
-    for span in spans:
-        span_id = span["span_id"]
-        is_root = span["is_segment"]
-        if is_root:
-            root_span_id = span_id
-        if span_id not in span_tree:
-            span_tree[span_id] = span
-            span_tree[span_id]["children"] = []
-
-    for span in span_tree.values():
-        parent_id = span.get("parent_span_id")
-        if parent_id is not None and parent_id in span_tree:
-            parent_span = span_tree[parent_id]
-            children = parent_span["children"]
-            children.append(span)
-
-    return span_tree, root_span_id
-
-
-def dfs(visited, flattened_spans, tree, span_id):
-    stack = [span_id]
-
-    while len(stack):
-        span_id = stack.pop()
-
-        span = deepcopy(tree[span_id])
-        children = span.pop("children")
-
-        if span_id not in visited:
-            flattened_spans.append(span)
-            tree.pop(span_id)
-            visited.add(span_id)
-
-        for child in sorted(children, key=lambda span: span["start_timestamp"], reverse=True):
-            if child["span_id"] not in visited:
-                stack.append(child["span_id"])
-
-
-def flatten_tree(tree, root_span_id):
-    visited: Set[str] = set()
-    flattened_spans: list[Mapping[str, Any]] = []
-
-    if root_span_id:
-        dfs(visited, flattened_spans, tree, root_span_id)
-
-    # Catch all for orphan spans
-    remaining = sorted(tree.items(), key=lambda span: span[1]["start_timestamp"])
-    for span_id, _ in remaining:
-        if span_id not in visited:
-            dfs(visited, flattened_spans, tree, span_id)
-
-    return flattened_spans
+class SpanTree:
+    """
+    Parent/child structure of the spans of a segment, kept in parallel arrays
+    indexed by the position of a span in `spans` rather than in nested dicts.
+
+    Spans with a duplicate `span_id` are dropped, the first one wins.
+    """
+
+    __slots__ = ("spans", "span_ids", "parents", "start_timestamps", "root", "_children")
+
+    def __init__(self, spans: Sequence[dict[str, Any]]):
+        self.spans: list[dict[str, Any]] = []
+        self.span_ids: list[str] = []
+        self.start_timestamps: list[float] = []
+        # Index of the parent span, or -1 if the parent is not part of the segment.
+        self.parents: list[int] = []
+        self.root = -1
+
+        indexes: dict[str, int] = {}
+        root_span_id = None
+        for span in spans:
+            span_id = span["span_id"]
+            if span["is_segment"]:
+                root_span_id = span_id
+            if span_id in indexes:
+                continue
+            indexes[span_id] = len(self.spans)
+            self.spans.append(span)
+            self.span_ids.append(span_id)
+            self.start_timestamps.append(span["start_timestamp"])
+
+        if root_span_id is not None:
+            self.root = indexes[root_span_id]
+
+        for span in self.spans:
+            parent_id = span.get("parent_span_id")
+            self.parents.append(-1 if parent_id is None else indexes.get(parent_id, -1))
+
+        # Children of every span, latest first, so that popping them off a
+        # stack visits them in chronological order. A single stable sort of all
+        # spans keeps spans with the same start time in their original order.
+        self._children: list[list[int]] = [[] for _ in self.spans]
+        for index in sorted(
+            range(len(self.spans)), key=self.start_timestamps.__getitem__, reverse=True
+        ):
+            parent = self.parents[index]
+            if parent != -1:
+                self._children[parent].append(index)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def flatten(self) -> list[int]:
+        """
+        Returns the indexes of all spans in depth first order, starting at
+        the segment span. Orphan spans and their descendants follow in
+        chronological order.
+        """
+        visited = bytearray(len(self.spans))
+        order: list[int] = []
+
+        def visit(index: int) -> None:
+            stack = [index]
+            while stack:
+                index = stack.pop()
+                if visited[index]:
+                    continue
+                visited[index] = 1
+                order.append(index)
+                stack.extend(child for child in self._children[index] if not visited[child])
+
+        if self.root != -1:
+            visit(self.root)
+
+        for index in sorted(range(len(self.spans)), key=self.start_timestamps.__getitem__):
+            if not visited[index]:
+                visit(index)
+
+        return order
+
+    def flattened_spans(self) -> list[dict[str, Any]]:
+        return [self.spans[index] for index in self.flatten()]
 
 
 def _update_occurrence_group_type(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
@@ -169,8 +195,7 @@ def transform_spans_to_event_dict(spans):
     # So we build a tree and flatten it depth first.
     # TODO: See if we can update the detectors to work without this assumption so we can
     # just pass it a list of spans.
-    tree, root_span_id = build_tree(processed_spans)
-    flattened_spans = flatten_tree(tree, root_span_id)
+    flattened_spans = SpanTree(processed_spans).flattened_spans()
     event["spans"] = flattened_spans
 
     root_span = flattened_spans[0]
@@ -183,8 +208,8 @@ def transform_spans_to_event_dict(spans):
 
 
 def prepare_event_for_occurrence_consumer(event):
-    event_light = deepcopy(event)
-    event_light["spans"] = []
+    # Avoid copying the spans, the occurrence consumer doesn't need them.
+    event_light = deepcopy({**event, "spans": []})
     event_light["timestamp"] = event["datetime"]
     return event_light
 
@@ -8,6 +8,7 @@ from arroyo import Topic as ArroyoTopic
 from arroyo.backends.kafka import KafkaProducer, build_kafka_configuration
 from arroyo.backends.kafka.consumer import Headers, KafkaPayload
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.produce import Produce
 from arroyo.processing.strategies.reduce import Reduce
 from arroyo.processing.strategies.unfold import Unfold
@@ -26,7 +27,7 @@ from sentry_kafka_schemas.schema_types.snuba_spans_v1 import SpanEvent
 
 from sentry import options
 from sentry.conf.types.kafka_definition import Topic
-from sentry.spans.buffer.redis import RedisSpansBuffer
+from sentry.spans.buffer.redis import BufferedSpan, RedisSpansBuffer
 from sentry.spans.consumers.process.strategy import CommitSpanOffsets, NoOp
 from sentry.utils import metrics
 from sentry.utils.arroyo import MultiprocessingPool, RunTaskWithMultiprocessing
@@ -128,6 +129,74 @@ def process_message(message: Message[KafkaPayload]) -> ProduceSegmentContext | F
         return FILTERED_PAYLOAD
 
 
+def _process_batch(
+    message: Message[ValuesBatch[KafkaPayload]],
+) -> dict[int, ProduceSegmentContext] | FilteredPayload:
+    if not options.get("standalone-spans.process-spans-consumer.enable"):
+        return FILTERED_PAYLOAD
+
+    spans: list[BufferedSpan] = []
+    for value in message.payload:
+        assert isinstance(value, BrokerValue)
+
+        try:
+            project_id = get_project_id(value.payload.headers)
+        except Exception:
+            logger.exception("Failed to parse span message header")
+            continue
+
+        if not project_id or not in_process_spans_rollout_group(project_id=project_id):
+            continue
+
+        try:
+            span = _deserialize_span(value.payload.value)
+        except Exception:
+            sentry_sdk.capture_exception()
+            continue
+
+        segment_id = span.get("segment_id", None)
+        if segment_id is None:
+            continue
+
+        spans.append(
+            BufferedSpan(
+                project_id=project_id,
+                segment_id=segment_id,
+                timestamp=int(value.timestamp.timestamp()),
+                partition=value.partition.index,
+                payload=value.payload.value,
+            )
+        )
+
+    if not spans:
+        return FILTERED_PAYLOAD
+
+    with sentry_sdk.start_transaction(op="process", name="spans.process.process_batch"):
+        sentry_sdk.set_measurement("num_spans", len(spans))
+        client = RedisSpansBuffer()
+        should_process = client.write_spans_and_check_processing(spans)
+
+    # Same as reducing the contexts of the individual spans with `accumulator`.
+    contexts: dict[int, ProduceSegmentContext] = {}
+    for span, should_process_segments in zip(spans, should_process):
+        if should_process_segments:
+            contexts[span.partition] = ProduceSegmentContext(
+                should_process_segments=True, timestamp=span.timestamp, partition=span.partition
+            )
+
+    return contexts
+
+
+def process_batch(
+    message: Message[ValuesBatch[KafkaPayload]],
+) -> dict[int, ProduceSegmentContext] | FilteredPayload:
+    try:
+        return _process_batch(message)
+    except Exception:
+        sentry_sdk.capture_exception()
+        return FILTERED_PAYLOAD
+
+
 def _accumulator(result: dict[int, ProduceSegmentContext], value: BaseValue[ProduceSegmentContext]):
     context = value.payload
     if not context.should_process_segments:
@@ -147,6 +216,14 @@ def accumulator(
         return result
 
 
+def batch_accumulator(
+    result: dict[int, ProduceSegmentContext],
+    value: BaseValue[dict[int, ProduceSegmentContext]],
+) -> dict[int, ProduceSegmentContext]:
+    result.update(value.payload)
+    return result
+
+
 def _expand_segments(context_dict: dict[int, ProduceSegmentContext]):
     buffered_segments: list[KafkaPayload | FilteredPayload] = []
 
@@ -249,6 +326,34 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         unfold_step = Unfold(generator=expand_segments, next_step=produce_step)
 
         initial_value: Callable[[], dict[int, ProduceSegmentContext]] = lambda: {}
+
+        if options.get("standalone-spans.process-spans-consumer.batch-writes"):
+            # Write the spans of a whole batch to redis at once instead of
+            # doing a couple of round trips per span.
+            batch_reduce_step: Reduce[
+                dict[int, ProduceSegmentContext], dict[int, ProduceSegmentContext]
+            ] = Reduce(
+                self.max_batch_size,
+                self.max_batch_time,
+                batch_accumulator,
+                initial_value=initial_value,
+                next_step=unfold_step,
+            )
+
+            return BatchStep(
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                next_step=RunTaskWithMultiprocessing(
+                    function=process_batch,
+                    next_step=CommitSpanOffsets(commit=commit, next_step=batch_reduce_step),
+                    max_batch_size=self.max_batch_size,
+                    max_batch_time=self.max_batch_time,
+                    pool=self.__pool,
+                    input_block_size=self.input_block_size,
+                    output_block_size=self.output_block_size,
+                ),
+            )
+
         reduce_step: Reduce[ProduceSegmentContext, dict[int, ProduceSegmentContext]] = Reduce(
             self.max_batch_size,
             self.max_batch_time,
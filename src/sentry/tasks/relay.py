@@ -4,6 +4,7 @@ import time
 import sentry_sdk
 from django.db import router, transaction
 
+from sentry import options
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
 from sentry.silo.base import SiloMode
@@ -103,19 +104,40 @@ def validate_args(organization_id=None, project_id=None, public_key=None):
         raise TypeError("Must provide exactly one of organzation_id, project_id or public_key")
 
 
-def compute_configs(organization_id=None, project_id=None, public_key=None):
+def compute_configs(organization_id=None, project_id=None, public_key=None, reuse_sections=False):
     """Computes all configs for the org, project or single public key.
 
     You must only provide one single argument, not all.
 
+    The sections of the config shared by all keys of a project are computed once per project.
+    With ``reuse_sections``, sections cached by previous computations are reused as well, see
+    :mod:`sentry.relay.config.sections`.
+
     :returns: A dict mapping all affected public keys to their config.  The dict will not
        contain keys which should be retained in the cache unchanged.
     """
+    return dict(
+        iter_configs(
+            organization_id=organization_id,
+            project_id=project_id,
+            public_key=public_key,
+            reuse_sections=reuse_sections,
+        )
+    )
+
+
+def iter_configs(organization_id=None, project_id=None, public_key=None, reuse_sections=False):
+    """Computes the configs for the org, project or single public key one by one.
+
+    See :func:`compute_configs` for the parameters.
+
+    :returns: An iterator of ``(public_key, config)`` pairs.
+    """
     from sentry.models.project import Project
     from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config.sections import ProjectConfigSections
 
     validate_args(organization_id, project_id, public_key)
-    configs = {}
 
     if organization_id:
         # We want to re-compute all projects in an organization, instead of simply
@@ -127,13 +149,14 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         for organization in Organization.objects.filter(id=organization_id):
             for project in Project.objects.filter(organization_id=organization_id):
                 project.set_cached_field_value("organization", organization)
+                sections = ProjectConfigSections(project, reuse_cached=reuse_sections)
                 for key in ProjectKey.objects.filter(project_id=project.id):
                     key.set_cached_field_value("project", project)
                     # If we find the config in the cache it means it was active.  As such we want to
                     # recalculate it.  If the config was not there at all, we leave it and avoid the
                     # cost of re-computation.
                     if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
+                        yield key.public_key, compute_projectkey_config(key, sections)
                         action = "recompute"
                     else:
                         action = "not-cached"
@@ -143,13 +166,14 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                     )
     elif project_id:
         for project in Project.objects.filter(id=project_id):
+            sections = ProjectConfigSections(project, reuse_cached=reuse_sections)
             for key in ProjectKey.objects.filter(project_id=project_id):
                 key.set_cached_field_value("project", project)
                 # If we find the config in the cache it means it was active.  As such we want to
                 # recalculate it.  If the config was not there at all, we leave it and avoid the
                 # cost of re-computation.
                 if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
+                    yield key.public_key, compute_projectkey_config(key, sections)
                     action = "recompute"
                 else:
                     action = "not-cached"
@@ -169,19 +193,20 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
             # handlers that sent off the invalidation tasks before the DB
             # transaction was committed, causing us to write stale caches. That
             # bug was fixed in https://github.com/getsentry/sentry/pull/35671
-            configs[public_key] = {"disabled": True}
+            yield public_key, {"disabled": True}
         else:
-            configs[public_key] = compute_projectkey_config(key)
+            sections = ProjectConfigSections(key.project, reuse_cached=reuse_sections)
+            yield public_key, compute_projectkey_config(key, sections)
 
     else:
         raise TypeError("One of the arguments must not be None")
 
-    return configs
-
 
-def compute_projectkey_config(key):
+def compute_projectkey_config(key, sections=None):
     """Computes a single config for the given :class:`ProjectKey`.
 
+    :param sections: The :class:`ProjectConfigSections` of the key's project, to share
+        them with the configs of its other keys.
     :returns: A dict with the project config.
     """
     from sentry.models.projectkey import ProjectKeyStatus
@@ -190,7 +215,9 @@ def compute_projectkey_config(key):
     if key.status != ProjectKeyStatus.ACTIVE:
         return {"disabled": True}
     else:
-        return get_project_config(key.project, project_keys=[key], full_config=True).to_dict()
+        return get_project_config(
+            key.project, project_keys=[key], full_config=True, sections=sections
+        ).to_dict()
 
 
 @instrumented_task(
@@ -239,10 +266,25 @@ def invalidate_project_config(
     sentry_sdk.set_tag("trigger", trigger)
     sentry_sdk.set_context("kwargs", kwargs)
 
-    updated_configs = compute_configs(
-        organization_id=organization_id, project_id=project_id, public_key=public_key
-    )
-    projectconfig_cache.backend.set_many(updated_configs)
+    from sentry.relay.config.sections import reuses_cached_sections
+
+    # Configs are written in batches, so that invalidations of large organizations make
+    # progress even when they do not finish in time.
+    batch_size = options.get("relay.invalidation.batch-size")
+    updated_configs = {}
+    for key, config in iter_configs(
+        organization_id=organization_id,
+        project_id=project_id,
+        public_key=public_key,
+        reuse_sections=reuses_cached_sections(trigger),
+    ):
+        updated_configs[key] = config
+        if len(updated_configs) >= batch_size:
+            projectconfig_cache.backend.set_many(updated_configs)
+            updated_configs = {}
+
+    if updated_configs:
+        projectconfig_cache.backend.set_many(updated_configs)
 
 
 @sentry_sdk.tracing.trace
@@ -261,6 +303,9 @@ def schedule_invalidate_project_config(
     more than one is passed, a :exc:`TypeError` is raised.
 
     If an invalidation task is already scheduled, this task will not schedule another one.
+    Once many invalidations are scheduled for the projects or keys of an organization, they
+    are coalesced into a single invalidation of the organization, see the
+    ``relay.invalidation.coalesce-threshold`` option.
 
     If this function is called from within a database transaction, the caller must
     supply the database associated with the transaction via the ``transaction_db``
@@ -327,6 +372,7 @@ def _schedule_invalidate_project_config(
     """For param docs, see :func:`schedule_invalidate_project_config`."""
     from sentry.models.project import Project
     from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config.sections import invalidate_cached_sections
 
     validate_args(organization_id, project_id, public_key)
 
@@ -357,6 +403,14 @@ def _schedule_invalidate_project_config(
         else:
             check_debounce_keys["organization_id"] = org_id
 
+    # This must happen even if the task is debounced, as the scheduled task may
+    # have been scheduled with a trigger that reuses cached sections.
+    invalidate_cached_sections(
+        trigger,
+        organization_id=organization_id,
+        project_id=check_debounce_keys["project_id"],
+    )
+
     if projectconfig_debounce_cache.invalidation.is_debounced(**check_debounce_keys):
         # If this task is already in the queue, do not schedule another task.
         metrics.incr(
@@ -365,6 +419,24 @@ def _schedule_invalidate_project_config(
         )
         return
 
+    # Bulk updates invalidate many projects or keys of the same organization at once.  Once
+    # too many of them are scheduled, they are coalesced into a single invalidation of the
+    # organization, which also debounces all further invalidations in it.
+    threshold = options.get("relay.invalidation.coalesce-threshold")
+    org_id = check_debounce_keys["organization_id"]
+    if threshold and org_id and not organization_id:
+        scheduled = projectconfig_debounce_cache.invalidation.count_scheduled(
+            organization_id=org_id,
+            window=options.get("relay.invalidation.coalesce-window"),
+        )
+        metrics.distribution("relay.projectconfig_cache.invalidation.pending", scheduled)
+        if scheduled > threshold:
+            metrics.incr(
+                "relay.projectconfig_cache.coalesced",
+                tags={"update_reason": trigger, "task": "invalidation"},
+            )
+            organization_id, project_id, public_key = org_id, None, None
+
     metrics.incr(
         "relay.projectconfig_cache.scheduled",
         tags={"update_reason": trigger, "task": "invalidation"},
@@ -14,6 +14,7 @@ from sentry import analytics, eventstore, similarity, tsdb
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.culprit import generate_culprit
 from sentry.eventstore.models import BaseEvent
+from sentry.grouping.ingest.grouphash_cache import invalidate_grouphash_cache
 from sentry.models.activity import Activity
 from sentry.models.environment import Environment
 from sentry.models.eventattachment import EventAttachment
@@ -481,6 +482,7 @@ def lock_hashes(project_id, source_id, fingerprints):
         GroupHash.objects.filter(id__in=[h.id for h in eligible_hashes]).update(
             state=GroupHash.State.LOCKED_IN_MIGRATION
         )
+    invalidate_grouphash_cache([project_id])
 
     return [h.hash for h in eligible_hashes]
 
@@ -491,6 +493,7 @@ def unlock_hashes(project_id, locked_primary_hashes):
         hash__in=locked_primary_hashes,
         state=GroupHash.State.LOCKED_IN_MIGRATION,
     ).update(state=GroupHash.State.UNLOCKED)
+    invalidate_grouphash_cache([project_id])
 
 
 @instrumented_task(
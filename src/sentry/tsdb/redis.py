@@ -1,7 +1,11 @@
+import atexit
 import itertools
 import logging
+import os
 import random
+import threading
 import uuid
+import weakref
 from collections import defaultdict, namedtuple
 from collections.abc import Callable, Iterable
 from datetime import datetime
@@ -15,6 +19,7 @@ from django.utils.encoding import force_bytes
 from redis.client import Script
 
 from sentry.tsdb.base import BaseTSDB, IncrMultiOptions, TSDBModel
+from sentry.utils import metrics
 from sentry.utils.compat import crc32
 from sentry.utils.dates import to_datetime
 from sentry.utils.redis import (
@@ -32,6 +37,33 @@ T = TypeVar("T")
 SketchParameters = namedtuple("SketchParameters", "depth width capacity")
 
 CountMinScript = load_redis_script("tsdb/cmsketch.lua")
+BatchScript = load_redis_script("tsdb/batch.lua")
+
+# Maximum number of keys that are written by a single batch script invocation.
+BATCH_SCRIPT_MAX_KEYS = 1000
+
+# Number of times the write of a batch is attempted before it is dropped.
+BATCH_MAX_ATTEMPTS = 3
+
+# Instances that aggregate writes in memory, flushed at exit and reset in
+# forked children.
+_batching_instances: "weakref.WeakSet[RedisTSDB]" = weakref.WeakSet()
+
+
+def _flush_batching_instances() -> None:
+    for instance in list(_batching_instances):
+        # There is no next window to retry failed writes in.
+        instance.flush(retry=False)
+
+
+def _reset_batching_instances() -> None:
+    # The writes aggregated before forking are written by the parent.
+    for instance in list(_batching_instances):
+        instance._reset_batches()
+
+
+atexit.register(_flush_batching_instances)
+os.register_at_fork(after_in_child=_reset_batching_instances)
 
 
 class SuppressionWrapper(Generic[T]):
@@ -60,6 +92,88 @@ class SuppressionWrapper(Generic[T]):
         return True
 
 
+class WriteBatch:
+    """\
+    Counter increments and distinct counter additions for a single cluster
+    that have been aggregated in memory and not been written yet.
+    """
+
+    def __init__(self) -> None:
+        # (hash_key, hash_field) -> count
+        self.counters: dict[tuple[str, str | int], int] = defaultdict(int)
+        # key -> (routing key, values)
+        self.distinct_counters: dict[str | int, tuple[int, set[str]]] = {}
+        # key -> "max expiration encountered"
+        self.expiries: dict[str | int, float] = defaultdict(float)
+        # number of commands these writes would have required if they had not
+        # been aggregated
+        self.commands = 0
+        # number of times writing these writes has failed
+        self.attempts = 0
+
+    def __len__(self) -> int:
+        return len(self.counters) + len(self.distinct_counters)
+
+    def add_expiry(self, key: str | int, expiry: float) -> None:
+        if self.expiries[key] < expiry:
+            self.expiries[key] = expiry
+
+    def merge(self, other: "WriteBatch") -> None:
+        """\
+        Adds the writes of ``other`` to this batch.
+        """
+        for counter, count in other.counters.items():
+            self.counters[counter] += count
+        for key, (routing_key, values) in other.distinct_counters.items():
+            self.distinct_counters.setdefault(key, (routing_key, set()))[1].update(values)
+        for key, expiry in other.expiries.items():
+            self.add_expiry(key, expiry)
+        self.commands += other.commands
+        self.attempts = max(self.attempts, other.attempts)
+
+    def get_scripts(
+        self, cluster: rb.Cluster
+    ) -> dict[str | int, list[tuple[Script, list[str | int], list[Any]]]]:
+        """\
+        Returns the ``BatchScript`` invocations required to write this batch,
+        keyed by a routing key of the host that they have to be executed on.
+        """
+        router = cluster.get_router()
+        # host id -> (routing key, operations by key)
+        hosts: dict[int, tuple[str | int, dict[str | int, list[Any]]]] = {}
+
+        def get_operations(routing_key: str | int, key: str | int) -> list[Any]:
+            host_id = router.get_host_for_key(routing_key)
+            if host_id not in hosts:
+                hosts[host_id] = (routing_key, {})
+            return hosts[host_id][1].setdefault(key, [])
+
+        for (hash_key, hash_field), count in self.counters.items():
+            get_operations(hash_key, hash_key).append(("HINCRBY", hash_field, count))
+
+        # Distinct counters are routed by their model key rather than the key
+        # of the HyperLogLog, see ``record_multi``.
+        for key, (routing_key, values) in self.distinct_counters.items():
+            get_operations(routing_key, key).append(("PFADD", len(values), *values))
+
+        for key, expiry in self.expiries.items():
+            routing_key = self.distinct_counters[key][0] if key in self.distinct_counters else key
+            get_operations(routing_key, key).append(("EXPIREAT", expiry))
+
+        scripts: dict[str | int, list[tuple[Script, list[str | int], list[Any]]]] = {}
+        for routing_key, operations_by_key in hosts.values():
+            keys = list(operations_by_key)
+            for i in range(0, len(keys), BATCH_SCRIPT_MAX_KEYS):
+                chunk = keys[i : i + BATCH_SCRIPT_MAX_KEYS]
+                arguments: list[Any] = []
+                for index, key in enumerate(chunk, 1):
+                    for operation, *operands in operations_by_key[key]:
+                        arguments.extend((operation, index, *operands))
+                scripts.setdefault(routing_key, []).append((BatchScript, chunk, arguments))
+
+        return scripts
+
+
 class RedisTSDB(BaseTSDB):
     """
     A time series storage backend for Redis.
@@ -113,6 +227,16 @@ class RedisTSDB(BaseTSDB):
     frequency table can be displayed as percentages of the whole data set.
     (Additional documentation and the bulk of the logic for implementing the
     frequency table API can be found in the ``cmsketch.lua`` script.)
+
+    Writes to simple and distinct counters can optionally be aggregated in
+    memory for up to ``batch_window_ms`` milliseconds (or until
+    ``batch_max_size`` keys have been touched) before being written by a
+    single ``batch.lua`` invocation per host. Errors while writing a batch are
+    logged and never propagated, regardless of the cluster being "durable".
+    Failed batches are merged into the next window and retried, up to
+    ``BATCH_MAX_ATTEMPTS`` times before they are dropped. Since those writes
+    are only held in memory, a process that crashes loses the writes of the
+    current window and of the failed windows that are still being retried.
     """
 
     DEFAULT_SKETCH_PARAMETERS = SketchParameters(3, 128, 50)
@@ -123,6 +247,13 @@ class RedisTSDB(BaseTSDB):
         self.prefix = prefix
         self.vnodes = vnodes
         self.enable_frequency_sketches = options.pop("enable_frequency_sketches", False)
+        self.batch_window = options.pop("batch_window_ms", 0) / 1000
+        self.batch_max_size = options.pop("batch_max_size", 1000)
+        self._batches: dict[tuple[rb.Cluster, bool], WriteBatch] = {}
+        self._batch_lock = threading.Lock()
+        self._flush_timer: threading.Timer | None = None
+        if self.batch_window:
+            _batching_instances.add(self)
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -262,42 +393,53 @@ class RedisTSDB(BaseTSDB):
             default_timestamp = timezone.now()
 
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
-            manager = cluster.map()
-            if not durable:
-                manager = SuppressionWrapper(manager)
+            # (hash_key, hash_field) -> count
+            key_operations: dict[tuple[str, str | int], int] = defaultdict(int)
+            # (hash_key) -> "max expiration encountered"
+            key_expiries: dict[str, float] = defaultdict(float)
+
+            for rollup, max_values in self.rollups.items():
+                for item in items:
+                    if len(item) == 2:
+                        model, key = item
+                        options: IncrMultiOptions = {
+                            "timestamp": default_timestamp,
+                            "count": default_count,
+                        }
+                    else:
+                        model, key, options = item
+
+                    count = options.get("count", default_count)
+                    _timestamp = options.get("timestamp", default_timestamp)
+
+                    expiry = self.calculate_expiry(rollup, max_values, _timestamp)
+
+                    for _environment_id in environment_ids:
+                        hash_key, hash_field = self.make_counter_key(
+                            model, rollup, _timestamp, key, _environment_id
+                        )
 
-            with manager as client:
-                # (hash_key, hash_field) -> count
-                key_operations: dict[tuple[str, str | int], int] = defaultdict(int)
-                # (hash_key) -> "max expiration encountered"
-                key_expiries: dict[str, float] = defaultdict(float)
-
-                for rollup, max_values in self.rollups.items():
-                    for item in items:
-                        if len(item) == 2:
-                            model, key = item
-                            options: IncrMultiOptions = {
-                                "timestamp": default_timestamp,
-                                "count": default_count,
-                            }
-                        else:
-                            model, key, options = item
-
-                        count = options.get("count", default_count)
-                        _timestamp = options.get("timestamp", default_timestamp)
-
-                        expiry = self.calculate_expiry(rollup, max_values, _timestamp)
+                        if key_expiries[hash_key] < expiry:
+                            key_expiries[hash_key] = expiry
 
-                        for _environment_id in environment_ids:
-                            hash_key, hash_field = self.make_counter_key(
-                                model, rollup, _timestamp, key, _environment_id
-                            )
+                        key_operations[(hash_key, hash_field)] += count
 
-                            if key_expiries[hash_key] < expiry:
-                                key_expiries[hash_key] = expiry
+            if self.batch_window:
+                with self._batch_lock:
+                    batch = self._get_batch(cluster, durable)
+                    for (hash_key, hash_field), count in key_operations.items():
+                        batch.counters[(hash_key, hash_field)] += count
+                    for hash_key, expiry in key_expiries.items():
+                        batch.add_expiry(hash_key, expiry)
+                    batch.commands += len(key_operations) + len(key_expiries)
+                self._maybe_flush(cluster, durable)
+                continue
 
-                            key_operations[(hash_key, hash_field)] += count
+            manager = cluster.map()
+            if not durable:
+                manager = SuppressionWrapper(manager)
 
+            with manager as client:
                 for (hash_key, hash_field), count in key_operations.items():
                     client.hincrby(hash_key, hash_field, count)
                     if key_expiries.get(hash_key):
@@ -467,6 +609,22 @@ class RedisTSDB(BaseTSDB):
         ts = int(timestamp.timestamp())  # ``timestamp`` is not actually a timestamp :(
 
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
+            if self.batch_window:
+                with self._batch_lock:
+                    batch = self._get_batch(cluster, durable)
+                    for model, key, values in items:
+                        for rollup, max_values in self.rollups.items():
+                            expiry = self.calculate_expiry(rollup, max_values, timestamp)
+                            for _environment_id in environment_ids:
+                                k = self.make_key(model, rollup, ts, key, _environment_id)
+                                batch.distinct_counters.setdefault(k, (key, set()))[1].update(
+                                    values
+                                )
+                                batch.add_expiry(k, expiry)
+                                batch.commands += 2
+                self._maybe_flush(cluster, durable)
+                continue
+
             manager = cluster.fanout()
             if not durable:
                 manager = SuppressionWrapper(manager)
@@ -480,6 +638,75 @@ class RedisTSDB(BaseTSDB):
                             c.pfadd(k, *values)
                             c.expireat(k, self.calculate_expiry(rollup, max_values, timestamp))
 
+    def _get_batch(self, cluster: rb.Cluster, durable: bool) -> WriteBatch:
+        # Must be called while holding ``_batch_lock``.
+        batch = self._batches.get((cluster, durable))
+        if batch is None:
+            batch = self._batches[(cluster, durable)] = WriteBatch()
+        # The timer thread does not survive forking, so check whether it is
+        # still alive rather than whether it has been created.
+        if self._flush_timer is None or not self._flush_timer.is_alive():
+            self._flush_timer = threading.Timer(self.batch_window, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        return batch
+
+    def _maybe_flush(self, cluster: rb.Cluster, durable: bool) -> None:
+        with self._batch_lock:
+            batch = self._batches.get((cluster, durable))
+            if batch is None or len(batch) < self.batch_max_size:
+                return
+            del self._batches[(cluster, durable)]
+
+        self._write_batch(cluster, durable, batch)
+
+    def flush(self, retry: bool = True) -> None:
+        """\
+        Writes all counter increments and distinct counter additions that have
+        been aggregated in memory. A no-op unless ``batch_window_ms`` is set.
+
+        :param retry: Whether writes that fail are retried with the next window.
+        """
+        with self._batch_lock:
+            batches, self._batches = self._batches, {}
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+        for (cluster, durable), batch in batches.items():
+            self._write_batch(cluster, durable, batch, retry)
+
+    def _reset_batches(self) -> None:
+        self._batches = {}
+        self._batch_lock = threading.Lock()
+        self._flush_timer = None
+
+    def _write_batch(
+        self, cluster: rb.Cluster, durable: bool, batch: WriteBatch, retry: bool = True
+    ) -> None:
+        try:
+            scripts = batch.get_scripts(cluster)
+            cluster.execute_commands(scripts)
+        except Exception:
+            logger.exception("Failed to write TSDB batch")
+            batch.attempts += 1
+            if not retry or batch.attempts >= BATCH_MAX_ATTEMPTS:
+                metrics.incr("tsdb.batch.dropped", amount=len(batch))
+                return
+
+            # Retry the writes with the next window.
+            metrics.incr("tsdb.batch.retried", amount=len(batch))
+            with self._batch_lock:
+                self._get_batch(cluster, durable).merge(batch)
+            return
+
+        metrics.incr("tsdb.batch.flushed")
+        metrics.distribution("tsdb.batch.size", len(batch))
+        metrics.incr("tsdb.batch.commands", amount=batch.commands)
+        metrics.incr(
+            "tsdb.batch.scripts", amount=sum(len(commands) for commands in scripts.values())
+        )
+
     def get_distinct_counts_series(
         self,
         model: TSDBModel,
@@ -17,7 +17,7 @@ from django.utils.functional import Promise
 from django.utils.safestring import SafeString, mark_safe
 from django.utils.timezone import is_aware
 from simplejson import _default_decoder  # type: ignore[attr-defined]  # noqa: S003
-from simplejson import JSONDecodeError, JSONEncoder  # noqa: S003
+from simplejson import JSONDecodeError, JSONDecoder, JSONEncoder  # noqa: S003
 
 from bitfield.types import BitHandler
 
@@ -108,6 +108,10 @@ _default_escaped_encoder = JSONEncoderForHTML(
     default=better_default_encoder,
 )
 
+# Drops every object as soon as it is decoded, so that skipping a document never holds
+# more than one object in memory.
+_skipping_decoder = JSONDecoder(object_pairs_hook=lambda pairs: None)
+
 
 JSONData = Any  # https://github.com/python/typing/issues/182
 
@@ -142,6 +146,22 @@ def loads(
             return _default_decoder.decode(value)
 
 
+def raw_decode(value: str, idx: int = 0) -> tuple[JSONData, int]:
+    """
+    Decodes the JSON document that starts at `idx` in `value`, ignoring any
+    data that follows it. Returns the document and the index at which it ends.
+    """
+    return _default_decoder.raw_decode(value, idx)
+
+
+def skip(value: str, idx: int = 0) -> int:
+    """
+    Returns the index at which the JSON document that starts at `idx` in
+    `value` ends, without building the document.
+    """
+    return _skipping_decoder.raw_decode(value, idx)[1]
+
+
 def dumps_htmlsafe(value: object) -> SafeString:
     return mark_safe(_default_escaped_encoder.encode(value))
 
@@ -183,4 +203,5 @@ __all__ = (
     "load",
     "loads",
     "prune_empty_keys",
+    "raw_decode",
 )
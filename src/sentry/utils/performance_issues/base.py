@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import random
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import timedelta
 from enum import Enum
-from typing import Any, ClassVar
+from typing import Any, ClassVar, TypeVar
 from urllib.parse import parse_qs, urlparse
 
 from sentry import options
@@ -162,12 +166,57 @@ class PerformanceDetector(ABC):
         return True
 
 
+T = TypeVar("T")
+
+# (function name, span id) -> (span, value), see `span_cache`.
+_span_cache: ContextVar[dict[tuple[str, int], tuple[Span, Any]] | None] = ContextVar(
+    "performance_detection_span_cache", default=None
+)
+
+
+@contextmanager
+def span_cache() -> Generator[None, None, None]:
+    """
+    While active, values derived from a span by functions decorated with
+    `span_memoized` are computed once per span instead of once per detector.
+    Spans must not be modified while the cache is active.
+    """
+    token = _span_cache.set({})
+    try:
+        yield
+    finally:
+        _span_cache.reset(token)
+
+
+def span_memoized(func: Callable[[Span], T]) -> Callable[[Span], T]:
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(span: Span) -> T:
+        cache = _span_cache.get()
+        if cache is None:
+            return func(span)
+
+        key = (name, id(span))
+        cached = cache.get(key)
+        # The span is kept in the cache so that its id cannot be reused.
+        if cached is not None and cached[0] is span:
+            return cached[1]
+
+        value = func(span)
+        cache[key] = (span, value)
+        return value
+
+    return wrapper
+
+
 def does_overlap_previous_span(previous_span: Span, current_span: Span):
     previous_span_ends = timedelta(seconds=previous_span.get("timestamp", 0))
     current_span_begins = timedelta(seconds=current_span.get("start_timestamp", 0))
     return previous_span_ends > current_span_begins
 
 
+@span_memoized
 def get_span_duration(span: Span) -> timedelta:
     return timedelta(seconds=span.get("timestamp", 0)) - timedelta(
         seconds=span.get("start_timestamp", 0)
@@ -180,6 +229,7 @@ def get_duration_between_spans(first_span: Span, second_span: Span):
     return timedelta(seconds=second_span_begins - first_span_ends).total_seconds() * 1000
 
 
+@span_memoized
 def get_url_from_span(span: Span) -> str:
     """
     Parses the span data and pulls out the URL. Accounts for different SDKs and
@@ -234,6 +284,7 @@ def fingerprint_spans(spans: list[Span], unique_only: bool = False):
 
 
 # Creates a stable fingerprint given the same span details using sha1.
+@span_memoized
 def fingerprint_span(span: Span):
     op = span.get("op", None)
     description = span.get("description", None)
@@ -313,6 +364,7 @@ ASSET_HASH_REGEX = re.compile(r"[a-f0-9]{16,64}", re.I)
 
 
 # Creates a stable fingerprint for resource spans from their description (url), removing common cache busting tokens.
+@span_memoized
 def fingerprint_resource_span(span: Span):
     url = urlparse(span.get("description") or "")
     path = url.path
@@ -19,7 +19,7 @@ from sentry.utils.event import is_event_from_browser_javascript_sdk
 from sentry.utils.event_frames import get_sdk_name
 from sentry.utils.safe import get_path
 
-from .base import DetectorType, PerformanceDetector
+from .base import DetectorType, PerformanceDetector, span_cache
 from .detectors.consecutive_db_detector import ConsecutiveDBSpanDetector
 from .detectors.consecutive_http_detector import ConsecutiveHTTPSpanDetector
 from .detectors.http_overhead_detector import HTTPOverheadDetector
@@ -341,8 +341,7 @@ def _detect_performance_problems(
         if detector_class.is_detector_enabled()
     ]
 
-    for detector in detectors:
-        run_detector_on_data(detector, data)
+    run_detectors_on_data(detectors, data)
 
     # Metrics reporting only for detection, not created issues.
     report_metrics_for_detectors(
@@ -401,6 +400,27 @@ def run_detector_on_data(detector, data):
     detector.on_complete()
 
 
+def run_detectors_on_data(detectors: Sequence[PerformanceDetector], data: dict[str, Any]) -> None:
+    """
+    Same as calling `run_detector_on_data` for every detector, but walks the
+    spans only once and computes values that several detectors derive from a
+    span (durations, urls, fingerprints) only once per span.
+    """
+    eligible_detectors = [detector for detector in detectors if detector.is_event_eligible(data)]
+    if not eligible_detectors:
+        return
+
+    visitors = [detector.visit_span for detector in eligible_detectors]
+    spans = data.get("spans", [])
+    with span_cache():
+        for span in spans:
+            for visit_span in visitors:
+                visit_span(span)
+
+        for detector in eligible_detectors:
+            detector.on_complete()
+
+
 # Reports metrics and creates spans for detection
 def report_metrics_for_detectors(
     event: dict[str, Any],
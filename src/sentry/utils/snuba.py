@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import codecs
 import functools
 import logging
+import math
 import os
 import re
+import threading
 import time
 from collections import namedtuple
-from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import (
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from hashlib import sha1
 from typing import Any, Union
@@ -24,6 +36,7 @@ from sentry_sdk import Hub
 from snuba_sdk import MetricsQuery, Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -456,6 +469,19 @@ _snuba_pool = connection_from_url(
     maxsize=10,
 )
 _query_thread_pool = ThreadPoolExecutor(max_workers=10)
+# Refreshes stale query cache entries in the background, see `_revalidate_queries`.
+_revalidation_thread_pool = ThreadPoolExecutor(max_workers=4)
+# Stale entries beyond this many pending refreshes are served without refreshing them.
+MAX_PENDING_REVALIDATIONS = 100
+# Upper bound of `snuba.query-cache.lease-wait-seconds`, request threads block that long.
+MAX_LEASE_WAIT_SECONDS = 2.0
+
+
+def _record_pool_metrics() -> None:
+    # Idle connections and never opened slots are both kept in the pool's queue.
+    available = _snuba_pool.pool.qsize() if _snuba_pool.pool is not None else 0
+    metrics.gauge("snuba.pool.connections", _snuba_pool.num_connections)
+    metrics.gauge("snuba.pool.in_use", _snuba_pool.maxsize - available)
 
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
@@ -886,10 +912,167 @@ def bulk_snuba_queries(
             request.tenant_ids = request.tenant_ids or dict()
             request.tenant_ids["referrer"] = referrer
 
-    params = [(request, lambda x: x, lambda x: x) for request in requests]
+    params = [(request, _identity, _identity) for request in requests]
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
+def _identity(value: Any) -> Any:
+    return value
+
+
+#: Size of the chunks in which streamed responses are read, in bytes.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _StreamingJSONReader:
+    """
+    Reads JSON values from a stream of chunks of utf-8 encoded bytes, only
+    keeping the part of the stream that has not been consumed in memory.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skips whitespace and returns the next character, or an empty string at
+        the end of the stream.
+        """
+        while True:
+            self._pos = _JSON_WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def accept(self, char: str) -> bool:
+        if self.peek() != char:
+            return False
+        self._pos += 1
+        return True
+
+    def expect(self, char: str) -> None:
+        if not self.accept(char):
+            raise json.JSONDecodeError(f"Expecting {char!r}", self._buffer, self._pos)
+
+    def expect_end(self) -> None:
+        if self.peek():
+            raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may be incomplete, retry once more data arrived.
+                if not self._fill():
+                    raise
+                continue
+            # A number ending with the buffer may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_response_rows(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Parses a Snuba response body incrementally, yielding the rows of its
+    `data` array as they are received. All other keys are skipped.
+    """
+    reader = _StreamingJSONReader(chunks)
+    reader.expect("{")
+    if not reader.accept("}"):
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "data":
+                reader.expect("[")
+                if not reader.accept("]"):
+                    while True:
+                        yield reader.value()
+                        if not reader.accept(","):
+                            break
+                    reader.expect("]")
+            else:
+                reader.value()
+            if not reader.accept(","):
+                break
+        reader.expect("}")
+    reader.expect_end()
+
+
+def iter_snql_query_rows(
+    request: Request,
+    referrer: str | None = None,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Runs a SnQL query and yields the rows of its result as they are received,
+    instead of loading the whole response into memory. Meant for queries with
+    large results such as data exports, which are never cached.
+    """
+    metrics.incr("snql.sdk.api", tags={"referrer": referrer or "unknown"})
+    validate_referrer(referrer)
+    headers = {}
+    if "consistent" in OVERRIDE_OPTIONS:
+        request.flags.consistent = OVERRIDE_OPTIONS["consistent"]
+    if referrer:
+        request.tenant_ids = request.tenant_ids or dict()
+        request.tenant_ids["referrer"] = referrer
+        headers["referer"] = referrer
+
+    try:
+        response = _raw_snql_query(request, Hub(Hub.current), headers, preload_content=False)
+    except urllib3.exceptions.HTTPError as err:
+        raise SnubaError(err)
+
+    completed = False
+    try:
+        _record_pool_metrics()
+        if response.status != 200:
+            # Error responses are small, so they are decoded as a whole.
+            _decode_response(response, request, headers)
+
+        row_count = 0
+        try:
+            for row in _iter_response_rows(response.stream(STREAM_CHUNK_SIZE)):
+                row_count += 1
+                yield row
+        except json.JSONDecodeError as err:
+            raise UnexpectedResponseError(f"Could not decode JSON response: {err}")
+        except urllib3.exceptions.HTTPError as err:
+            raise SnubaError(err)
+        completed = True
+        metrics.distribution(
+            "snuba.stream.rows", row_count, tags={"referrer": referrer or "unknown"}
+        )
+    finally:
+        if not completed:
+            # Never hand a connection with unread data back to the pool.
+            response.close()
+        response.release_conn()
+
+
 # TODO: This is the endpoint that accepts legacy (non-SnQL/MQL queries)
 # It should eventually be removed
 def bulk_raw_query(
@@ -919,6 +1102,326 @@ def get_cache_key(query: SnubaQuery) -> str:
     return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
+@dataclass(frozen=True)
+class QueryCachePolicy:
+    # Seconds for which a cached result is served as is.
+    ttl: int
+    # Seconds after `ttl` for which a cached result is still served while it
+    # is refreshed in the background.
+    stale_ttl: int = 0
+
+
+def get_query_cache_policy(referrer: str | None) -> QueryCachePolicy:
+    policies = options.get("snuba.query-cache.referrer-policies")
+    policy = policies.get(referrer or "") or policies.get("default") or {}
+    return QueryCachePolicy(
+        ttl=policy.get("ttl", settings.SENTRY_SNUBA_CACHE_TTL_SECONDS),
+        stale_ttl=policy.get("stale_ttl", 0),
+    )
+
+
+def _encode_cached_result(result: Mapping[str, Any], policy: QueryCachePolicy) -> str:
+    return json.dumps({"fresh_until": time.time() + policy.ttl, "result": result})
+
+
+def _decode_cached_result(value: str) -> tuple[Mapping[str, Any], float]:
+    """
+    Returns a cached result and the time until which it is fresh.
+    """
+    data = json.loads(value)
+    if isinstance(data, dict) and data.keys() == {"fresh_until", "result"}:
+        return data["result"], data["fresh_until"]
+
+    # Written before results were stored along with their freshness.
+    return data, math.inf
+
+
+class InflightQueries:
+    """
+    Keeps track of the cacheable queries that are executing in this process,
+    so that concurrent identical queries share a single execution. Futures
+    resolve to the encoded cache entry of the result.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._futures: dict[str, Future[str]] = {}
+
+    def claim(
+        self, cache_keys: Sequence[str]
+    ) -> tuple[dict[str, Future[str]], dict[str, Future[str]]]:
+        """
+        Returns the futures the caller now has to resolve, and the ones of
+        queries that are already being executed by someone else.
+        """
+        owned: dict[str, Future[str]] = {}
+        waiting: dict[str, Future[str]] = {}
+        with self._lock:
+            for cache_key in cache_keys:
+                if cache_key in owned:
+                    continue
+                future = self._futures.get(cache_key)
+                if future is None:
+                    future = self._futures[cache_key] = Future()
+                    owned[cache_key] = future
+                else:
+                    waiting[cache_key] = future
+        return owned, waiting
+
+    def release(self, cache_keys: Collection[str]) -> None:
+        with self._lock:
+            for cache_key in cache_keys:
+                self._futures.pop(cache_key, None)
+
+
+_inflight_queries = InflightQueries()
+
+
+class PendingRevalidations:
+    """
+    Keeps track of the stale queries that are being refreshed in the
+    background, so that every query is only refreshed once at a time. The
+    number of pending refreshes is bounded, so that the queue of the
+    background pool is too.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._cache_keys: set[str] = set()
+
+    def claim(self, cache_keys: Collection[str]) -> list[str]:
+        """Returns the keys the caller now has to refresh."""
+        with self._lock:
+            claimed = [cache_key for cache_key in cache_keys if cache_key not in self._cache_keys]
+            claimed = claimed[: max(0, self._max_size - len(self._cache_keys))]
+            self._cache_keys.update(claimed)
+        return claimed
+
+    def release(self, cache_keys: Collection[str]) -> None:
+        with self._lock:
+            self._cache_keys.difference_update(cache_keys)
+
+
+_pending_revalidations = PendingRevalidations(MAX_PENDING_REVALIDATIONS)
+
+
+def _get_lease_key(cache_key: str) -> str:
+    return f"{cache_key}:lease"
+
+
+def _acquire_leases(cache_keys: Collection[str], timeout: float) -> set[str]:
+    """
+    Acquires a short lived lease on the given queries, so that only one
+    process executes each of them. Returns the keys that were acquired.
+    """
+    return {
+        cache_key
+        for cache_key in cache_keys
+        if cache.add(_get_lease_key(cache_key), 1, math.ceil(timeout))
+    }
+
+
+def _release_leases(cache_keys: Collection[str]) -> None:
+    if cache_keys:
+        cache.delete_many([_get_lease_key(cache_key) for cache_key in cache_keys])
+
+
+def _wait_for_cached_results(cache_keys: Collection[str], timeout: float) -> dict[str, str]:
+    """
+    Waits up to `timeout` seconds for other processes to cache the results of
+    the given queries, and returns the cache entries that showed up.
+    """
+    found: dict[str, str] = {}
+    remaining = set(cache_keys)
+    if not remaining:
+        return found
+
+    started = time.monotonic()
+    deadline = started + min(timeout, MAX_LEASE_WAIT_SECONDS)
+    while remaining and time.monotonic() < deadline:
+        time.sleep(0.05)
+        for cache_key, value in cache.get_many(list(remaining)).items():
+            if value is not None:
+                found[cache_key] = value
+                remaining.discard(cache_key)
+    metrics.distribution(
+        "snuba.query_cache.lease_wait",
+        time.monotonic() - started,
+        tags={"found": not remaining},
+        unit="second",
+    )
+    return found
+
+
+def _execute_and_cache(
+    queries: Mapping[str, RequestQueryBody],
+    futures: Mapping[str, Future[str]],
+    headers: Mapping[str, str],
+    policy: QueryCachePolicy,
+) -> dict[str, Mapping[str, Any]]:
+    """
+    Executes the given queries, caches their results and resolves the futures
+    that coalesced callers are waiting for.
+    """
+    try:
+        query_results = _bulk_snuba_query(list(queries.values()), headers)
+    except Exception as e:
+        for future in futures.values():
+            future.set_exception(e)
+        raise
+
+    results = {}
+    for cache_key, result in zip(queries, query_results):
+        value = _encode_cached_result(result, policy)
+        cache.set(cache_key, value, policy.ttl + policy.stale_ttl)
+        futures[cache_key].set_result(value)
+        results[cache_key] = result
+    return results
+
+
+def _revalidate_queries(
+    queries: Mapping[str, RequestQueryBody],
+    headers: Mapping[str, str],
+    policy: QueryCachePolicy,
+) -> None:
+    """
+    Refreshes stale cache entries in the background, unless someone else is
+    already doing so.
+
+    Refreshes are not shared with foreground queries, which never wait for
+    the background pool.
+    """
+    cache_keys: Collection[str] = list(queries)
+    use_leases = options.get("snuba.query-cache.lease-wait-seconds") > 0
+    if use_leases:
+        # The lease is held until the refresh is done, and only expires on its
+        # own if this process dies before releasing it.
+        cache_keys = _acquire_leases(cache_keys, settings.SENTRY_SNUBA_TIMEOUT)
+
+    owned = _pending_revalidations.claim(cache_keys)
+    if use_leases:
+        _release_leases(set(cache_keys) - set(owned))
+    if len(owned) < len(queries):
+        metrics.incr("snuba.query_cache.revalidate_skipped", amount=len(queries) - len(owned))
+    if not owned:
+        return
+
+    metrics.incr("snuba.query_cache.revalidate", amount=len(owned))
+
+    def revalidate() -> None:
+        try:
+            _execute_and_cache(
+                {cache_key: queries[cache_key] for cache_key in owned},
+                {cache_key: Future() for cache_key in owned},
+                headers,
+                policy,
+            )
+        except Exception:
+            logger.warning("snuba.query_cache.revalidate_failed", exc_info=True)
+        finally:
+            _pending_revalidations.release(owned)
+            if use_leases:
+                _release_leases(owned)
+
+    _revalidation_thread_pool.submit(revalidate)
+
+
+def _query_with_cache(
+    query_param_list: Sequence[tuple[int, RequestQueryBody]],
+    headers: Mapping[str, str],
+    referrer: str | None,
+) -> list[tuple[int, Mapping[str, Any]]]:
+    policy = get_query_cache_policy(referrer)
+    metric_tags = {"referrer": referrer} if referrer else None
+    now = time.time()
+
+    results: list[tuple[int, Mapping[str, Any]]] = []
+    cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
+    cache_data = cache.get_many(cache_keys)
+
+    to_query: dict[str, RequestQueryBody] = {}
+    to_revalidate: dict[str, RequestQueryBody] = {}
+    # Positions of the queries that have to be executed, by cache key.
+    positions: dict[str, list[int]] = {}
+    for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
+        cached_value = cache_data.get(cache_key)
+        if cached_value is None:
+            metrics.incr("snuba.query_cache.miss", tags=metric_tags)
+            to_query[cache_key] = query_params
+            positions.setdefault(cache_key, []).append(query_pos)
+            continue
+
+        cached_result, fresh_until = _decode_cached_result(cached_value)
+        if fresh_until < now:
+            metrics.incr("snuba.query_cache.stale", tags=metric_tags)
+            to_revalidate[cache_key] = query_params
+        else:
+            metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+        results.append((query_pos, cached_result))
+
+    if to_revalidate:
+        _revalidate_queries(to_revalidate, headers, policy)
+
+    if not to_query:
+        return results
+
+    coalesce = options.get("snuba.query-cache.coalesce-queries")
+    if coalesce:
+        owned, waiting = _inflight_queries.claim(list(to_query))
+    else:
+        owned, waiting = {cache_key: Future() for cache_key in to_query}, {}
+    claimed = list(owned)
+    futures = {**owned, **waiting}
+
+    executed: dict[str, Mapping[str, Any]] = {}
+    try:
+        lease_wait = options.get("snuba.query-cache.lease-wait-seconds")
+        leases: Collection[str] = ()
+        if owned and lease_wait > 0:
+            leases = _acquire_leases(owned, lease_wait)
+            # Give the processes that hold the other leases a chance to cache
+            # their results, and execute the queries ourselves if they don't.
+            cached = _wait_for_cached_results(owned.keys() - leases, lease_wait)
+            for cache_key, value in cached.items():
+                owned.pop(cache_key).set_result(value)
+            if cached:
+                metrics.incr(
+                    "snuba.query_cache.coalesced", amount=len(cached), tags={"scope": "cluster"}
+                )
+
+        if owned:
+            try:
+                executed = _execute_and_cache(
+                    {cache_key: to_query[cache_key] for cache_key in owned},
+                    owned,
+                    headers,
+                    policy,
+                )
+            finally:
+                _release_leases(leases)
+    finally:
+        for cache_key in claimed:
+            # Never leave coalesced callers waiting for a result that won't come.
+            if not futures[cache_key].done():
+                futures[cache_key].set_exception(SnubaError("Coalesced query was not executed"))
+        if coalesce:
+            _inflight_queries.release(claimed)
+
+    if waiting:
+        metrics.incr("snuba.query_cache.coalesced", amount=len(waiting), tags={"scope": "process"})
+
+    for cache_key, query_positions in positions.items():
+        if cache_key in executed:
+            results.append((query_positions[0], executed[cache_key]))
+            query_positions = query_positions[1:]
+        for query_pos in query_positions:
+            # Every caller decodes its own copy of a shared result.
+            results.append((query_pos, _decode_cached_result(futures[cache_key].result())[0]))
+
+    return results
+
+
 def _apply_cache_and_build_results(
     snuba_param_list: Sequence[RequestQueryBody],
     referrer: str | None = None,
@@ -931,35 +1434,18 @@ def _apply_cache_and_build_results(
     # Store the original position of the query so that we can maintain the order
     query_param_list = list(enumerate(snuba_param_list))
 
-    results = []
-
     if use_cache:
-        cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
-        cache_data = cache.get_many(cache_keys)
-        to_query: list[tuple[int, RequestQueryBody, str | None]] = []
-        for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
-            cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": referrer} if referrer else None
-            if cached_result is None:
-                metrics.incr("snuba.query_cache.miss", tags=metric_tags)
-                to_query.append((query_pos, query_params, cache_key))
-            else:
-                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
+        results = _query_with_cache(query_param_list, headers, referrer)
+    elif not query_param_list:
+        results = []
     else:
-        to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
-
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
-        for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
-            if opt_cache_key:
-                cache.set(
-                    opt_cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
-                )
-            results.append((query_pos, result))
+        query_results = _bulk_snuba_query([item[1] for item in query_param_list], headers)
+        results = [
+            (query_pos, result) for (query_pos, _), result in zip(query_param_list, query_results)
+        ]
 
     # Sort so that we get the results back in the original param list order
-    results.sort()
+    results.sort(key=lambda item: item[0])
     # Drop the sort order val
     return [result[1] for result in results]
 
@@ -1001,54 +1487,71 @@ def _bulk_snuba_query(
                 _snuba_query((snuba_param_list[0], Hub(Hub.current), headers, parent_api))
             ]
 
+    _record_pool_metrics()
+
     results = []
     for index, item in enumerate(query_results):
         response, _, reverse = item
-        try:
-            body = json.loads(response.data, skip_trace=True)
-            if SNUBA_INFO:
-                if "sql" in body:
-                    log_snuba_info(
-                        "{}.sql:\n {}".format(
-                            headers.get("referer", "<unknown>"),
-                            sqlparse.format(body["sql"], reindent_aligned=True),
-                        )
-                    )
-                if "error" in body:
-                    log_snuba_info(
-                        "{}.err: {}".format(headers.get("referer", "<unknown>"), body["error"])
-                    )
-        except ValueError:
-            if response.status != 200:
-                logger.exception("snuba.query.invalid-json", extra={"response.data": response.data})
-                raise SnubaError("Failed to parse snuba error response")
-            raise UnexpectedResponseError(f"Could not decode JSON response: {response.data!r}")
-
-        if response.status != 200:
-            _log_request_query(snuba_param_list[index][0])
-
-            if body.get("error"):
-                error = body["error"]
-                if response.status == 429:
-                    raise RateLimitExceeded(error["message"])
-                elif error["type"] == "schema":
-                    raise SchemaValidationError(error["message"])
-                elif error["type"] == "clickhouse":
-                    raise clickhouse_error_codes_map.get(error["code"], QueryExecutionError)(
-                        error["message"]
-                    )
-                else:
-                    raise SnubaError(error["message"])
-            else:
-                raise SnubaError(f"HTTP {response.status}")
+        body = _decode_response(response, snuba_param_list[index][0], headers)
 
         # Forward and reverse translation maps from model ids to snuba keys, per column
-        body["data"] = [reverse(d) for d in body["data"]]
+        if reverse is not _identity:
+            body["data"] = [reverse(d) for d in body["data"]]
         results.append(body)
 
     return results
 
 
+def _decode_response(
+    response: urllib3.response.HTTPResponse,
+    request: Request,
+    headers: Mapping[str, str],
+) -> dict[str, Any]:
+    """
+    Decodes the body of a Snuba response, raising the matching `SnubaError`
+    if the query failed.
+    """
+    try:
+        body = json.loads(response.data, skip_trace=True)
+        if SNUBA_INFO:
+            if "sql" in body:
+                log_snuba_info(
+                    "{}.sql:\n {}".format(
+                        headers.get("referer", "<unknown>"),
+                        sqlparse.format(body["sql"], reindent_aligned=True),
+                    )
+                )
+            if "error" in body:
+                log_snuba_info(
+                    "{}.err: {}".format(headers.get("referer", "<unknown>"), body["error"])
+                )
+    except ValueError:
+        if response.status != 200:
+            logger.exception("snuba.query.invalid-json", extra={"response.data": response.data})
+            raise SnubaError("Failed to parse snuba error response")
+        raise UnexpectedResponseError(f"Could not decode JSON response: {response.data!r}")
+
+    if response.status != 200:
+        _log_request_query(request)
+
+        if body.get("error"):
+            error = body["error"]
+            if response.status == 429:
+                raise RateLimitExceeded(error["message"])
+            elif error["type"] == "schema":
+                raise SchemaValidationError(error["message"])
+            elif error["type"] == "clickhouse":
+                raise clickhouse_error_codes_map.get(error["code"], QueryExecutionError)(
+                    error["message"]
+                )
+            else:
+                raise SnubaError(error["message"])
+        else:
+            raise SnubaError(f"HTTP {response.status}")
+
+    return body
+
+
 def _log_request_query(req: Request) -> None:
     """Given a request, logs its associated query in sentry breadcrumbs"""
     query_str = req.serialize()
@@ -1118,7 +1621,10 @@ def _raw_mql_query(
 
 
 def _raw_snql_query(
-    request: Request, thread_hub: Hub, headers: Mapping[str, str]
+    request: Request,
+    thread_hub: Hub,
+    headers: Mapping[str, str],
+    preload_content: bool = True,
 ) -> urllib3.response.HTTPResponse:
     # Enter hub such that http spans are properly nested
     with thread_hub, timer("snql_query"):
@@ -1131,7 +1637,11 @@ def _raw_snql_query(
         with thread_hub.start_span(op="snuba_snql.run", description=serialized_req) as span:
             span.set_tag("snuba.referrer", referrer)
             return _snuba_pool.urlopen(
-                "POST", f"/{request.dataset}/snql", body=body, headers=headers
+                "POST",
+                f"/{request.dataset}/snql",
+                body=body,
+                headers=headers,
+                preload_content=preload_content,
             )
 
 
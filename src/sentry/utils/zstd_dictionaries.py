@@ -0,0 +1,144 @@
+"""
+Trained zstd dictionaries for event payloads.
+
+Event payloads of the same platform share a lot of structure (SDK metadata,
+contexts, module lists) that does not compress well within a single payload.
+Dictionaries trained offline on sampled payloads (see `sentry
+zstd-dictionaries train`) capture that structure once.
+
+Dictionaries are stored as `zstd-dictionaries/<dict_id>.zdict` in the
+filestore, so that every process that reads payloads can load them. They are
+immutable: rotating a platform to a new dictionary means training a new one
+and pointing the `zstd-dictionaries.active` option at it. The id of the
+dictionary used is stored in the header of every zstd frame, so old payloads
+stay readable as long as their dictionary is kept around.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from collections.abc import Sequence
+from io import BytesIO
+
+import zstandard
+
+from sentry import options
+from sentry.utils import json, metrics
+from sentry.utils.codecs import Codec
+from sentry.utils.json import JSONData
+
+logger = logging.getLogger(__name__)
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+COMPRESSION_LEVEL = 3
+DEFAULT_DICTIONARY_SIZE = 112640
+
+# How long writers stop looking for an active dictionary that cannot be loaded.
+UNAVAILABLE_DICTIONARY_TTL = 60
+
+_unavailable_dictionaries: dict[int, float] = {}
+
+
+class DictionaryNotFound(Exception):
+    pass
+
+
+def get_dictionary_path(dict_id: int) -> str:
+    return f"zstd-dictionaries/{dict_id}.zdict"
+
+
+def _get_storage():
+    # Imported lazily, nodestore imports this module before models are ready.
+    from sentry.models.files.utils import get_storage
+
+    return get_storage()
+
+
+@functools.lru_cache(maxsize=64)
+def load_dictionary(dict_id: int) -> zstandard.ZstdCompressionDict:
+    storage = _get_storage()
+    path = get_dictionary_path(dict_id)
+    if not storage.exists(path):
+        raise DictionaryNotFound(f"zstd dictionary {dict_id} does not exist")
+
+    with storage.open(path) as f:
+        dictionary = zstandard.ZstdCompressionDict(f.read())
+    dictionary.precompute_compress(level=COMPRESSION_LEVEL)
+    return dictionary
+
+
+def get_active_dictionary(platform: str | None) -> zstandard.ZstdCompressionDict | None:
+    """
+    Returns the dictionary new payloads of `platform` should be compressed
+    with, if any.
+    """
+    if not platform:
+        return None
+
+    dict_id = options.get("zstd-dictionaries.active").get(platform)
+    if not dict_id:
+        return None
+    dict_id = int(dict_id)
+
+    if _unavailable_dictionaries.get(dict_id, 0) > time.monotonic():
+        return None
+
+    try:
+        return load_dictionary(dict_id)
+    except Exception:
+        # A dictionary that cannot be loaded must not stop payloads from being
+        # written, they just compress worse. Payloads are only ever written
+        # with a dictionary that was loaded, so readers can always load it too.
+        metrics.incr("zstd_dictionaries.unavailable", tags={"platform": platform})
+        logger.exception("zstd_dictionaries.unavailable", extra={"dict_id": dict_id})
+        _unavailable_dictionaries[dict_id] = time.monotonic() + UNAVAILABLE_DICTIONARY_TTL
+        return None
+
+
+def compress(value: bytes, platform: str | None = None) -> bytes:
+    dictionary = get_active_dictionary(platform)
+    if dictionary is None:
+        return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(value)
+    return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary).compress(value)
+
+
+def decompress(value: bytes | memoryview) -> bytes:
+    dict_id = zstandard.get_frame_parameters(value).dict_id
+    if not dict_id:
+        return zstandard.ZstdDecompressor().decompress(value)
+    return zstandard.ZstdDecompressor(dict_data=load_dictionary(dict_id)).decompress(value)
+
+
+def train_dictionary(
+    samples: Sequence[bytes], dict_size: int = DEFAULT_DICTIONARY_SIZE
+) -> zstandard.ZstdCompressionDict:
+    return zstandard.train_dictionary(dict_size, list(samples), level=COMPRESSION_LEVEL)
+
+
+def save_dictionary(dictionary: zstandard.ZstdCompressionDict) -> str:
+    storage = _get_storage()
+    path = get_dictionary_path(dictionary.dict_id())
+    # Dictionaries are immutable once written, payloads refer to them by id.
+    if storage.exists(path):
+        raise FileExistsError(path)
+    storage.save(path, BytesIO(dictionary.as_bytes()))
+    return path
+
+
+class EventPayloadCodec(Codec[JSONData, bytes]):
+    """
+    Encode/decode event payloads to/from JSON compressed with the active
+    dictionary of the event's platform.
+
+    Uncompressed JSON written before this codec was enabled is still decoded.
+    """
+
+    def encode(self, value: JSONData) -> bytes:
+        return compress(json.dumps(value).encode("utf8"), value.get("platform"))
+
+    def decode(self, value: bytes) -> JSONData:
+        if value.startswith(ZSTD_MAGIC):
+            value = decompress(value)
+        return json.loads(value, skip_trace=True)
@@ -119,6 +119,81 @@ class TestRedisBuffer:
         self.buf.process("foo")
         process.assert_called_once_with(Group, columns, filters, extra, signal_only)
 
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batch_keys_pipelined(self, process):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        for key, times_seen in (("foo", "1"), ("bar", "3")):
+            client.hmset(
+                key,
+                {"f": '{"pk": ["i","1"]}', "i+times_seen": times_seen, "m": "unittest.mock.Mock"},
+            )
+        # already held by another flush, so it has to be skipped
+        client.set("l:baz", "1")
+
+        self.buf.process(batch_keys=["foo", "bar", "baz"])
+
+        assert process.mock_calls == [
+            mock.call(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, None),
+            mock.call(mock.Mock, {"times_seen": 3}, {"pk": 1}, {}, None),
+        ]
+        assert not client.exists("foo")
+        assert not client.exists("bar")
+        assert not client.exists("l:foo")
+        assert not client.exists("l:bar")
+        assert client.exists("l:baz")
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batch_keys_failure(self, process):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        for key, times_seen in (("foo", "1"), ("bar", "3")):
+            client.hmset(
+                key,
+                {"f": '{"pk": ["i","1"]}', "i+times_seen": times_seen, "m": "unittest.mock.Mock"},
+            )
+        process.side_effect = [Exception("boom"), None]
+
+        self.buf.process(batch_keys=["foo", "bar"])
+
+        # The failed write of the first key does not lose the second one.
+        assert process.mock_calls == [
+            mock.call(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, None),
+            mock.call(mock.Mock, {"times_seen": 3}, {"pk": 1}, {}, None),
+        ]
+        assert not client.exists("l:foo")
+        assert not client.exists("l:bar")
+
+    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
+    @mock.patch("sentry.buffer.redis.process_incr", mock.Mock())
+    @mock.patch("sentry.buffer.redis.metrics")
+    def test_process_pending_reports_lag(self, metrics):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        now = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+        with freeze_time(now):
+            client.zadd("b:p", {"foo": now.timestamp() - 30, "bar": now.timestamp()})
+            self.buf.process_pending()
+
+        metrics.distribution.assert_any_call(
+            "buffer.pending-lag", 30.0, tags={"partition": "none"}, unit="second"
+        )
+        metrics.distribution.assert_any_call(
+            "buffer.pending-size.partition", 2, tags={"partition": "none"}
+        )
+
+    def test_incr_keeps_oldest_pending_time(self):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        filters = {"pk": 1}
+        key = self.buf._make_key(model, filters=filters)
+        now = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+
+        with freeze_time(now):
+            self.buf.incr(model, {"times_seen": 1}, filters)
+        with freeze_time(now + datetime.timedelta(seconds=30)):
+            self.buf.incr(model, {"times_seen": 1}, filters)
+
+        assert client.zscore("b:p", key) == now.timestamp()
+
     @django_db_all
     @freeze_time()
     def test_group_cache_updated(self, default_group, task_runner):
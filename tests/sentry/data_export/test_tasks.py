@@ -10,6 +10,7 @@ from sentry.models.files.file import File
 from sentry.search.events.constants import TIMEOUT_ERROR_MESSAGE
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.samples import load_data
 from sentry.utils.snuba import (
     DatasetSelectionError,
@@ -608,6 +609,32 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_streamed(self, emailer):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [self.project.id],
+                "field": ["environment", "count()"],
+                "sort": "-environment",
+                "query": "",
+            },
+        )
+        with override_options({"data-export.discover.stream-results": True}), self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        # Convert raw csv to list of line-strings
+        with de._get_file().getfile() as f:
+            header, raw1, raw2 = f.read().strip().split(b"\r\n")
+        assert header == b"environment,count"
+
+        assert raw1 == b"prod,2"
+        assert raw2 == b"dev,1"
+
+        assert emailer.called
+
 
 class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
     def setUp(self):
@@ -0,0 +1,52 @@
+from sentry.grouping.api import (
+    get_default_grouping_config_dict,
+    get_fingerprinting_config_for_project,
+    load_grouping_config,
+)
+from sentry.grouping.enhancer import Enhancements
+from sentry.testutils.cases import TestCase
+
+
+class LoadGroupingConfigTest(TestCase):
+    def test_loaded_configs_are_shared(self):
+        config_dict = get_default_grouping_config_dict()
+
+        config = load_grouping_config(config_dict)
+        assert load_grouping_config(dict(config_dict)) is config
+        assert config.id == config_dict["id"]
+
+    def test_distinct_enhancements(self):
+        config_dict = get_default_grouping_config_dict()
+        custom = {
+            "id": config_dict["id"],
+            "enhancements": Enhancements.from_config_string("function:foo -app").dumps(),
+        }
+
+        config = load_grouping_config(config_dict)
+        custom_config = load_grouping_config(custom)
+        assert custom_config is not config
+        assert len(custom_config.enhancements.rules) == 1
+        assert len(config.enhancements.rules) == 0
+
+    def test_strategies_sorted_by_score(self):
+        config = load_grouping_config(get_default_grouping_config_dict())
+        scores = [strategy.score or 0 for strategy in config.iter_strategies()]
+        assert scores == sorted(scores, reverse=True)
+
+
+class GetFingerprintingConfigForProjectTest(TestCase):
+    def test_rules_are_shared(self):
+        self.project.update_option(
+            "sentry:fingerprinting_rules", "error.type:DatabaseUnavailable -> database-unavailable"
+        )
+
+        rules = get_fingerprinting_config_for_project(self.project)
+        assert get_fingerprinting_config_for_project(self.project) is rules
+        assert len(rules.rules) == 1
+
+        self.project.update_option(
+            "sentry:fingerprinting_rules", "error.type:ConnectionError -> connection-error"
+        )
+        other_rules = get_fingerprinting_config_for_project(self.project)
+        assert other_rules is not rules
+        assert other_rules.rules[0].fingerprint == ["connection-error"]
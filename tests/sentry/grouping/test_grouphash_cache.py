@@ -0,0 +1,130 @@
+from unittest import mock
+
+from sentry.grouping.ingest import grouphash_cache
+from sentry.grouping.ingest.grouphash_cache import (
+    get_or_create_grouphashes,
+    invalidate_grouphash_cache,
+)
+from sentry.models.grouphash import GroupHash
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+
+
+@override_options(
+    {
+        "grouping.grouphash-cache.enabled": True,
+        "grouping.grouphash-cache.consistency-check-rate": 0.0,
+    }
+)
+class GrouphashCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        grouphash_cache._local_cache.clear()
+        self.group = self.create_group(project=self.project)
+        self.grouphash = GroupHash.objects.create(
+            project=self.project, group=self.group, hash="a" * 32
+        )
+
+    def test_creates_missing(self):
+        (grouphash,) = get_or_create_grouphashes(self.project, ["b" * 32])
+        assert grouphash.id == GroupHash.objects.get(project=self.project, hash="b" * 32).id
+        assert grouphash.group_id is None
+
+    def test_serves_settled_grouphashes_from_cache(self):
+        (grouphash,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert grouphash.id == self.grouphash.id
+
+        with self.assertNumQueries(0):
+            (cached,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert (cached.id, cached.group_id) == (self.grouphash.id, self.group.id)
+        assert cached.state is None
+        assert cached.group_tombstone_id is None
+
+        # Served from redis once the local tier is empty.
+        grouphash_cache._local_cache.clear()
+        with self.assertNumQueries(0):
+            (cached,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert cached.group_id == self.group.id
+
+    def test_does_not_cache_unsettled_grouphashes(self):
+        get_or_create_grouphashes(self.project, ["b" * 32])
+        GroupHash.objects.filter(hash="b" * 32).update(group=self.group)
+
+        (grouphash,) = get_or_create_grouphashes(self.project, ["b" * 32])
+        assert grouphash.group_id == self.group.id
+
+    def test_invalidate(self):
+        get_or_create_grouphashes(self.project, ["a" * 32])
+
+        new_group = self.create_group(project=self.project)
+        GroupHash.objects.filter(id=self.grouphash.id).update(group=new_group)
+        invalidate_grouphash_cache([self.project.id])
+
+        (grouphash,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert grouphash.group_id == new_group.id
+
+    def test_invalidate_after_version_expired(self):
+        invalidate_grouphash_cache([self.project.id])
+        get_or_create_grouphashes(self.project, ["a" * 32])
+
+        # The version key expires while the row written with it is still cached.
+        grouphash_cache._get_redis_client().delete(grouphash_cache._version_key(self.project.id))
+        new_group = self.create_group(project=self.project)
+        GroupHash.objects.filter(id=self.grouphash.id).update(group=new_group)
+        invalidate_grouphash_cache([self.project.id])
+
+        grouphash_cache._local_cache.clear()
+        (grouphash,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert grouphash.group_id == new_group.id
+
+    def test_invalidate_while_disabled(self):
+        get_or_create_grouphashes(self.project, ["a" * 32])
+
+        new_group = self.create_group(project=self.project)
+        GroupHash.objects.filter(id=self.grouphash.id).update(group=new_group)
+        with override_options({"grouping.grouphash-cache.enabled": False}):
+            invalidate_grouphash_cache([self.project.id])
+
+        (grouphash,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert grouphash.group_id == new_group.id
+
+    def test_invalidate_in_other_process(self):
+        get_or_create_grouphashes(self.project, ["a" * 32])
+        get_or_create_grouphashes(self.project, ["a" * 32])
+        assert (self.project.id, "a" * 32) in grouphash_cache._local_cache
+
+        # Lock the hash and change the version without touching the local tier of
+        # this process, as an invalidation in another process would.
+        GroupHash.objects.filter(id=self.grouphash.id).update(
+            state=GroupHash.State.LOCKED_IN_MIGRATION
+        )
+        grouphash_cache._get_redis_client().incr(grouphash_cache._version_key(self.project.id))
+
+        (grouphash,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert grouphash.state == GroupHash.State.LOCKED_IN_MIGRATION
+        assert (self.project.id, "a" * 32) not in grouphash_cache._local_cache
+
+    def test_consistency_check(self):
+        get_or_create_grouphashes(self.project, ["a" * 32])
+
+        # Move the hash without invalidating the cache.
+        new_group = self.create_group(project=self.project)
+        GroupHash.objects.filter(id=self.grouphash.id).update(group=new_group)
+
+        with (
+            override_options({"grouping.grouphash-cache.consistency-check-rate": 1.0}),
+            mock.patch("sentry.grouping.ingest.grouphash_cache.metrics.incr") as incr,
+        ):
+            (grouphash,) = get_or_create_grouphashes(self.project, ["a" * 32])
+
+        assert grouphash.group_id == new_group.id
+        incr.assert_any_call("grouping.grouphash_cache.inconsistent")
+
+        # The stale entry was dropped.
+        (grouphash,) = get_or_create_grouphashes(self.project, ["a" * 32])
+        assert grouphash.group_id == new_group.id
+
+    @override_options({"grouping.grouphash-cache.enabled": False})
+    def test_disabled(self):
+        get_or_create_grouphashes(self.project, ["a" * 32])
+        assert not grouphash_cache._local_cache
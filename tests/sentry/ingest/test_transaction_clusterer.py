@@ -74,6 +74,21 @@ def test_deep_tree():
     clusterer.get_rules()
 
 
+def test_merged_subtrees_are_combined():
+    clusterer = TreeClusterer(merge_threshold=2)
+    # /a/b0 is merged before /a is, which must merge /a/*/ as well
+    transaction_names = ["/a/b0/c0", "/a/b0/c1", "/a/b1/c"]
+    clusterer.add_input(transaction_names)
+    assert clusterer.get_rules() == ["/a/*/*/**", "/a/*/**"]
+
+
+def test_tree_size_is_bounded():
+    clusterer = TreeClusterer(merge_threshold=3)
+    clusterer.add_input(f"/users/{i}/posts/{j}" for i in range(100) for j in range(100))
+    assert len(list(clusterer._tree.paths())) == 5
+    assert clusterer.get_rules() == ["/users/*/posts/*/**", "/users/*/**"]
+
+
 def test_clusterer_doesnt_generate_invalid_rules():
     clusterer = TreeClusterer(merge_threshold=1)
     all_stars = ["/a/b", "/b/c", "/c/d"]
@@ -369,6 +384,23 @@ def test_clusterer_only_runs_when_enough_transactions(mock_update_rules, default
     )
 
 
+@mock.patch("sentry.ingest.transaction_clusterer.rules.update_rules")
+@django_db_all
+def test_clusterer_bumps_used_rules(mock_update_rules, default_project):
+    with freeze_time("2000-01-01 01:00:00"):
+        update_rules(
+            ClustererNamespace.TRANSACTIONS,
+            default_project,
+            [ReplacementRule("/users/*/**"), ReplacementRule("/teams/*/**")],
+        )
+
+    _record_sample(ClustererNamespace.TRANSACTIONS, default_project, "/users/*/settings")
+    cluster_projects([default_project])
+    assert mock_update_rules.call_args == mock.call(
+        ClustererNamespace.TRANSACTIONS, default_project, ["/users/*/**"]
+    )
+
+
 @django_db_all
 def test_get_deleted_project():
     deleted_project = Project(pk=666, organization=Organization(pk=666))
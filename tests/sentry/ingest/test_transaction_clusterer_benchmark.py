@@ -0,0 +1,47 @@
+"""
+Measures clustering a large synthetic corpus of transaction names, far larger
+than the samples currently collected per project.
+
+Run with `pytest tests/sentry/ingest/test_transaction_clusterer_benchmark.py --benchmark-only`.
+"""
+
+import random
+
+from sentry.ingest.transaction_clusterer.tree import TreeClusterer
+from sentry.testutils.skips import requires_benchmark
+
+#: Number of transaction names in the corpus
+CORPUS_SIZE = 200_000
+
+MERGE_THRESHOLD = 200
+
+
+def make_corpus(size: int = CORPUS_SIZE) -> list[str]:
+    rng = random.Random(0)
+    resources = ["users", "organizations", "teams", "projects", "releases"]
+    actions = ["settings", "members", "posts", "stats", "details"]
+    corpus = []
+    for _ in range(size):
+        parts = ["", "api", "0", rng.choice(resources), f"{rng.getrandbits(48):x}"]
+        if rng.random() < 0.8:
+            parts += [rng.choice(actions), str(rng.getrandbits(32))]
+        corpus.append("/".join(parts) + "/")
+    return corpus
+
+
+def cluster(corpus: list[str]) -> list[str]:
+    clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
+    clusterer.add_input(corpus)
+    return clusterer.get_rules()
+
+
+def test_tree_clusterer():
+    rules = cluster(make_corpus(CORPUS_SIZE // 10))
+    assert "/api/0/users/*/settings/*/**" in rules
+
+
+@requires_benchmark
+def test_benchmark_tree_clusterer(benchmark):
+    corpus = make_corpus()
+    rules = benchmark(cluster, corpus)
+    assert "/api/0/users/*/settings/*/**" in rules
@@ -0,0 +1,37 @@
+from sentry.ingest.transaction_clusterer.base import ReplacementRule
+from sentry.ingest.transaction_clusterer.matcher import RuleMatcher, get_rule_matcher
+
+
+def make_matcher(*rules: str) -> RuleMatcher:
+    return RuleMatcher([ReplacementRule(rule) for rule in rules])
+
+
+def test_match_segments():
+    matcher = make_matcher("/users/*/posts/*/**", "/users/*/**")
+    assert matcher.match("/users/1/posts/2") == "/users/*/posts/*/**"
+    assert matcher.match("/users/1/posts/2/comments/") == "/users/*/posts/*/**"
+    assert matcher.match("/users/1/posts") == "/users/*/**"
+    assert matcher.match("/users/1") == "/users/*/**"
+    assert matcher.match("/users/") is None
+    assert matcher.match("/teams/1") is None
+
+
+def test_first_rule_wins():
+    assert make_matcher("/a/*/**", "/*/b/**").match("/a/b") == "/a/*/**"
+    assert make_matcher("/*/b/**", "/a/*/**").match("/a/b") == "/*/b/**"
+
+
+def test_star_within_segment():
+    matcher = make_matcher("/files/*.js/**")
+    assert matcher.match("/files/app.js") == "/files/*.js/**"
+    assert matcher.match("/files/app.css") is None
+
+
+def test_sanitized_names_match():
+    assert make_matcher("/users/*/**").match("/users/*/settings") == "/users/*/**"
+
+
+def test_matchers_are_cached():
+    rules = [ReplacementRule("/a/*/**"), ReplacementRule("/b/*/**")]
+    assert get_rule_matcher(rules) is get_rule_matcher(list(rules))
+    assert get_rule_matcher(rules) is not get_rule_matcher(rules[:1])
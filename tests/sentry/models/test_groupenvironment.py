@@ -0,0 +1,33 @@
+from sentry.models.environment import Environment
+from sentry.models.groupenvironment import GroupEnvironment
+from sentry.testutils.cases import TestCase
+
+
+class GetOrCreateManyTest(TestCase):
+    def test_simple(self):
+        project = self.create_project()
+        group = self.create_group(project=project)
+        other_group = self.create_group(project=project)
+        env = Environment.objects.create(organization_id=project.organization_id, name="prod")
+        release = self.create_release(project=project)
+
+        existing, created = GroupEnvironment.get_or_create(group_id=group.id, environment_id=env.id)
+        assert created
+
+        results = GroupEnvironment.get_or_create_many(
+            [(group.id, env.id), (other_group.id, env.id), (group.id, env.id)],
+            defaults={(other_group.id, env.id): {"first_release": release}},
+        )
+
+        assert len(results) == 2
+        assert results[(group.id, env.id)] == (existing, False)
+        instance, created = results[(other_group.id, env.id)]
+        assert created
+        assert instance.first_release_id == release.id
+
+        # everything is cached or in the database now
+        results = GroupEnvironment.get_or_create_many([(other_group.id, env.id)])
+        assert results[(other_group.id, env.id)] == (instance, False)
+
+    def test_empty(self):
+        assert GroupEnvironment.get_or_create_many([]) == {}
@@ -46,3 +46,39 @@ class GetOrCreateTest(TestCase):
 
         assert grouprelease.first_seen == datetime
         assert grouprelease.last_seen == datetime_new
+
+
+class GetOrCreateManyTest(TestCase):
+    def test_simple(self):
+        project = self.create_project()
+        group = self.create_group(project=project)
+        other_group = self.create_group(project=project)
+        release = Release.objects.create(version="abc", organization_id=project.organization_id)
+        release.add_project(project)
+        env = Environment.objects.create(organization_id=project.organization_id, name="prod")
+        datetime = timezone.now()
+
+        existing = GroupRelease.get_or_create(
+            group=group, release=release, environment=env, datetime=datetime
+        )
+
+        datetime_new = datetime + timedelta(days=1)
+        group_releases = GroupRelease.get_or_create_many(
+            [
+                (group, release, env, datetime_new),
+                (other_group, release, env, datetime),
+                (group, release, env, datetime),
+            ]
+        )
+
+        assert len(group_releases) == 3
+        assert group_releases[0].id == existing.id
+        assert group_releases[0].last_seen == datetime_new
+        assert group_releases[2].id == existing.id
+        assert group_releases[1].group_id == other_group.id
+        assert group_releases[1].first_seen == datetime
+        assert group_releases[1].last_seen == datetime
+        assert GroupRelease.objects.filter(release_id=release.id).count() == 2
+
+    def test_empty(self):
+        assert GroupRelease.get_or_create_many([]) == []
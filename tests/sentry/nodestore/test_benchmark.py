@@ -0,0 +1,84 @@
+"""
+Compares the line-based nodestore encoding with the subkey-addressable one
+(`nodestore.encode-sections`) when reading a single subkey, which is what
+post-processing and reprocessing do with `unprocessed` payloads.
+
+Run with `pytest tests/sentry/nodestore/test_benchmark.py --benchmark-only`.
+"""
+
+import zlib
+from collections.abc import Callable
+
+import pytest
+
+from sentry.nodestore.base import NodeStorage
+from sentry.testutils.helpers import override_options
+from sentry.testutils.skips import requires_benchmark
+
+
+def make_event(size: int) -> dict:
+    return {
+        "event_id": "a" * 32,
+        "platform": "python",
+        "exception": {
+            "values": [
+                {
+                    "type": "ValueError",
+                    "value": f"invalid value {i}",
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "filename": f"src/module_{j}.py",
+                                "function": f"function_{j}",
+                                "lineno": j,
+                                "context_line": f"    do_something({i}, {j})",
+                                "vars": {"i": i, "j": j, "name": f"value_{i}_{j}"},
+                            }
+                            for j in range(50)
+                        ]
+                    },
+                }
+                for i in range(size)
+            ]
+        },
+    }
+
+
+SUBKEYS = ["unprocessed", "reprocessing"]
+
+
+def encode(encode_sections: bool, size: int) -> bytes:
+    data: dict = {None: make_event(size)}
+    for subkey in SUBKEYS:
+        data[subkey] = make_event(size)
+    with override_options({"nodestore.encode-sections": encode_sections}):
+        return NodeStorage()._encode(data)
+
+
+def make_get_subkey(encode_sections: bool, size: int) -> tuple[bytes, Callable[[], dict]]:
+    ns = NodeStorage()
+    encoded = encode(encode_sections, size)
+    # Line-based payloads are only ever stored compressed as a whole by the
+    # backends, while sections are already compressed individually.
+    stored = encoded if encode_sections else zlib.compress(encoded)
+
+    def get_subkey():
+        value = stored if encode_sections else zlib.decompress(stored)
+        return ns._decode(value, subkey="unprocessed")
+
+    return stored, get_subkey
+
+
+@pytest.mark.parametrize("encode_sections", [False, True], ids=["lines", "sections"])
+def test_get_subkey(encode_sections):
+    _, get_subkey = make_get_subkey(encode_sections, 1)
+    assert get_subkey() == make_event(1)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("size", [1, 20], ids=["small", "large"])
+@pytest.mark.parametrize("encode_sections", [False, True], ids=["lines", "sections"])
+def test_benchmark_get_subkey(encode_sections, size, benchmark):
+    stored, get_subkey = make_get_subkey(encode_sections, size)
+    benchmark.extra_info["stored_bytes"] = len(stored)
+    assert benchmark(get_subkey) == make_event(size)
@@ -3,10 +3,13 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 `ns` fixture to have it tested.
 """
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
 
+from sentry.nodestore.base import SECTIONS_MAGIC
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.local_cache import local_node_cache
 from sentry.testutils.helpers import override_options
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
@@ -97,3 +100,48 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.local-cache.max-bytes": 1024 * 1024,
+    }
+)
+def test_local_cache(ns):
+    local_node_cache.clear()
+
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    assert ns.get("node_1") == {"foo": "a"}
+    assert "node_1" in local_node_cache._entries
+
+    # served from the local cache, decoding only the requested subkey
+    with mock.patch.object(ns, "_get_bytes", side_effect=AssertionError):
+        assert ns.get("node_1", subkey="other") == {"foo": "b"}
+        assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a"}}
+
+    ns.set("node_1", {"foo": "c"})
+    assert "node_1" not in local_node_cache._entries
+    assert ns.get("node_1") == {"foo": "c"}
+
+    ns.delete_multi(["node_1"])
+    assert "node_1" not in local_node_cache._entries
+    assert ns.get("node_1") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_subkeys_sections_encoding(ns):
+    with override_options({"nodestore.encode-sections": True}):
+        ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+        assert ns.get_bytes("node_1").startswith(SECTIONS_MAGIC)
+
+    # readers don't depend on the option
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+
+    # payloads in the previous format remain readable
+    ns.set_subkeys("node_2", {None: {"foo": "c"}, "other": {"foo": "d"}})
+    assert not ns.get_bytes("node_2").startswith(SECTIONS_MAGIC)
+    assert ns.get("node_2", subkey="other") == {"foo": "d"}
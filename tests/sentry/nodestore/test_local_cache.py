@@ -0,0 +1,61 @@
+from unittest import mock
+
+from sentry.nodestore.local_cache import LocalNodeCache
+
+
+def test_get_set():
+    cache = LocalNodeCache()
+    assert cache.get("a") is None
+
+    cache.set("a", b"12345", max_bytes=100, ttl=10)
+    assert cache.get("a") == b"12345"
+    assert cache.size == 5
+
+    cache.set("a", b"123", max_bytes=100, ttl=10)
+    assert cache.get("a") == b"123"
+    assert cache.size == 3
+
+
+def test_evicts_least_recently_used():
+    cache = LocalNodeCache()
+    cache.set("a", b"a" * 4, max_bytes=10, ttl=10)
+    cache.set("b", b"b" * 4, max_bytes=10, ttl=10)
+    # touch "a" so "b" becomes the eviction candidate
+    assert cache.get("a") is not None
+
+    cache.set("c", b"c" * 4, max_bytes=10, ttl=10)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size == 8
+
+
+def test_skips_oversized_values():
+    cache = LocalNodeCache()
+    cache.set("a", b"a" * 4, max_bytes=10, ttl=10)
+    cache.set("a", b"a" * 11, max_bytes=10, ttl=10)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_ttl():
+    cache = LocalNodeCache()
+    with mock.patch("sentry.nodestore.local_cache.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        cache.set("a", b"a", max_bytes=10, ttl=10)
+        monotonic.return_value = 109.0
+        assert cache.get("a") == b"a"
+        monotonic.return_value = 111.0
+        assert cache.get("a") is None
+        assert cache.size == 0
+
+
+def test_delete_many():
+    cache = LocalNodeCache()
+    cache.set("a", b"a", max_bytes=10, ttl=10)
+    cache.set("b", b"b", max_bytes=10, ttl=10)
+    cache.delete_many(["a", "c"])
+    assert cache.get("a") is None
+    assert cache.get("b") == b"b"
+    assert cache.size == 1
@@ -0,0 +1,48 @@
+"""
+Compares doing several rate limit checks one by one with doing them in a
+single `is_limited_many` call, which is what the member invite rate limits do.
+
+Run with `pytest tests/sentry/ratelimits/test_benchmark.py --benchmark-only`.
+"""
+
+from sentry.ratelimits.base import RateLimitCheck
+from sentry.ratelimits.redis import RedisRateLimiter
+from sentry.testutils.skips import requires_benchmark
+
+
+CHECKS = [
+    RateLimitCheck("user:default:GET:1", limit=1000, window=60),
+    RateLimitCheck("org:default:GET:1", limit=1000, window=60),
+    RateLimitCheck("ip:default:GET:127.0.0.1", limit=1000, window=60),
+]
+
+
+def check_sequential(limiter: RedisRateLimiter, checks: list[RateLimitCheck]):
+    return [
+        limiter.is_limited_with_value(c.key, c.limit, project=c.project, window=c.window)
+        for c in checks
+    ]
+
+
+def test_is_limited_many():
+    limiter = RedisRateLimiter()
+    checks = [
+        RateLimitCheck(f"{check.key}:test_is_limited_many", limit=1, window=60)
+        for check in CHECKS
+    ]
+
+    # Both ways count against the same limits.
+    assert [limited for limited, _, _ in limiter.is_limited_many(checks)] == [False] * 3
+    assert [limited for limited, _, _ in check_sequential(limiter, checks)] == [True] * 3
+
+
+@requires_benchmark
+def test_benchmark_is_limited_sequential(benchmark):
+    limiter = RedisRateLimiter()
+    benchmark(check_sequential, limiter, CHECKS)
+
+
+@requires_benchmark
+def test_benchmark_is_limited_many(benchmark):
+    limiter = RedisRateLimiter()
+    benchmark(limiter.is_limited_many, CHECKS)
@@ -1,4 +1,5 @@
 from collections.abc import Collection, Sequence
+from unittest import mock
 
 import pytest
 
@@ -8,11 +9,12 @@ from sentry.ratelimits.cardinality import (
     RedisCardinalityLimiter,
     RequestedQuota,
 )
+from sentry.testutils.helpers.options import override_options
 
 
-@pytest.fixture
-def limiter():
-    return RedisCardinalityLimiter()
+@pytest.fixture(params=[0, 1000], ids=["remote", "local_cache"])
+def limiter(request):
+    return RedisCardinalityLimiter(local_cache_size=request.param)
 
 
 class LimiterHelper:
@@ -227,3 +229,38 @@ def test_regression_mixed_order(limiter: RedisCardinalityLimiter):
     # there used to be a bug where anything after 10 (i.e. 5) was dropped as
     # well (due to a wrong `break` somewhere in a loop)
     assert helper.add_values([0, 1, 2, 3, 4, 6, 7, 8, 9, 10, 5]) == [0, 1, 2, 3, 4, 6, 7, 8, 9, 5]
+
+
+def test_local_cache() -> None:
+    limiter = RedisCardinalityLimiter(local_cache_size=1000)
+    helper = LimiterHelper(limiter)
+
+    with mock.patch.object(
+        limiter.impl, "check_within_quotas", wraps=limiter.impl.check_within_quotas
+    ) as check_within_quotas:
+        assert helper.add_values([1, 2]) == [1, 2]
+        assert check_within_quotas.call_count == 1
+
+        # Both hashes are known to be admitted, redis is not asked again.
+        assert helper.add_values([1, 2]) == [1, 2]
+        assert check_within_quotas.call_count == 1
+
+        # Only the unknown hash is checked in redis.
+        assert helper.add_values([2, 3]) == [2, 3]
+        assert check_within_quotas.call_count == 2
+        ((requests, _), _) = check_within_quotas.call_args
+        assert [request.unit_hashes for request in requests] == [[3]]
+
+        # Once redis stops counting the hash for the window, it has to be checked again.
+        helper.timestamp += helper.quota.window_seconds
+        assert helper.add_values([1]) == [1]
+        assert check_within_quotas.call_count == 3
+
+
+def test_local_cache_size_option() -> None:
+    assert RedisCardinalityLimiter()._admitted_hashes is None
+
+    with override_options({"sentry-metrics.cardinality-limiter.local-cache-size": 1000}):
+        limiter = RedisCardinalityLimiter()
+    assert limiter._admitted_hashes is not None
+    assert limiter._admitted_hashes.maxsize == 1000
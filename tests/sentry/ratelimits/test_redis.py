@@ -1,5 +1,6 @@
 from time import time
 
+from sentry.ratelimits.base import RateLimitCheck
 from sentry.ratelimits.redis import RedisRateLimiter
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import freeze_time
@@ -64,3 +65,26 @@ class RedisRateLimiterTest(TestCase):
             assert not limited
             assert value == 1
             assert reset_time == expected_reset_time + 5
+
+    def test_is_limited_many(self):
+        with freeze_time("2000-01-01"):
+            expected_reset_time = int(time() + 5)
+            self.backend.is_limited("foo", 1, window=5)
+
+            results = self.backend.is_limited_many(
+                [
+                    RateLimitCheck("foo", 1, window=5),
+                    RateLimitCheck("foo", 1, project=self.project, window=5),
+                    RateLimitCheck("bar", 10),
+                ]
+            )
+            assert results == [
+                (True, 2, expected_reset_time),
+                (False, 1, expected_reset_time),
+                (False, 1, int(time() + 60)),
+            ]
+            assert self.backend.current_value("foo", window=5) == 2
+            assert self.backend.current_value("bar") == 1
+
+    def test_is_limited_many_empty(self):
+        assert self.backend.is_limited_many([]) == []
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from sentry.ratelimits.sliding_windows import (
@@ -71,3 +73,63 @@ def test_basic(limiter):
         )
 
         assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_leases():
+    limiter = RedisSlidingWindowRateLimiter(lease_fraction=0.5)
+    quotas = [Quota(window_seconds=10, granularity_seconds=10, limit=10)]
+    request = RequestedQuota(prefix="foo", requested=1, quotas=quotas)
+
+    with mock.patch.object(
+        limiter.impl, "check_within_quotas", wraps=limiter.impl.check_within_quotas
+    ) as check_within_quotas:
+        for _ in range(10):
+            resp = limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET)
+            assert resp == [GrantedQuota(prefix="foo", granted=1, reached_quotas=[])]
+
+        resp = limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET)
+        assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+        # Leases of 6 (one requested + five leased ahead), and then of the 4
+        # that are left.
+        assert check_within_quotas.call_count == 3
+
+    # Leases do not outlive their granule.
+    resp = limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET + 10)
+    assert resp == [GrantedQuota(prefix="foo", granted=1, reached_quotas=[])]
+
+
+def test_leases_do_not_exceed_limit():
+    limiters = [RedisSlidingWindowRateLimiter(lease_fraction=0.3) for _ in range(3)]
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10, prefix_override="bar")]
+
+    granted = 0
+    for _ in range(10):
+        for limiter in limiters:
+            (grant,) = limiter.check_and_use_quotas(
+                [RequestedQuota(prefix="foo", requested=1, quotas=quotas)],
+                timestamp=TIMESTAMP_OFFSET,
+            )
+            granted += grant.granted
+
+    # Leases of 4 (one requested + three leased ahead) for the first two
+    # processes, and the 2 that are left for the third one.
+    assert granted == 10
+
+
+def test_leases_are_returned():
+    limiter = RedisSlidingWindowRateLimiter(lease_fraction=0.5)
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+    request = RequestedQuota(prefix="foo", requested=1, quotas=quotas)
+
+    for timestamp in range(2):
+        resp = limiter.check_and_use_quotas([request], timestamp=TIMESTAMP_OFFSET + timestamp)
+        assert resp == [GrantedQuota(prefix="foo", granted=1, reached_quotas=[])]
+
+    # The 5 left over from the first granule have been returned, only the 2
+    # used and the 5 leased in the second granule count against the limit.
+    _, (grant,) = limiter.impl.check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)],
+        timestamp=TIMESTAMP_OFFSET + 1,
+    )
+    assert grant.granted == 3
@@ -5,7 +5,7 @@ from unittest import TestCase
 
 from django.conf import settings
 
-from sentry.ratelimits import above_rate_limit_check, finish_request
+from sentry.ratelimits import above_rate_limit_check, above_rate_limit_check_many, finish_request
 from sentry.ratelimits.config import RateLimitConfig
 from sentry.testutils.helpers.datetime import freeze_time
 from sentry.types.ratelimit import RateLimit, RateLimitMeta, RateLimitType
@@ -93,3 +93,24 @@ class RatelimitMiddlewareTest(TestCase):
         )
         assert return_val.rate_limit_type == RateLimitType.FIXED_WINDOW
         assert return_val.concurrent_remaining is None
+
+    def test_above_rate_limit_check_many(self):
+        with freeze_time("2000-01-01"):
+            above_rate_limit_check("baz", RateLimit(limit=1, window=100), "request_uid", self.group)
+
+            user_meta, org_meta = above_rate_limit_check_many(
+                [
+                    ("baz", RateLimit(limit=1, window=100)),
+                    ("qux", RateLimit(limit=5, window=10, concurrent_limit=3)),
+                ],
+                "request_uid2",
+                self.group,
+            )
+
+        assert user_meta.rate_limit_type == RateLimitType.FIXED_WINDOW
+        assert user_meta.current == 2
+        assert user_meta.concurrent_requests is None
+        assert org_meta.rate_limit_type == RateLimitType.NOT_LIMITED
+        assert org_meta.current == 1
+        assert org_meta.remaining == 4
+        assert org_meta.concurrent_requests == 1
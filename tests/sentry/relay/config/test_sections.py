@@ -0,0 +1,106 @@
+from unittest import mock
+
+from sentry.relay.config import get_project_config
+from sentry.relay.config.sections import ProjectConfigSections, invalidate_cached_sections
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.silo import region_silo_test
+
+FILTER_SETTINGS = {"webCrawlers": {"isEnabled": True}}
+
+
+def _get_config(project, reuse_cached):
+    sections = ProjectConfigSections(project, reuse_cached=reuse_cached)
+    return get_project_config(project, sections=sections).to_dict()
+
+
+@django_db_all
+@region_silo_test
+def test_sections_are_shared_by_configs(default_project):
+    sections = ProjectConfigSections(default_project)
+    with mock.patch(
+        "sentry.relay.config.get_filter_settings", return_value=FILTER_SETTINGS
+    ) as get_filter_settings:
+        first = get_project_config(default_project, sections=sections).to_dict()
+        second = get_project_config(default_project, sections=sections).to_dict()
+
+    assert get_filter_settings.call_count == 1
+    assert first["config"]["filterSettings"] == second["config"]["filterSettings"]
+
+
+@django_db_all
+@region_silo_test
+@override_options({"relay.project-config-sections.cache": True})
+def test_cached_sections_are_reused(default_project, django_cache):
+    with mock.patch(
+        "sentry.relay.config.get_filter_settings", return_value=FILTER_SETTINGS
+    ) as get_filter_settings:
+        _get_config(default_project, reuse_cached=False)
+        assert get_filter_settings.call_count == 1
+
+        config = _get_config(default_project, reuse_cached=True)
+        assert get_filter_settings.call_count == 1
+        assert config["config"]["filterSettings"] == FILTER_SETTINGS
+
+        _get_config(default_project, reuse_cached=False)
+        assert get_filter_settings.call_count == 2
+
+
+@django_db_all
+@region_silo_test
+@override_options({"relay.project-config-sections.cache": True})
+def test_uncached_sections_are_recomputed(default_project, django_cache):
+    with mock.patch(
+        "sentry.relay.config.get_dynamic_sampling_config", return_value={"version": 2, "rules": []}
+    ) as get_dynamic_sampling_config:
+        _get_config(default_project, reuse_cached=False)
+        _get_config(default_project, reuse_cached=True)
+
+    assert get_dynamic_sampling_config.call_count == 2
+
+
+@django_db_all
+@region_silo_test
+@override_options({"relay.project-config-sections.cache": True})
+def test_invalidation_drops_cached_sections(default_project, django_cache):
+    with mock.patch(
+        "sentry.relay.config.get_filter_settings", return_value=FILTER_SETTINGS
+    ) as get_filter_settings:
+        _get_config(default_project, reuse_cached=False)
+
+        invalidate_cached_sections(
+            "dynamic_sampling_boost_low_volume_projects",
+            organization_id=default_project.organization_id,
+        )
+        _get_config(default_project, reuse_cached=True)
+        assert get_filter_settings.call_count == 1
+
+        invalidate_cached_sections("projectoption.updated", project_id=default_project.id)
+        _get_config(default_project, reuse_cached=True)
+        assert get_filter_settings.call_count == 2
+
+        invalidate_cached_sections("invalidated", organization_id=default_project.organization_id)
+        _get_config(default_project, reuse_cached=True)
+        assert get_filter_settings.call_count == 3
+
+
+@django_db_all
+@region_silo_test
+@override_options({"relay.project-config-sections.cache": True})
+def test_failed_experimental_configs_are_not_cached(default_project, django_cache):
+    with (
+        mock.patch("sentry.relay.config.get_clusterer_meta", return_value={"runs": 10}),
+        mock.patch(
+            "sentry.relay.config.get_transaction_names_config", side_effect=Exception
+        ) as get_transaction_names_config,
+    ):
+        config = _get_config(default_project, reuse_cached=False)
+        assert config["config"]["txNameReady"] is True
+        assert "txNameRules" not in config["config"]
+
+        get_transaction_names_config.side_effect = None
+        get_transaction_names_config.return_value = []
+        config = _get_config(default_project, reuse_cached=True)
+
+    assert get_transaction_names_config.call_count == 2
+    assert config["config"]["txNameRules"] == []
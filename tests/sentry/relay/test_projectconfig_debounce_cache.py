@@ -76,3 +76,14 @@ def test_custom_prefix():
     redis = cache._get_redis_client(expected_key)
 
     assert redis.get(expected_key) == b"1"
+
+
+def test_count_scheduled():
+    cache = RedisProjectConfigDebounceCache(key_prefix="test_count_scheduled")
+
+    assert cache.count_scheduled(organization_id=1, window=60) == 1
+    assert cache.count_scheduled(organization_id=1, window=60) == 2
+    assert cache.count_scheduled(organization_id=2, window=60) == 1
+
+    key = "test_count_scheduled:c:1"
+    assert 0 < cache._get_redis_client(key).ttl(key) <= 60
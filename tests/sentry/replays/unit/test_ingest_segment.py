@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from sentry.replays.usecases.ingest.segment import parse_indexed_events
+from sentry.utils import json
+
+FULL_SNAPSHOT = {
+    "type": 2,
+    "data": {
+        "node": {
+            "type": 0,
+            "childNodes": [{"type": 3, "textContent": 'a "]}[{" b', "id": 2}],
+            "id": 1,
+        },
+        "initialOffset": {"left": 0, "top": 0},
+    },
+    "timestamp": 1,
+}
+MUTATION = {"type": 3, "data": {"source": 0, "adds": [], "removes": []}, "timestamp": 2}
+CANVAS_MUTATION = {"type": 3, "data": {"source": 9, "id": 5, "commands": []}, "timestamp": 3}
+BREADCRUMB = {
+    "type": 5,
+    "data": {"tag": "breadcrumb", "payload": {"category": "ui.click"}},
+    "timestamp": 4,
+}
+OPTIONS = {"type": 5, "data": {"tag": "options", "payload": {}}, "timestamp": 5}
+META = {"type": 4, "data": {"href": "http://localhost/"}, "timestamp": 6}
+
+
+def test_parse_indexed_events():
+    segment = [META, FULL_SNAPSHOT, BREADCRUMB, MUTATION, CANVAS_MUTATION, OPTIONS]
+    assert parse_indexed_events(json.dumps(segment).encode()) == [
+        BREADCRUMB,
+        CANVAS_MUTATION,
+        OPTIONS,
+    ]
+
+
+def test_parse_indexed_events_unordered_keys():
+    breadcrumb = {"timestamp": 4, "data": BREADCRUMB["data"], "type": 5}
+    canvas_mutation = {"data": {"id": 5, "source": 9}, "timestamp": 3, "type": 3}
+    mutation = {"timestamp": 2, "type": 3, "data": {"adds": [], "source": 0}}
+    segment = [breadcrumb, mutation, canvas_mutation, [], "event", None]
+
+    assert parse_indexed_events(json.dumps(segment).encode()) == [breadcrumb, canvas_mutation]
+
+
+def test_parse_indexed_events_whitespace():
+    segment = b' [ {"type": 2, "data": {}} ,\n{"type": 5, "data": {"tag": "options"}} ]\n'
+    assert parse_indexed_events(segment) == [{"type": 5, "data": {"tag": "options"}}]
+    assert parse_indexed_events(b"[ ]") == []
+
+
+@pytest.mark.parametrize("segment", [b"{}", b"", b'[{"type": 2}', b'[{"type": 2} {"type": 5}]'])
+def test_parse_indexed_events_invalid(segment):
+    with pytest.raises(ValueError):
+        parse_indexed_events(segment)
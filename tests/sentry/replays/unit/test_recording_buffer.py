@@ -1,4 +1,5 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
@@ -145,3 +146,32 @@ def test_commit_uploads_failure(_do_upload):
 
     with pytest.raises(BufferCommitFailed):
         commit_uploads([{}])  # type: ignore[typeddict-item]
+
+
+@patch("sentry.replays.consumers.recording_buffered._do_upload")
+def test_commit_uploads_shared_pool(_do_upload):
+    """Assert uploads run on the shared pool and are complete once committed."""
+    uploaded = []
+    _do_upload.side_effect = lambda u: uploaded.append(u)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        commit_uploads([{}, {}, {}], pool)  # type: ignore[typeddict-item]
+        assert len(uploaded) == 3
+
+        # The pool outlives the commit and is reused by the next one.
+        commit_uploads([{}], pool)  # type: ignore[typeddict-item]
+        assert len(uploaded) == 4
+
+
+@patch("sentry.replays.consumers.recording_buffered._do_upload")
+def test_commit_uploads_shared_pool_failure(_do_upload):
+    """Assert _do_upload failure on the shared pool rate limits the consumer process."""
+
+    def mocked(u):
+        raise ValueError("")
+
+    _do_upload.side_effect = mocked
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        with pytest.raises(BufferCommitFailed):
+            commit_uploads([{}, {}], pool)  # type: ignore[typeddict-item]
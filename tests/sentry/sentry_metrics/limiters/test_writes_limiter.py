@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from sentry.sentry_metrics.configuration import (
     PERFORMANCE_PG_NAMESPACE,
@@ -6,7 +6,7 @@ from sentry.sentry_metrics.configuration import (
     UseCaseKey,
 )
 from sentry.sentry_metrics.indexer.base import UseCaseKeyCollection
-from sentry.sentry_metrics.indexer.limiters.writes import WritesLimiter
+from sentry.sentry_metrics.indexer.limiters.writes import WritesLimiter, WritesLimiterFactory
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 
@@ -328,3 +328,18 @@ def test_writes_limiter_respects_use_case_id():
 
         with writes_limiter_rh.check_write_limits(use_case_keys) as state:
             assert len(state.dropped_strings) == 24
+
+
+def test_writes_limiter_factory_lease_fraction():
+    factory = WritesLimiterFactory()
+    config = Mock(
+        writes_limiter_namespace=PERFORMANCE_PG_NAMESPACE, writes_limiter_cluster_options={}
+    )
+
+    with override_options({"sentry-metrics.writes-limiter.lease-fraction": 0.1}):
+        writes_limiter = factory.get_ratelimiter(config)
+    assert writes_limiter.rate_limiter.lease_fraction == 0.1
+
+    # The option is read once, when the limiter is created.
+    assert factory.get_ratelimiter(config) is writes_limiter
+    assert writes_limiter.rate_limiter.lease_fraction == 0.1
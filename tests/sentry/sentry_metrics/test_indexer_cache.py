@@ -1,10 +1,11 @@
 from datetime import timedelta
+from unittest import mock
 
 import pytest
 from django.conf import settings
 from django.utils import timezone
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import LocalStringIndexerCache, StringIndexerCache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
@@ -240,3 +241,29 @@ def test_is_valid_timestamp() -> None:
 
     assert not indexer_cache._is_valid_timestamp(str(stale_ts))
     assert indexer_cache._is_valid_timestamp(str(new_ts))
+
+
+@override_options({"sentry-metrics.indexer.local-cache-size": 2})
+def test_local_cache_evicts_least_recently_used() -> None:
+    local_cache = LocalStringIndexerCache(indexer_cache)
+    local_cache.set_many({"sessions:1:a": 1, "sessions:1:b": 2})
+    assert local_cache.get_many(["sessions:1:a"]) == {"sessions:1:a": 1}
+
+    local_cache.set_many({"sessions:1:c": 3})
+    assert local_cache.get_many(["sessions:1:a", "sessions:1:b", "sessions:1:c"]) == {
+        "sessions:1:a": 1,
+        "sessions:1:c": 3,
+    }
+
+
+@override_options({"sentry-metrics.indexer.local-cache-size": 10})
+def test_local_cache_expires() -> None:
+    local_cache = LocalStringIndexerCache(indexer_cache)
+    with mock.patch("time.monotonic", return_value=0):
+        local_cache.set_many({"sessions:1:a": 1})
+
+    ttl = settings.SENTRY_METRICS_INDEXER_CACHE_TTL
+    with mock.patch("time.monotonic", return_value=ttl - 1):
+        assert local_cache.get_many(["sessions:1:a"]) == {"sessions:1:a": 1}
+    with mock.patch("time.monotonic", return_value=ttl * 1.25):
+        assert local_cache.get_many(["sessions:1:a"]) == {}
@@ -1,11 +1,14 @@
 from collections.abc import Mapping
+from unittest import mock
 
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.indexer.base import FetchType, Metadata, UseCaseKeyCollection
-from sentry.sentry_metrics.indexer.cache import CachingIndexer
+from sentry.sentry_metrics.indexer.cache import CachingIndexer, LocalStringIndexerCache
+from sentry.sentry_metrics.indexer.postgres.models import StringIndexer
 from sentry.sentry_metrics.indexer.postgres.postgres_v2 import PGStringIndexerV2, indexer_cache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
 
 
@@ -41,3 +44,60 @@ class PostgresIndexerV2Test(TestCase):
         )
 
         assert indexer_cache.get("br", key) is None
+
+    @override_options({"sentry-metrics.indexer.local-cache-size": 100})
+    def test_local_cache(self):
+        indexer = CachingIndexer(
+            indexer_cache, PGStringIndexerV2(), local_cache=LocalStringIndexerCache(indexer_cache)
+        )
+        strings = {self.use_case_id: {self.organization.id: self.strings}}
+        results = indexer.bulk_record(strings)
+
+        with mock.patch.object(indexer_cache, "get_many") as get_many:
+            cached_results = indexer.bulk_record(strings)
+
+        assert get_many.call_count == 0
+        for string in self.strings:
+            assert (
+                cached_results[self.use_case_id][self.organization.id][string]
+                == results[self.use_case_id][self.organization.id][string]
+            )
+        assert_fetch_type_for_tag_string_set(
+            cached_results.get_fetch_metadata()[self.use_case_id][self.organization.id],
+            FetchType.CACHE_HIT,
+            self.strings,
+        )
+
+    def test_bulk_insert_returning(self):
+        existing = StringIndexer.objects.create(organization_id=self.organization.id, string="hey")
+
+        inserted = StringIndexer.bulk_insert_returning(
+            [
+                StringIndexer(organization_id=self.organization.id, string=string)
+                for string in self.strings
+            ]
+        )
+
+        assert {record.string for record in inserted} == self.strings - {"hey"}
+        assert {record.id for record in inserted}.isdisjoint({existing.id})
+        for record in inserted:
+            assert StringIndexer.objects.get(id=record.id).string == record.string
+
+    @override_options({"sentry-metrics.indexer.insert-returning": True})
+    def test_bulk_record_insert_returning(self):
+        existing = StringIndexer.objects.create(organization_id=self.organization.id, string="hey")
+
+        results = self.indexer.indexer.bulk_record(
+            {self.use_case_id: {self.organization.id: self.strings}}
+        )
+
+        for string in self.strings:
+            assert (
+                results[self.use_case_id][self.organization.id][string]
+                == StringIndexer.objects.get(organization_id=self.organization.id, string=string).id
+            )
+        fetch_meta = results.get_fetch_metadata()[self.use_case_id][self.organization.id]
+        assert fetch_meta["hey"] == Metadata(id=existing.id, fetch_type=FetchType.DB_READ)
+        assert_fetch_type_for_tag_string_set(
+            fetch_meta, FetchType.FIRST_SEEN, self.strings - {"hey"}
+        )
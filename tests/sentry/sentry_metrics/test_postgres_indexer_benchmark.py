@@ -0,0 +1,71 @@
+"""
+Measures recording bursts of new strings with the Postgres indexer, as caused
+by cardinality spikes, with and without inserting them with `RETURNING`.
+
+Run with `pytest tests/sentry/sentry_metrics/test_postgres_indexer_benchmark.py --benchmark-only`.
+"""
+
+import itertools
+
+import pytest
+
+from sentry.sentry_metrics.indexer.postgres.postgres_v2 import PGStringIndexerV2
+from sentry.sentry_metrics.use_case_id_registry import UseCaseID
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_benchmark
+
+#: Number of new strings per organization in every burst
+STRINGS_PER_ORG = 500
+
+ORG_IDS = [1, 2, 3, 4]
+
+
+def make_burst(burst: int, strings_per_org: int = STRINGS_PER_ORG):
+    strings = {
+        UseCaseID.SESSIONS: {
+            org_id: {f"tag-value-{burst}-{i}" for i in range(strings_per_org)}
+            for org_id in ORG_IDS
+        }
+    }
+    return (strings,), {}
+
+
+def indexer_options(insert_returning: bool):
+    return override_options(
+        {
+            "sentry-metrics.indexer.insert-returning": insert_returning,
+            "sentry-metrics.writes-limiter.limits.releasehealth.per-org": [],
+            "sentry-metrics.writes-limiter.limits.releasehealth.global": [],
+        }
+    )
+
+
+def assert_recorded(results, strings_per_org: int = STRINGS_PER_ORG) -> None:
+    for org_id in ORG_IDS:
+        assert len(results[UseCaseID.SESSIONS][org_id]) == strings_per_org
+        assert None not in results[UseCaseID.SESSIONS][org_id].values()
+
+
+@django_db_all
+@pytest.mark.parametrize("insert_returning", [False, True])
+def test_cardinality_spike(insert_returning):
+    (strings,), _ = make_burst(0, strings_per_org=10)
+    with indexer_options(insert_returning):
+        results = PGStringIndexerV2().bulk_record(strings)
+    assert_recorded(results, strings_per_org=10)
+
+
+@django_db_all
+@requires_benchmark
+@pytest.mark.parametrize("insert_returning", [False, True])
+def test_benchmark_cardinality_spike(benchmark, insert_returning):
+    indexer = PGStringIndexerV2()
+    bursts = itertools.count()
+
+    with indexer_options(insert_returning):
+        results = benchmark.pedantic(
+            indexer.bulk_record, setup=lambda: make_burst(next(bursts)), rounds=10
+        )
+
+    assert_recorded(results)
@@ -5,10 +5,11 @@ import pytest
 
 from sentry.exceptions import InvalidSearchQuery
 from sentry.models.transaction_threshold import ProjectTransactionThreshold, TransactionMetric
-from sentry.snuba import discover
+from sentry.snuba import discover, timeseries_cache
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.samples import load_data
 
 ARRAY_COLUMNS = ["measurements", "span_op_breakdowns"]
@@ -384,6 +385,34 @@ class TimeseriesQueryTest(TimeseriesBase):
             val["count"] for val in result.data["data"] if "count" in val
         ], result.data["data"]
 
+    def test_chunk_cache(self):
+        def query():
+            return discover.timeseries_query(
+                selected_columns=["count()", "count_unique(user)"],
+                query="",
+                referrer="test_discover_query",
+                params={
+                    "start": self.day_ago - timedelta(days=6, minutes=30),
+                    "end": self.one_min_ago,
+                    "project_id": [self.project.id],
+                },
+                rollup=3600,
+            )
+
+        expected = query()
+
+        with override_options({"discover.timeseries-chunk-cache.rollout": 1.0}), patch(
+            "sentry.snuba.timeseries_cache.bulk_snql_query",
+            wraps=timeseries_cache.bulk_snql_query,
+        ) as bulk_snql_query:
+            assert query().data == expected.data
+            # The head, the missing chunks in one query, and the tail.
+            assert len(bulk_snql_query.call_args.args[0]) == 3
+
+            assert query().data == expected.data
+            # Settled chunks are served from the cache.
+            assert len(bulk_snql_query.call_args.args[0]) == 2
+
     def test_conditional_filter(self):
         project2 = self.create_project(organization=self.organization)
         project3 = self.create_project(organization=self.organization)
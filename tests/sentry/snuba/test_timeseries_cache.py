@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+from sentry.snuba.timeseries_cache import (
+    BUCKETS_PER_CHUNK,
+    CHUNK_TTL,
+    _get_runs,
+    get_chunk_ttl,
+    get_chunks,
+)
+from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.helpers.options import override_options
+
+
+def ts(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+@freeze_time("2024-03-20T12:30:00")
+@override_options({"discover.timeseries-chunk-cache.settle-seconds": 600})
+def test_get_chunks():
+    chunk_size = 60 * BUCKETS_PER_CHUNK
+    chunks = get_chunks(ts("2024-03-20T08:10:00"), ts("2024-03-20T12:30:00"), 60)
+
+    # Chunks are aligned to the epoch, and end before unsettled buckets.
+    assert chunks == [
+        (start, start + chunk_size)
+        for start in (
+            int(ts("2024-03-20T09:00:00").timestamp()),
+            int(ts("2024-03-20T10:00:00").timestamp()),
+            int(ts("2024-03-20T11:00:00").timestamp()),
+        )
+    ]
+
+
+@freeze_time("2024-03-20T12:30:00")
+@override_options({"discover.timeseries-chunk-cache.settle-seconds": 600})
+def test_get_chunks_uncacheable():
+    # Windows that don't contain a whole settled chunk.
+    assert get_chunks(ts("2024-03-20T11:10:00"), ts("2024-03-20T12:30:00"), 60) == []
+    # Buckets that aren't aligned to days.
+    assert get_chunks(ts("2024-03-01T00:00:00"), ts("2024-03-20T12:30:00"), 7 * 60) == []
+
+
+@freeze_time("2024-03-20T12:30:00")
+def test_get_chunk_ttl():
+    # Chunks are cached for as long as they have been settled, up to a day.
+    assert get_chunk_ttl(int(ts("2024-03-20T11:30:00").timestamp())) == 60 * 60
+    assert get_chunk_ttl(int(ts("2024-03-01T00:00:00").timestamp())) == CHUNK_TTL
+
+
+def test_get_runs():
+    assert _get_runs([]) == []
+    assert _get_runs([0, 1, 2, 5, 7, 8]) == [(0, 2), (5, 5), (7, 8)]
@@ -1,4 +1,4 @@
-from sentry.spans.buffer.redis import RedisSpansBuffer
+from sentry.spans.buffer.redis import BufferedSpan, RedisSpansBuffer
 
 
 class TestRedisSpansBuffer:
@@ -42,3 +42,65 @@ class TestRedisSpansBuffer:
             "bar", "foo", 1710280890, 0, b"other span data"
         )
         assert should_process is True
+
+    def test_write_spans_and_check_processing(self):
+        buffer = RedisSpansBuffer()
+        should_process = buffer.write_spans_and_check_processing(
+            [
+                BufferedSpan("segment_1", "foo", 1710280889, 0, b"span data"),
+                BufferedSpan("segment_2", "foo", 1710280889, 0, b"span data"),
+                BufferedSpan("segment_1", "foo", 1710280890, 0, b"other span data"),
+                BufferedSpan("segment_3", "foo", 1710280889, 1, b"span data"),
+            ]
+        )
+        assert should_process == [False, False, True, False]
+
+        assert buffer.client.ttl("segment:foo:segment_1:process-segment") == 300
+        assert buffer.client.ttl("segment:foo:segment_3:process-segment") == 300
+        assert buffer.client.lrange(
+            "performance-issues:unprocessed-segments:partition:0", 0, -1
+        ) == [
+            b'[1710280889,"segment:foo:segment_1:process-segment"]',
+            b'[1710280889,"segment:foo:segment_2:process-segment"]',
+        ]
+        assert buffer.client.lrange(
+            "performance-issues:unprocessed-segments:partition:1", 0, -1
+        ) == [b'[1710280889,"segment:foo:segment_3:process-segment"]']
+
+        should_process = buffer.write_spans_and_check_processing(
+            [
+                BufferedSpan("segment_1", "foo", 1710280890, 0, b"third span data"),
+                BufferedSpan("segment_3", "foo", 1710280891, 1, b"other span data"),
+            ]
+        )
+        assert should_process == [False, True]
+
+        # Existing segments are not registered again.
+        assert buffer.client.llen("performance-issues:unprocessed-segments:partition:0") == 2
+
+        assert buffer.read_and_expire_many_segments(
+            ["segment:foo:segment_1:process-segment", "segment:foo:segment_3:process-segment"]
+        ) == [
+            [b"span data", b"other span data", b"third span data"],
+            [b"span data", b"other span data"],
+        ]
+        assert not buffer.client.exists("segment:foo:segment_1:process-segment")
+
+    def test_write_spans_matches_single_writes(self):
+        spans = [
+            BufferedSpan("bar", "foo", 1710280889, 0, b"span data"),
+            BufferedSpan("bar", "foo", 1710280889, 0, b"span data 2"),
+            BufferedSpan("bar", "foo", 1710280890, 0, b"other span data"),
+            BufferedSpan("bar", "foo", 1710280888, 0, b"late span data"),
+        ]
+
+        buffer = RedisSpansBuffer()
+        single = [buffer.write_span_and_check_processing(*span) for span in spans]
+        buffer.client.delete("performance-issues:last-processed-timestamp:partition:0")
+
+        assert buffer.write_spans_and_check_processing(spans) == single == [
+            False,
+            False,
+            True,
+            False,
+        ]
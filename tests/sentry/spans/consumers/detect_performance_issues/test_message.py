@@ -3,7 +3,7 @@ from hashlib import md5
 from unittest import mock
 
 from sentry.issues.grouptype import PerformanceStreamedSpansGroupTypeExperimental
-from sentry.spans.consumers.detect_performance_issues.message import process_segment
+from sentry.spans.consumers.detect_performance_issues.message import SpanTree, process_segment
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.options import override_options
 from tests.sentry.spans.consumers.process.test_factory import build_mock_span
@@ -125,3 +125,50 @@ class TestSpansTask(TestCase):
         )
 
         assert job["performance_problems"][0].type == PerformanceStreamedSpansGroupTypeExperimental
+
+
+def _span(span_id, parent_span_id=None, start_timestamp=0.0, is_segment=False):
+    return {
+        "span_id": span_id,
+        "parent_span_id": parent_span_id,
+        "start_timestamp": start_timestamp,
+        "is_segment": is_segment,
+    }
+
+
+def test_span_tree_flatten():
+    spans = [
+        _span("c", "a", 2.0),
+        _span("orphan", "missing", 0.5),
+        _span("a", "root", 1.0),
+        _span("root", is_segment=True),
+        _span("b", "root", 3.0),
+        _span("d", "a", 1.5),
+        _span("e", "orphan", 0.6),
+        _span("a", "b", 0.0),
+    ]
+
+    tree = SpanTree(spans)
+
+    # The duplicate of "a" is dropped.
+    assert len(tree) == 7
+    assert [span["span_id"] for span in tree.flattened_spans()] == [
+        "root",
+        "a",
+        "d",
+        "c",
+        "b",
+        "orphan",
+        "e",
+    ]
+    assert tree.flattened_spans()[1] is spans[2]
+
+
+def test_span_tree_flatten_deep_segment():
+    spans = [_span("0", is_segment=True)] + [
+        _span(str(i), str(i - 1), float(i)) for i in range(1, 10000)
+    ]
+
+    assert [span["span_id"] for span in SpanTree(spans).flattened_spans()] == [
+        str(i) for i in range(10000)
+    ]
@@ -161,6 +161,85 @@ def test_produces_valid_segment_to_kafka():
         assert mock_producer.produce.call_args.args[0] == ArroyoTopic("buffered-segments")
 
 
+@override_options(
+    {
+        "standalone-spans.process-spans-consumer.enable": True,
+        "standalone-spans.process-spans-consumer.project-allowlist": [1],
+        "standalone-spans.process-spans-consumer.batch-writes": True,
+    }
+)
+def test_consumer_pushes_batches_to_redis():
+    redis_client = get_redis_client()
+
+    topic = ArroyoTopic(get_topic_definition(Topic.SNUBA_SPANS)["real_topic_name"])
+    partition = Partition(topic, 0)
+    strategy = process_spans_strategy().create_with_partitions(
+        commit=mock.Mock(),
+        partitions={},
+    )
+
+    span_data = build_mock_span(project_id=1, is_segment=True)
+    message1 = build_mock_message(span_data, topic)
+    strategy.submit(make_payload(message1, partition))
+
+    span_data = build_mock_span(project_id=1)
+    message2 = build_mock_message(span_data, topic)
+    strategy.submit(make_payload(message2, partition, 2))
+
+    strategy.poll()
+    strategy.join(1)
+    strategy.terminate()
+
+    assert redis_client.lrange("segment:a49b42af9fb69da0:1:process-segment", 0, -1) == [
+        message1.value().encode("utf-8"),
+        message2.value().encode("utf-8"),
+    ]
+    assert redis_client.ttl("segment:a49b42af9fb69da0:1:process-segment") == 300
+
+
+@django_db_all
+@override_options(
+    {
+        "standalone-spans.process-spans-consumer.enable": True,
+        "standalone-spans.process-spans-consumer.project-allowlist": [1],
+        "standalone-spans.process-spans-consumer.batch-writes": True,
+    }
+)
+def test_produces_valid_segment_to_kafka_with_batch_writes():
+    topic = ArroyoTopic(get_topic_definition(Topic.SNUBA_SPANS)["real_topic_name"])
+    partition = Partition(topic, 0)
+    factory = process_spans_strategy()
+    with mock.patch.object(
+        factory,
+        "producer",
+        new=mock.Mock(),
+    ) as mock_producer:
+        strategy = factory.create_with_partitions(
+            commit=mock.Mock(),
+            partitions={},
+        )
+
+        # The first batch registers the segment, the second one triggers its
+        # processing once the buffer window has passed.
+        span_data = build_mock_span(project_id=1, is_segment=True)
+        message1 = build_mock_message(span_data, topic)
+        strategy.submit(make_payload(message1, partition, 1, datetime.now() - timedelta(minutes=3)))
+        strategy.submit(make_payload(message1, partition, 2, datetime.now() - timedelta(minutes=3)))
+
+        span_data = build_mock_span(project_id=1)
+        message2 = build_mock_message(span_data, topic)
+        strategy.submit(make_payload(message2, partition, 3))
+        strategy.submit(make_payload(message2, partition, 4))
+
+        strategy.poll()
+        strategy.join(1)
+        strategy.terminate()
+
+        mock_producer.produce.assert_called_once()
+        BUFFERED_SEGMENT_SCHEMA.decode(mock_producer.produce.call_args.args[1].value)
+        assert mock_producer.produce.call_args.args[0] == ArroyoTopic("buffered-segments")
+
+
 @django_db_all
 @override_options(
     {
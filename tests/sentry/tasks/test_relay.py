@@ -18,6 +18,7 @@ from sentry.tasks.relay import (
     schedule_build_project_config,
     schedule_invalidate_project_config,
 )
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks
 from sentry.testutils.pytest.fixtures import django_db_all
 
@@ -133,6 +134,10 @@ def invalidation_debounce_cache(monkeypatch):
         "sentry.relay.projectconfig_debounce_cache.invalidation.is_debounced",
         debounce_cache.is_debounced,
     )
+    monkeypatch.setattr(
+        "sentry.relay.projectconfig_debounce_cache.invalidation.count_scheduled",
+        debounce_cache.count_scheduled,
+    )
 
     return debounce_cache
 
@@ -415,6 +420,58 @@ class TestInvalidationTask:
             },
         ]
 
+    def test_coalesce(
+        self,
+        monkeypatch,
+        factories,
+        default_team,
+        default_organization,
+        invalidation_debounce_cache,
+        django_cache,
+    ):
+        projects = [factories.create_project(teams=[default_team]) for _ in range(4)]
+
+        tasks = []
+
+        def apply_async(args=None, kwargs=None, countdown=None):
+            assert not args
+            tasks.append(kwargs)
+
+        monkeypatch.setattr("sentry.tasks.relay.invalidate_project_config.apply_async", apply_async)
+
+        for project in projects:
+            invalidation_debounce_cache.mark_task_done(
+                public_key=None, project_id=project.id, organization_id=None
+            )
+        invalidation_debounce_cache.mark_task_done(
+            public_key=None, project_id=None, organization_id=default_organization.id
+        )
+
+        with override_options({"relay.invalidation.coalesce-threshold": 2}):
+            for project in projects:
+                schedule_invalidate_project_config(project_id=project.id, trigger="test")
+
+        assert tasks == [
+            {
+                "project_id": projects[0].id,
+                "organization_id": None,
+                "public_key": None,
+                "trigger": "test",
+            },
+            {
+                "project_id": projects[1].id,
+                "organization_id": None,
+                "public_key": None,
+                "trigger": "test",
+            },
+            {
+                "project_id": None,
+                "organization_id": default_organization.id,
+                "public_key": None,
+                "trigger": "test",
+            },
+        ]
+
     def test_invalidate(
         self,
         monkeypatch,
@@ -463,6 +520,34 @@ class TestInvalidationTask:
             assert new_cfg is not None
             assert new_cfg != cfg
 
+    def test_invalidate_org_in_batches(
+        self,
+        factories,
+        default_team,
+        default_organization,
+        redis_cache,
+        task_runner,
+        django_cache,
+    ):
+        projects = [factories.create_project(teams=[default_team]) for _ in range(3)]
+        public_keys = [key for project in projects for key in _cache_keys_for_project(project)]
+        redis_cache.set_many({public_key: {"dummy-key": "val"} for public_key in public_keys})
+
+        with (
+            override_options({"relay.invalidation.batch-size": 2}),
+            mock.patch(
+                "sentry.relay.projectconfig_cache.backend.set_many", wraps=redis_cache.set_many
+            ) as set_many,
+            task_runner(),
+        ):
+            invalidate_project_config(organization_id=default_organization.id, trigger="test")
+
+        batches = [batch for (batch,), _ in set_many.call_args_list]
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert {public_key for batch in batches for public_key in batch} == set(public_keys)
+        for public_key in public_keys:
+            assert "dummy-key" not in redis_cache.get(public_key)
+
     @mock.patch(
         "sentry.tasks.relay._schedule_invalidate_project_config",
         wraps=_schedule_invalidate_project_config,
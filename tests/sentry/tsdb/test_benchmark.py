@@ -0,0 +1,66 @@
+"""
+Compares recording events in the TSDB with and without in-memory aggregation
+(``batch_window_ms``). For the batched variant, the number of commands the
+pipelined variant would have sent and the number of scripts that were sent
+instead are recorded as extra info.
+
+Run with `pytest tests/sentry/tsdb/test_benchmark.py --benchmark-only`.
+"""
+
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+
+from sentry.testutils.skips import requires_benchmark
+from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, TSDBModel
+from sentry.tsdb.redis import RedisTSDB
+
+ROLLUPS = ((10, 30), (ONE_MINUTE, 120), (ONE_HOUR, 24), (ONE_DAY, 30))
+
+
+def record_events(db: RedisTSDB, now: datetime, count: int = 1000) -> None:
+    # Roughly what `sentry.tasks.post_process` writes per event, for events
+    # spread over a handful of groups.
+    for i in range(count):
+        db.incr_multi([(TSDBModel.project, 1), (TSDBModel.group, i % 10)], now, environment_id=1)
+        db.record_multi([(TSDBModel.users_affected_by_group, i % 10, [f"user-{i}"])], now)
+    db.flush()
+
+
+@pytest.mark.parametrize("batch_window_ms", [0, 1000], ids=["pipelined", "batched"])
+def test_record_events(batch_window_ms):
+    db = RedisTSDB(
+        rollups=ROLLUPS, prefix=f"ts-{uuid.uuid4().hex}:", batch_window_ms=batch_window_ms
+    )
+    now = datetime.now(timezone.utc)
+    groups = list(range(10))
+
+    record_events(db, now, count=100)
+
+    assert db.get_sums(TSDBModel.group, groups, now, now, rollup=ONE_HOUR) == {
+        group: 10 for group in groups
+    }
+    assert db.get_distinct_counts_totals(
+        TSDBModel.users_affected_by_group, groups, now, now, rollup=ONE_HOUR
+    ) == {group: 10 for group in groups}
+
+
+@requires_benchmark
+@pytest.mark.parametrize("batch_window_ms", [0, 1000], ids=["pipelined", "batched"])
+def test_benchmark_record_events(batch_window_ms, benchmark):
+    db = RedisTSDB(rollups=ROLLUPS, batch_window_ms=batch_window_ms, batch_max_size=10_000)
+    now = datetime.now(timezone.utc)
+    counts: Counter[str] = Counter()
+
+    def incr(key, amount=1, **kwargs):
+        counts[key] += amount
+
+    with mock.patch("sentry.tsdb.redis.metrics.incr", side_effect=incr):
+        benchmark.pedantic(record_events, args=(db, now), rounds=5)
+
+    if batch_window_ms:
+        benchmark.extra_info["commands_per_round"] = counts["tsdb.batch.commands"] / 5
+        benchmark.extra_info["scripts_per_round"] = counts["tsdb.batch.scripts"] / 5
@@ -1,12 +1,20 @@
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 import pytest
 
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.options import override_options
 from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, TSDBModel
-from sentry.tsdb.redis import CountMinScript, RedisTSDB, SuppressionWrapper
+from sentry.tsdb.redis import (
+    BATCH_MAX_ATTEMPTS,
+    CountMinScript,
+    RedisTSDB,
+    SuppressionWrapper,
+    _batching_instances,
+    _reset_batching_instances,
+)
 from sentry.utils.dates import to_datetime
 
 
@@ -817,3 +825,105 @@ class RedisTSDBTest(TestCase):
             [b"eta", b"7"],
             [b"bar", b"7"],
         ]
+
+
+class RedisTSDBBatchTest(TestCase):
+    @override_options(
+        {"redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}}
+    )
+    def setUp(self):
+        self.db = RedisTSDB(
+            rollups=((10, 30), (ONE_HOUR, 24)),
+            vnodes=64,
+            cluster="tsdb",
+            batch_window_ms=60_000,
+        )
+        self.addCleanup(self.db.flush)
+
+    def tearDown(self):
+        with self.db.cluster.all() as client:
+            client.flushdb()
+
+    def test_incr_multi(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        self.db.incr(TSDBModel.project, 1, now)
+        self.db.incr_multi(
+            [(TSDBModel.project, 1), (TSDBModel.project, 2)], now, count=3, environment_id=1
+        )
+        assert self.db.get_sums(TSDBModel.project, [1, 2], now, now) == {1: 0, 2: 0}
+
+        self.db.flush()
+        assert self.db.get_sums(TSDBModel.project, [1, 2], now, now) == {1: 4, 2: 3}
+        assert self.db.get_sums(TSDBModel.project, [1, 2], now, now, environment_id=1) == {
+            1: 3,
+            2: 3,
+        }
+
+        hash_key, _ = self.db.make_counter_key(TSDBModel.project, ONE_HOUR, now, 1, None)
+        with self.db.cluster.map() as client:
+            ttl = client.ttl(hash_key)
+        assert ttl.value > 0
+
+    def test_record_multi(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=1)
+        model = TSDBModel.users_affected_by_group
+
+        self.db.record(model, 1, ("foo", "bar"), now)
+        self.db.record_multi(((model, 1, ("foo", "baz")), (model, 2, ("bar",))), now)
+        self.db.flush()
+
+        assert self.db.get_distinct_counts_totals(model, [1, 2], now, now, rollup=3600) == {
+            1: 3,
+            2: 1,
+        }
+
+    def test_flush_on_max_size(self):
+        self.db.batch_max_size = 1
+        now = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        self.db.incr(TSDBModel.project, 1, now)
+        assert not self.db._batches
+        assert self.db.get_sums(TSDBModel.project, [1], now, now) == {1: 1}
+
+    def test_flush_after_window(self):
+        self.db.batch_window = 0.01
+        now = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        self.db.incr(TSDBModel.project, 1, now)
+        assert self.db._flush_timer is not None
+        self.db._flush_timer.join(1)
+        assert self.db.get_sums(TSDBModel.project, [1], now, now) == {1: 1}
+
+    def test_retry_failed_batch(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=1)
+        self.db.incr(TSDBModel.project, 1, now)
+
+        with mock.patch.object(self.db.cluster, "execute_commands", side_effect=Exception("boom")):
+            self.db.flush()
+            # Failed writes are merged into the next window.
+            self.db.incr(TSDBModel.project, 1, now)
+            assert len(self.db._batches) == 1
+
+        self.db.flush()
+        assert self.db.get_sums(TSDBModel.project, [1], now, now) == {1: 2}
+
+    def test_drop_failed_batch(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=1)
+        self.db.incr(TSDBModel.project, 1, now)
+
+        with mock.patch.object(self.db.cluster, "execute_commands", side_effect=Exception("boom")):
+            for _ in range(BATCH_MAX_ATTEMPTS):
+                self.db.flush()
+
+        assert not self.db._batches
+
+    def test_reset_after_fork(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=1)
+        self.db.incr(TSDBModel.project, 1, now)
+        assert self.db in _batching_instances
+
+        # Writes aggregated before forking are left to the parent.
+        _reset_batching_instances()
+        assert not self.db._batches
+        assert self.db._flush_timer is None
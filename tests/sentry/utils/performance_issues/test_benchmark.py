@@ -0,0 +1,82 @@
+"""
+Compares running every performance detector over a large transaction one
+detector at a time with running them all in a single pass over the spans.
+
+Run with `pytest tests/sentry/utils/performance_issues/test_benchmark.py --benchmark-only`.
+"""
+
+import pytest
+
+from sentry.testutils.performance_issues.event_generators import create_event, create_span
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.performance_issues.performance_detection import (
+    DETECTOR_CLASSES,
+    get_detection_settings,
+    run_detector_on_data,
+    run_detectors_on_data,
+)
+
+SPAN_COUNT = 5000
+
+
+def make_event():
+    spans = []
+    for i in range(SPAN_COUNT):
+        if i % 3 == 0:
+            span = create_span("db", 50, "SELECT * FROM table WHERE id = %s", f"hash{i % 10}")
+        elif i % 3 == 1:
+            span = create_span(
+                "http.client",
+                200,
+                f"GET /api/0/items/{i % 20}/",
+                data={"url": f"https://example.com/api/0/items/{i % 20}/"},
+            )
+        else:
+            span = create_span(
+                "resource.script",
+                10,
+                f"https://example.com/static/app.{i % 50}.js",
+                data={"Encoded Body Size": 1000, "Decoded Body Size": 1000},
+            )
+        span["span_id"] = f"{i:016x}"
+        span["start_timestamp"] += i * 0.001
+        span["timestamp"] += i * 0.001
+        spans.append(span)
+    return create_event(spans)
+
+
+def detect_sequential(event, settings):
+    detectors = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+    for detector in detectors:
+        run_detector_on_data(detector, event)
+    return detectors
+
+
+def detect_single_pass(event, settings):
+    detectors = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+    run_detectors_on_data(detectors, event)
+    return detectors
+
+
+@pytest.mark.django_db
+def test_detectors_single_pass():
+    event = make_event()
+    settings = get_detection_settings()
+
+    sequential = detect_sequential(event, settings)
+    single_pass = detect_single_pass(event, settings)
+    assert [detector.stored_problems.keys() for detector in single_pass] == [
+        detector.stored_problems.keys() for detector in sequential
+    ]
+
+
+@pytest.mark.django_db
+@requires_benchmark
+def test_benchmark_detectors_sequential(benchmark):
+    benchmark(detect_sequential, make_event(), get_detection_settings())
+
+
+@pytest.mark.django_db
+@requires_benchmark
+def test_benchmark_detectors_single_pass(benchmark):
+    benchmark(detect_single_pass, make_event(), get_detection_settings())
@@ -19,16 +19,21 @@ from sentry.testutils.silo import no_silo_test
 from sentry.utils.performance_issues.base import (
     DETECTOR_TYPE_TO_GROUP_TYPE,
     DetectorType,
+    get_span_duration,
+    span_cache,
     total_span_time,
 )
 from sentry.utils.performance_issues.detectors.n_plus_one_db_span_detector import (
     NPlusOneDBSpanDetector,
 )
 from sentry.utils.performance_issues.performance_detection import (
+    DETECTOR_CLASSES,
     EventPerformanceProblem,
     _detect_performance_problems,
     detect_performance_problems,
     get_detection_settings,
+    run_detector_on_data,
+    run_detectors_on_data,
 )
 from sentry.utils.performance_issues.performance_problem import PerformanceProblem
 
@@ -492,6 +497,38 @@ class PerformanceDetectionTest(TestCase):
         pre_checked_keys = ["sdk_name", "is_early_adopter", "browser_name", "uncompressed_assets"]
         assert not any([v for k, v in tags.items() if k not in pre_checked_keys])
 
+    def test_run_detectors_on_data_matches_individual_runs(self):
+        settings = get_detection_settings(self.project.id)
+        for event_name in [
+            "n-plus-one-in-django-index-view",
+            "n-plus-one-api-calls/n-plus-one-api-calls-in-issue-stream",
+            "uncompressed-assets/uncompressed-script-asset",
+            "m-n-plus-one-db/m-n-plus-one-graphql",
+            "slow-db-spans",
+            "consecutive-http/consecutive-http-basic",
+        ]:
+            event = get_event(event_name)
+
+            individual = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+            for detector in individual:
+                run_detector_on_data(detector, event)
+
+            fused = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+            run_detectors_on_data(fused, event)
+
+            for expected, actual in zip(individual, fused):
+                assert actual.stored_problems == expected.stored_problems, event_name
+
+    def test_run_detectors_on_data_skips_ineligible_detectors(self):
+        event = get_event("n-plus-one-in-django-index-view")
+        detector = Mock()
+        detector.is_event_eligible.return_value = False
+
+        run_detectors_on_data([detector], event)
+
+        assert detector.visit_span.call_count == 0
+        assert detector.on_complete.call_count == 0
+
 
 @no_silo_test
 class DetectorTypeToGroupTypeTest(unittest.TestCase):
@@ -720,3 +757,15 @@ class EventPerformanceProblemTest(TestCase):
 )
 def test_total_span_time(spans, duration):
     assert total_span_time(spans) == pytest.approx(duration, 0.01)
+
+
+def test_span_cache():
+    span = {"start_timestamp": 0, "timestamp": 0.1}
+
+    with span_cache():
+        duration = get_span_duration(span)
+        span["timestamp"] = 0.2
+        # Values are computed once per span while the cache is active.
+        assert get_span_duration(span) == duration
+
+    assert get_span_duration(span) != duration
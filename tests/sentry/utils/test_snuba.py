@@ -1,8 +1,10 @@
+import threading
 import unittest
 from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 from urllib3 import HTTPConnectionPool
 from urllib3.exceptions import HTTPError, ReadTimeoutError
@@ -12,12 +14,19 @@ from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import json, snuba
 from sentry.utils.snuba import (
     ROUND_UP,
+    PendingRevalidations,
+    RateLimitExceeded,
     RetrySkipTimeout,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
+    _iter_response_rows,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -409,6 +418,225 @@ class QuantizeTimeTest(unittest.TestCase):
         assert i != j
 
 
+def identity(x):
+    return x
+
+
+QUERY_CACHE_OPTIONS = {
+    "snuba.query-cache.referrer-policies": {},
+    "snuba.query-cache.coalesce-queries": True,
+    "snuba.query-cache.lease-wait-seconds": 0.0,
+}
+
+
+@mock.patch("sentry.utils.snuba._bulk_snuba_query")
+class QueryCacheTest(TestCase):
+    def query(self, *queries):
+        return _apply_cache_and_build_results(
+            [(query, identity, identity) for query in queries], use_cache=True
+        )
+
+    @override_options(QUERY_CACHE_OPTIONS)
+    def test_caches_results(self, bulk_snuba_query):
+        bulk_snuba_query.side_effect = lambda queries, headers: [
+            {"data": [{"query": query["q"]}]} for query, _, _ in queries
+        ]
+
+        assert self.query({"q": 1}, {"q": 2}, {"q": 1}) == [
+            {"data": [{"query": 1}]},
+            {"data": [{"query": 2}]},
+            {"data": [{"query": 1}]},
+        ]
+        # Identical queries in one batch are only executed once.
+        assert len(bulk_snuba_query.call_args.args[0]) == 2
+
+        bulk_snuba_query.reset_mock()
+        assert self.query({"q": 2}, {"q": 1}) == [
+            {"data": [{"query": 2}]},
+            {"data": [{"query": 1}]},
+        ]
+        assert bulk_snuba_query.call_count == 0
+
+    @override_options(QUERY_CACHE_OPTIONS)
+    def test_reads_legacy_cache_entries(self, bulk_snuba_query):
+        cache.set(get_cache_key({"q": 1}), json.dumps({"data": [{"query": 1}]}), 60)
+        assert self.query({"q": 1}) == [{"data": [{"query": 1}]}]
+        assert bulk_snuba_query.call_count == 0
+
+    @override_options(QUERY_CACHE_OPTIONS)
+    def test_coalesces_concurrent_queries(self, bulk_snuba_query):
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def execute(queries, headers):
+            started.set()
+            assert proceed.wait(5)
+            return [{"data": [{"query": query["q"]}]} for query, _, _ in queries]
+
+        bulk_snuba_query.side_effect = execute
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(self.query({"q": 1})))
+        leader.start()
+        assert started.wait(5)
+
+        follower = threading.Thread(target=lambda: results.append(self.query({"q": 1})))
+        follower.start()
+        # Give the follower a chance to start waiting for the leader.
+        follower.join(0.2)
+        proceed.set()
+        leader.join(5)
+        follower.join(5)
+
+        assert results == [[{"data": [{"query": 1}]}]] * 2
+        assert bulk_snuba_query.call_count == 1
+
+    @override_options(QUERY_CACHE_OPTIONS)
+    def test_coalesced_queries_share_errors(self, bulk_snuba_query):
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def execute(queries, headers):
+            started.set()
+            assert proceed.wait(5)
+            raise RateLimitExceeded("too many queries")
+
+        bulk_snuba_query.side_effect = execute
+
+        errors = []
+
+        def query():
+            try:
+                self.query({"q": 1})
+            except RateLimitExceeded as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=query)
+        leader.start()
+        assert started.wait(5)
+
+        follower = threading.Thread(target=query)
+        follower.start()
+        follower.join(0.2)
+        proceed.set()
+        leader.join(5)
+        follower.join(5)
+
+        assert len(errors) == 2
+        assert bulk_snuba_query.call_count == 1
+
+    @override_options(
+        {
+            **QUERY_CACHE_OPTIONS,
+            "snuba.query-cache.referrer-policies": {"default": {"ttl": 0, "stale_ttl": 60}},
+        }
+    )
+    @mock.patch("sentry.utils.snuba._revalidation_thread_pool")
+    def test_serves_stale_results_while_revalidating(self, revalidation_pool, bulk_snuba_query):
+        revalidation_pool.submit.side_effect = lambda revalidate: revalidate()
+        bulk_snuba_query.return_value = [{"data": [{"version": 1}]}]
+        assert self.query({"q": 1}) == [{"data": [{"version": 1}]}]
+
+        bulk_snuba_query.return_value = [{"data": [{"version": 2}]}]
+        # The stale result is returned and refreshed in the background.
+        assert self.query({"q": 1}) == [{"data": [{"version": 1}]}]
+        assert revalidation_pool.submit.call_count == 1
+        assert bulk_snuba_query.call_count == 2
+
+        assert self.query({"q": 1}) == [{"data": [{"version": 2}]}]
+
+    @override_options(
+        {
+            **QUERY_CACHE_OPTIONS,
+            "snuba.query-cache.referrer-policies": {"default": {"ttl": 0, "stale_ttl": 60}},
+        }
+    )
+    @mock.patch("sentry.utils.snuba._revalidation_thread_pool")
+    def test_revalidations_are_not_shared(self, revalidation_pool, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [{"version": 1}]}]
+        self.query({"q": 1})
+
+        # The refresh is pending, and is neither submitted twice nor waited
+        # for by foreground queries.
+        self.query({"q": 1})
+        self.query({"q": 1})
+        assert revalidation_pool.submit.call_count == 1
+        assert not snuba._inflight_queries._futures
+
+        (revalidate,) = revalidation_pool.submit.call_args.args
+        revalidate()
+        self.query({"q": 1})
+        assert revalidation_pool.submit.call_count == 2
+
+    @override_options(
+        {
+            **QUERY_CACHE_OPTIONS,
+            "snuba.query-cache.referrer-policies": {"default": {"ttl": 0, "stale_ttl": 60}},
+            "snuba.query-cache.lease-wait-seconds": 0.5,
+        }
+    )
+    @mock.patch("sentry.utils.snuba._revalidation_thread_pool")
+    def test_revalidations_are_leased_across_processes(self, revalidation_pool, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [{"version": 1}]}]
+        self.query({"q": 1})
+        self.query({"q": 1})
+        assert revalidation_pool.submit.call_count == 1
+
+        # Another process does not refresh the query while the lease is held,
+        # even though the result is stale right away.
+        with mock.patch(
+            "sentry.utils.snuba._pending_revalidations", PendingRevalidations(max_size=10)
+        ):
+            self.query({"q": 1})
+        assert revalidation_pool.submit.call_count == 1
+
+
+def test_pending_revalidations_are_bounded():
+    pending = PendingRevalidations(max_size=2)
+    assert pending.claim(["a", "b", "c"]) == ["a", "b"]
+    assert pending.claim(["a", "c"]) == []
+
+    pending.release(["a"])
+    assert pending.claim(["a", "c"]) == ["a"]
+
+
+class IterResponseRowsTest(unittest.TestCase):
+    body = {
+        "timing": {"timestamp": 1234567890, "duration_ms": 12},
+        "data": [
+            {"id": 1, "title": "caf\u00e9 \u2603", "tags": ["a", "b"]},
+            {"id": 22, "title": "\"quoted\" ]}", "tags": []},
+            {"id": 333, "value": 1.5, "nested": {"key": [None, True]}},
+        ],
+        "meta": [{"name": "id", "type": "UInt64"}],
+    }
+
+    def rows(self, chunks):
+        return list(_iter_response_rows(chunks))
+
+    def test_whole_body(self):
+        raw = json.dumps(self.body).encode("utf-8")
+        assert self.rows([raw]) == self.body["data"]
+
+    def test_any_chunk_split(self):
+        raw = json.dumps(self.body, ensure_ascii=False).encode("utf-8")
+        for size in (1, 2, 3, 7, 64):
+            chunks = [raw[i : i + size] for i in range(0, len(raw), size)]
+            assert self.rows(chunks) == self.body["data"]
+
+    def test_number_split_across_chunks(self):
+        assert self.rows([b'{"timing": 12', b'34, "data": [1', b"23]}"]) == [123]
+
+    def test_empty(self):
+        assert self.rows([b"{}"]) == []
+        assert self.rows([b'{"data": [], "meta": []}']) == []
+
+    def test_invalid(self):
+        for raw in (b'{"data": [{"id": 1}]', b'{"data": [1,]}', b"[]", b"{} {}"):
+            with pytest.raises(json.JSONDecodeError):
+                self.rows([raw])
+
+
 class FakeConnectionPool(HTTPConnectionPool):
     def __init__(self, connection, **kwargs):
         self.connection = connection
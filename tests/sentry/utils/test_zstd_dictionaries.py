@@ -0,0 +1,135 @@
+import pytest
+import zstandard
+
+from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.testutils.helpers import override_options
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json, zstd_dictionaries
+from sentry.utils.zstd_dictionaries import (
+    DictionaryNotFound,
+    EventPayloadCodec,
+    compress,
+    decompress,
+    load_dictionary,
+    save_dictionary,
+    train_dictionary,
+)
+
+
+def make_payload(i: int) -> dict:
+    return {
+        "event_id": f"{i:032x}",
+        "platform": "python",
+        "sdk": {
+            "name": "sentry.python.django",
+            "version": f"1.{i % 40}.0",
+            "integrations": ["django", "logging", "redis", "celery", "stdlib", "threading"],
+            "packages": [{"name": "pypi:sentry-sdk", "version": f"1.{i % 40}.0"}],
+        },
+        "contexts": {
+            "runtime": {"name": "CPython", "version": f"3.11.{i % 9}", "type": "runtime"},
+            "trace": {"trace_id": f"{i * 7:032x}", "span_id": f"{i:016x}", "type": "trace"},
+        },
+        "modules": {"django": "4.2.7", "celery": "5.3.4", "redis": f"5.0.{i % 3}"},
+        "message": f"Something went wrong with item {i}",
+    }
+
+
+@pytest.fixture
+def dictionary_storage(tmp_path):
+    load_dictionary.cache_clear()
+    zstd_dictionaries._unavailable_dictionaries.clear()
+    with override_options(
+        {"filestore.backend": "filesystem", "filestore.options": {"location": str(tmp_path)}}
+    ):
+        yield tmp_path
+    load_dictionary.cache_clear()
+    zstd_dictionaries._unavailable_dictionaries.clear()
+
+
+@pytest.fixture
+def dictionary(dictionary_storage):
+    samples = [json.dumps(make_payload(i)).encode("utf8") for i in range(1000)]
+    dictionary = train_dictionary(samples, 16384)
+    save_dictionary(dictionary)
+    return dictionary
+
+
+def test_compress_without_dictionary():
+    value = json.dumps(make_payload(1)).encode("utf8")
+    compressed = compress(value, "python")
+    assert zstandard.get_frame_parameters(compressed).dict_id == 0
+    assert decompress(compressed) == value
+
+
+def test_compress_with_active_dictionary(dictionary):
+    value = json.dumps(make_payload(1)).encode("utf8")
+
+    with override_options({"zstd-dictionaries.active": {"python": dictionary.dict_id()}}):
+        compressed = compress(value, "python")
+        assert compress(value, "javascript") == compress(value)
+
+    assert zstandard.get_frame_parameters(compressed).dict_id == dictionary.dict_id()
+    assert len(compressed) < len(compress(value))
+    # decoding doesn't depend on which dictionary is active
+    assert decompress(compressed) == value
+
+
+def test_missing_dictionary(dictionary_storage):
+    value = json.dumps(make_payload(1)).encode("utf8")
+
+    with override_options({"zstd-dictionaries.active": {"python": 1234}}):
+        compressed = compress(value, "python")
+    assert zstandard.get_frame_parameters(compressed).dict_id == 0
+
+    with pytest.raises(DictionaryNotFound):
+        load_dictionary(1234)
+
+
+def test_missing_dictionary_is_not_empty_payload(dictionary):
+    nodestore = DjangoNodeStorage()
+    with override_options({"zstd-dictionaries.active": {"python": dictionary.dict_id()}}):
+        payload = nodestore._encode_sections({None: make_payload(1)})
+    assert nodestore._decode(payload, subkey=None) == make_payload(1)
+
+    # A process that cannot load the dictionary fails loudly instead of reading
+    # the payload as empty.
+    load_dictionary.cache_clear()
+    with override_options({"filestore.options": {"location": "/nonexistent"}}):
+        with pytest.raises(DictionaryNotFound):
+            nodestore._decode(payload, subkey=None)
+
+
+def test_save_dictionary_is_immutable(dictionary):
+    with pytest.raises(FileExistsError):
+        save_dictionary(dictionary)
+
+
+def test_event_payload_codec(dictionary):
+    codec = EventPayloadCodec()
+    payload = make_payload(1)
+
+    with override_options({"zstd-dictionaries.active": {"python": dictionary.dict_id()}}):
+        encoded = codec.encode(payload)
+
+    assert codec.decode(encoded) == payload
+    # payloads written as plain JSON are still readable
+    assert codec.decode(json.dumps(payload).encode("utf8")) == payload
+
+
+@requires_benchmark
+@pytest.mark.parametrize("use_dictionary", [False, True], ids=["plain", "dictionary"])
+def test_benchmark_compress(use_dictionary, dictionary, benchmark):
+    payloads = [json.dumps(make_payload(i)).encode("utf8") for i in range(1000, 1100)]
+    active = {"python": dictionary.dict_id()} if use_dictionary else {}
+
+    def run():
+        return [compress(payload, "python") for payload in payloads]
+
+    with override_options({"zstd-dictionaries.active": active}):
+        compressed = benchmark(run)
+
+    benchmark.extra_info["compression_ratio"] = sum(map(len, payloads)) / sum(
+        map(len, compressed)
+    )
+    assert [decompress(value) for value in compressed] == payloads